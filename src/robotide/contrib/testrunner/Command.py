@@ -33,6 +33,7 @@ import inspect
 import os
 
 from robotide.contrib.testrunner import TestRunnerAgent
+from robotide.contrib.testrunner.TestRunnerAgent import PROTOCOL_VERSION
 try:
     from robotide.lib.robot.utils import encoding
 except ImportError:
@@ -86,7 +87,8 @@ class Command:
         path = self._get_listener_path()
         if path[-1] in ['c', 'o']:
             path = path[:-1]
-        return '%s:%s:%s' % (path, self._listener[0], self._listener[1])
+        return '%s:%s:%s:%s' % (path, self._listener[0], self._listener[1],
+                                 PROTOCOL_VERSION)
 
     def _get_listener_path(self):
         return os.path.abspath(inspect.getfile(TestRunnerAgent))
@@ -35,9 +35,11 @@ import socket
 import subprocess
 import sys
 import threading
+import time
 
 from queue import Empty, Queue
 from robotide.context import IS_WINDOWS
+from robotide.contrib.testrunner.consoleoutput import split_unfinished
 
 OUTPUT_ENCODING = sys.getfilesystemencoding()
 
@@ -160,11 +162,16 @@ class Process(object):
 
 
 class StreamReaderThread(object):
+    CHUNK_SIZE = 65536
+    PARTIAL_LINE_TIMEOUT = 0.2
 
     def __init__(self, stream):
         self._queue = Queue()
         self._thread = None
         self._stream = stream
+        self._lock = threading.Lock()
+        self._tail = b''
+        self._tail_since = None
 
     def run(self):
         self._thread = threading.Thread(target=self._enqueue_output,
@@ -173,15 +180,41 @@ class StreamReaderThread(object):
         self._thread.start()
 
     def _enqueue_output(self, out):
-        for line in iter(out.readline, b''):
-            self._queue.put(line)
+        # Read whatever is available instead of lines, because unbuffered
+        # streams read lines byte by byte. Chunks are queued only up to the
+        # last full line so that escapes and characters are not split.
+        read = getattr(out, 'read1', out.read)
+        for chunk in iter(lambda: read(self.CHUNK_SIZE), b''):
+            with self._lock:
+                data = self._tail + chunk
+                end = data.rfind(b'\n') + 1
+                if end:
+                    self._queue.put(data[:end])
+                self._set_tail(data[end:])
+        with self._lock:
+            if self._tail:
+                self._queue.put(self._tail)
+            self._set_tail(b'')
+
+    def _set_tail(self, tail):
+        if not tail:
+            self._tail_since = None
+        elif not self._tail or self._tail_since is None:
+            self._tail_since = time.time()
+        self._tail = tail
 
     def pop(self):
-        result = b''
-        my_queue_rng = range(self._queue.qsize())
-        for _ in my_queue_rng:
-            try:
-                result += self._queue.get_nowait()
-            except Empty:
-                pass
-        return result
+        chunks = []
+        with self._lock:
+            for _ in range(self._queue.qsize()):
+                try:
+                    chunks.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            if self._tail and time.time() - self._tail_since >= self.PARTIAL_LINE_TIMEOUT:
+                # Show partial lines, like progress output, after a while
+                complete, unfinished = split_unfinished(self._tail)
+                chunks.append(complete)
+                self._tail = b''
+                self._set_tail(unfinished)
+        return b''.join(chunks)
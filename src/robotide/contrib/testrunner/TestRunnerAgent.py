@@ -69,9 +69,12 @@ import copy
 import os
 import pickle
 import platform
+import struct
 import sys
 import socket
 import threading
+from collections import deque
+from io import BytesIO
 
 PLATFORM = platform.python_implementation()
 
@@ -98,13 +101,18 @@ try:
 except ImportError:
     _JSONAVAIL = False
 
-try:
-    from StringIO import StringIO
-except ImportError:  # py3 <=3.6
-    from io import StringIO
-
 HOST = "localhost"
 
+# Highest version of the protocol between this listener and RIDE. Version 1
+# frames every message with a "<type><length>|" text header, version 2 with a
+# fixed size binary header and adds batch messages holding several events.
+# RIDE passes the highest version it supports as the third listener argument.
+PROTOCOL_VERSION = 2
+# Keyword and log message events are sent in batches, at the latest after
+# BATCH_INTERVAL seconds or when BATCH_SIZE events are waiting.
+BATCH_INTERVAL = 0.2
+BATCH_SIZE = 500
+
 # Setting Output encoding to UTF-8 and ignoring the platform specs
 # RIDE will expect UTF-8
 # Set output encoding to UTF-8 for piped output streams
@@ -138,7 +146,12 @@ class TestRunnerAgent:
         self.sock = None
         self.filehandler = None
         self.streamhandler = None
+        self.protocol = 1
+        self._lock = threading.RLock()
+        self._batch = []
+        self._batch_timer = None
         self._connect()
+        self._negotiate_protocol(args[2] if len(args) >= 3 else None)
         self._send_pid()
         self._create_debugger((len(args) >= 2) and (args[1] == 'True'))
         self._create_kill_server()
@@ -157,6 +170,21 @@ class TestRunnerAgent:
         self._server_thread.start()
         self._send_server_port(self._killer.server_address[1])
 
+    def _negotiate_protocol(self, requested):
+        """Use the highest protocol version supported by both ends.
+
+        Versions above 1 are announced with a version 1 message, after which
+        both ends switch to the new framing.
+        """
+        try:
+            version = max(1, min(int(requested), PROTOCOL_VERSION))
+        except (TypeError, ValueError):
+            version = 1
+        if version > 1 and self.streamhandler:
+            self._send_socket("protocol", version)
+            self.streamhandler.protocol = version
+            self.protocol = version
+
     def _send_pid(self):
         self._send_socket("pid", os.getpid())
 
@@ -191,7 +219,7 @@ class TestRunnerAgent:
         del attrs_copy['doc']
         del attrs_copy['assign']
 
-        self._send_socket("start_keyword", name, attrs_copy)
+        self._send_batched("start_keyword", name, attrs_copy)
         if self._debugger.is_breakpoint(name, attrs):  # must check original
             self._debugger.pause()
         paused = self._debugger.is_paused()
@@ -208,7 +236,7 @@ class TestRunnerAgent:
         del attrs_copy['doc']
         del attrs_copy['assign']
 
-        self._send_socket("end_keyword", name, attrs_copy)
+        self._send_batched("end_keyword", name, attrs_copy)
         self._debugger.end_keyword(attrs['status'] == 'PASS')
 
     def message(self, message):
@@ -216,7 +244,7 @@ class TestRunnerAgent:
 
     def log_message(self, message):
         if _is_logged(message['level']):
-            self._send_socket("log_message", message)
+            self._send_batched("log_message", message)
 
     def log_file(self, path):
         self._send_socket("log_file", path)
@@ -254,10 +282,39 @@ class TestRunnerAgent:
             self.filehandler = None
 
     def _send_socket(self, name, *args):
+        with self._lock:
+            self._flush_batch()
+            self._write([(name, args)])
+
+    def _send_batched(self, name, *args):
+        if self.protocol < 2:
+            return self._send_socket(name, *args)
+        with self._lock:
+            self._batch.append((name, args))
+            if len(self._batch) >= BATCH_SIZE:
+                self._flush_batch()
+            elif self._batch_timer is None:
+                self._batch_timer = threading.Timer(BATCH_INTERVAL,
+                                                    self._flush_on_timer)
+                self._batch_timer.daemon = True
+                self._batch_timer.start()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        if self._batch_timer:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._write(batch)
+
+    def _write(self, packets):
         try:
             if self.filehandler:
-                packet = (name, args)
-                self.streamhandler.dump(packet)
+                self.streamhandler.dump_batch(packets)
                 self.filehandler.flush()
         except Exception:
             import traceback
@@ -405,7 +462,7 @@ def dumps(obj):
 
     NOTE: Protocol is ignored when json representation is used
     """
-    fp = StringIO()
+    fp = BytesIO()
     StreamHandler(fp).dump(obj)
     return fp.getvalue()
 
@@ -421,7 +478,7 @@ def loads(s):
     encoding data to send, specifically related to memoization of data to
     encode.
     """
-    fp = StringIO(s)
+    fp = BytesIO(s)
     return StreamHandler(fp).load()
 
 
@@ -435,6 +492,16 @@ class StreamHandler(object):
     pickle.Unpickler, attempting to eliminate memory leakage where possible at
     the expense of CPU usage (by not re-using Pickler or Unpickler objects).
 
+    With protocol version 1 the message length header is text, like
+    ``J123|``. With version 2 it is a binary message type byte followed by
+    a four byte big-endian length, and ``dump_batch`` writes several objects
+    as one ``B`` message holding a JSON list. Both ends must use the same
+    version; ``TestRunnerAgent`` announces version 2 with a version 1
+    message before switching.
+
+    Messages are read from the file in bulk and buffered, so the same
+    handler must be used for all the reads from one file.
+
     NOTE: StreamHandler currently assumes that same python version is installed
     on both sides of reading/writing (or simplejson is loaded in case of one
     side or other using python < 2.6). This could be resolved by requiring an
@@ -449,8 +516,10 @@ class StreamHandler(object):
     """
     loads = staticmethod(loads)
     dumps = staticmethod(dumps)
+    _FRAME_HEADER = struct.Struct('>cI')
+    _READ_SIZE = 65536
 
-    def __init__(self, fp):
+    def __init__(self, fp, protocol=1):
         """
         Stream handler that encodes objects as either JSON (if available) with
         message length header prepended for sending over a socket, or as a
@@ -472,6 +541,9 @@ class StreamHandler(object):
             self._json_decoder = staticmethod(json_not_impl)
             self._json_encoder = staticmethod(json_not_impl)
         self.fp = fp
+        self.protocol = protocol
+        self._buffer = bytearray()
+        self._pending = deque()
 
     def dump(self, obj):
         """
@@ -482,23 +554,40 @@ class StreamHandler(object):
 
         NOTE: Protocol is ignored when json representation is used
         """
-        # NOTE: Slightly less efficient than doing iterencode directly into the
-        #       fp, however difference is negligable and reduces complexity of
-        #       of the StreamHandler class (treating pickle and json the same)
-        write_list = []
+        msgtype = data = None
         if _JSONAVAIL:
             try:
-                s = self._json_encoder(obj)
-                write_list.append('J')
-                write_list.extend([str(len(s)), '|', s])
+                data = self._json_encoder(obj).encode('UTF-8')
+                msgtype = b'J'
             except:
                 # Probably just failed to JSON-encode an object; try pickle.
                 pass
-        if not write_list:
-            s = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
-            write_list.append('P')
-            write_list.extend([str(len(s)), '|', s])
-        self.fp.write(bytes(''.join(write_list), "UTF-8"))
+        if msgtype is None:
+            data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+            msgtype = b'P'
+        self.fp.write(self._frame(msgtype, data))
+
+    def dump_batch(self, objs):
+        """
+        Writes ``objs`` as a single message if the protocol supports batches,
+        otherwise as separate messages. Objects are loaded one by one.
+        """
+        data = None
+        if self.protocol >= 2 and len(objs) > 1 and _JSONAVAIL:
+            try:
+                data = self._json_encoder(list(objs)).encode('UTF-8')
+            except:
+                pass
+        if data is None:
+            for obj in objs:
+                self.dump(obj)
+        else:
+            self.fp.write(self._frame(b'B', data))
+
+    def _frame(self, msgtype, data):
+        if self.protocol >= 2:
+            return self._FRAME_HEADER.pack(msgtype, len(data)) + data
+        return b''.join([msgtype, str(len(data)).encode('ASCII'), b'|', data])
 
     def load(self):
         """
@@ -511,33 +600,62 @@ class StreamHandler(object):
         encoding data to send, specifically related to memoization of data to
         encode.
         """
-        header = self._load_header()
-        msgtype = header[0]
-        msglen = header[1:]
-        if not msglen.isdigit():
-            raise DecodeError('Message header not valid: %r' % header)
-        msglen = int(msglen)
-        buff = StringIO()
-        # Don't use StringIO.len for sizing, reports string len not bytes
-        buff.write(self.fp.read(msglen))
+        if not self._pending:
+            msgtype, data = self._load_message()
+            self._pending.extend(self._decode(msgtype, data))
+        return self._pending.popleft()
+
+    def _load_message(self):
+        if self.protocol >= 2:
+            msgtype, msglen = self._FRAME_HEADER.unpack(
+                self._read(self._FRAME_HEADER.size))
+        else:
+            header = self._load_header()
+            msgtype, msglen = header[:1], header[1:]
+            if not msglen.isdigit():
+                raise DecodeError('Message header not valid: %r' % header)
+            msglen = int(msglen)
+        return msgtype, self._read(msglen)
+
+    def _decode(self, msgtype, data):
         try:
-            if msgtype == 'J':
-                return self._json_decoder(buff.getvalue())
-            elif msgtype == 'P':
-                return pickle.loads(buff.getvalue())
-            else:
-                raise DecodeError("Message type %r not supported" % msgtype)
+            if msgtype == b'J':
+                return [self._json_decoder(data.decode('UTF-8'))]
+            elif msgtype == b'B':
+                return self._json_decoder(data.decode('UTF-8'))
+            elif msgtype == b'P':
+                return [pickle.loads(data)]
         except DecodeError.wrapped_exceptions as e:
             raise DecodeError(str(e))
+        raise DecodeError("Message type %r not supported" % msgtype)
 
     def _load_header(self):
         """
         Load in just the header bit from a socket/file pointer
         """
-        buff = StringIO()
-        while len(buff.getvalue()) == 0 or buff.getvalue()[-1] != '|':
-            recv_char = self.fp.read(1)
-            if not recv_char:
-                raise EOFError('File/Socket closed while reading load header')
-            buff.write(recv_char)
-        return buff.getvalue()[:-1]
+        start = 0
+        while True:
+            end = self._buffer.find(b'|', start)
+            if end >= 0:
+                break
+            start = len(self._buffer)
+            self._fill('File/Socket closed while reading load header')
+        header = bytes(self._buffer[:end])
+        del self._buffer[:end + 1]
+        return header
+
+    def _read(self, size):
+        while len(self._buffer) < size:
+            self._fill('File/Socket closed while reading message')
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _fill(self, error):
+        if hasattr(self.fp, 'read1'):
+            chunk = self.fp.read1(self._READ_SIZE)
+        else:
+            chunk = self.fp.read(self._READ_SIZE)
+        if not chunk:
+            raise EOFError(error)
+        self._buffer += chunk
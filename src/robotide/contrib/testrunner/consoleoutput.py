@@ -0,0 +1,92 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+
+ANSI_COLOR = re.compile(rb'\x1b\[(3[1-4]|0)m')
+UNFINISHED_ESCAPE = re.compile(rb'\x1b(\[[0-9;]*)?\Z')
+COLORS = {b'31': 'RED', b'32': 'GREEN', b'33': 'YELLOW', b'34': 'BLUE', b'0': None}
+
+
+def parse_colors(text):
+    """Removes ANSI color codes from console output ``text``.
+
+    Returns the text without the codes and a list of ``(position, color)``
+    tuples telling where colors start in the returned text. Color ``None``
+    resets the color.
+    """
+    parts = []
+    colors = []
+    position = end = 0
+    for match in ANSI_COLOR.finditer(text):
+        parts.append(text[end:match.start()])
+        position += match.start() - end
+        colors.append((position, COLORS[match.group(1)]))
+        end = match.end()
+    if not colors:
+        return text, colors
+    parts.append(text[end:])
+    return b''.join(parts), colors
+
+
+def color_spans(colors, length):
+    """Returns ``(start, end, color)`` tuples of the colored parts of text.
+
+    ``colors`` are returned by :func:`parse_colors` for text of ``length``
+    bytes. A color lasts until the next color or the end of the text.
+    """
+    ends = [position for position, _ in colors[1:]] + [length]
+    return [(start, end, color) for (start, color), end in zip(colors, ends)
+            if color and end > start]
+
+
+def longest_line(text, longer_than=0):
+    """Returns the longest line of ``text`` if longer than ``longer_than``.
+
+    Otherwise returns ``None``. The text is not split at all if it is not
+    longer than ``longer_than``.
+    """
+    if len(text) <= longer_than:
+        return None
+    line = max(text.split(b'\n' if isinstance(text, bytes) else '\n'), key=len)
+    return line if len(line) > longer_than else None
+
+
+def split_unfinished(data):
+    """Splits an unfinished ANSI escape or UTF-8 sequence from end of ``data``.
+
+    Returns ``(complete, unfinished)`` where ``unfinished`` is empty if
+    ``data`` ends with a complete sequence.
+    """
+    match = UNFINISHED_ESCAPE.search(data, max(0, len(data) - 32))
+    if match:
+        return data[:match.start()], data[match.start():]
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 != 0x80:
+            if back < _utf8_length(byte):
+                return data[:-back], data[-back:]
+            break
+    return data, b''
+
+
+def _utf8_length(first_byte):
+    if first_byte >= 0xF0:
+        return 4
+    if first_byte >= 0xE0:
+        return 3
+    if first_byte >= 0xC0:
+        return 2
+    return 1
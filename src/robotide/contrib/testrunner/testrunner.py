@@ -34,6 +34,7 @@ import threading
 
 from robotide.contrib.testrunner.Process import Process
 from robotide.contrib.testrunner.TestRunnerAgent import StreamHandler
+from robotide.controller.longnameindex import LongnameIndex
 from robotide.controller.testexecutionresults import TestExecutionResults
 
 
@@ -61,6 +62,7 @@ class TestRunner(object):
         self._results = TestExecutionResults()
         self._port = None
         self._project = project
+        self._longname_index = LongnameIndex(project)
         self.profiles = {}
         self._pause_longname = None
         self._pause_testname = None
@@ -124,8 +126,7 @@ class TestRunner(object):
                                                                    testname))
 
     def _get_test_controller(self, longname, testname=None):
-        ret = self._project.find_controller_by_longname(longname, testname)
-        return ret
+        return self._longname_index.find(longname, testname)
 
     def clear_server(self):
         self._server = None
@@ -135,6 +136,7 @@ class TestRunner(object):
             self._server.shutdown()
 
     def test_execution_started(self):
+        self._longname_index.build()
         self._results.test_execution_started()
 
     def kill_process(self):
@@ -203,10 +205,13 @@ class RideListenerServer(SocketServer.TCPServer):
 
 class RideListenerHandler(SocketServer.StreamRequestHandler):
     def handle(self):
-        decoder = StreamHandler(self.request.makefile('r'))
+        decoder = StreamHandler(self.request.makefile('rb'))
         while True:
             try:
                 (name, args) = decoder.load()
+                if name == 'protocol':
+                    decoder.protocol = args[0]
+                    continue
                 self.server.callback(name, *args)
             except (EOFError, IOError):
                 # I should log this...
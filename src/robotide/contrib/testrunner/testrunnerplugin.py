@@ -68,6 +68,7 @@ from robotide.contrib.testrunner import runprofiles
 from robotide.contrib.testrunner.ArgsParser import ArgsParser
 from robotide.contrib.testrunner.CommandArgs import CommandArgs
 from robotide.contrib.testrunner.Command import Command
+from robotide.contrib.testrunner.consoleoutput import color_spans, longest_line, parse_colors
 from robotide.contrib.testrunner.FileWriter import FileWriter
 from robotide.contrib.testrunner.SettingsParser import SettingsParser
 from robotide.controller.macrocontrollers import TestCaseController
@@ -173,9 +174,11 @@ class TestRunnerPlugin(Plugin):
                 "use colors": False,
                 "fail color": '#FF8E8E',
                 "pass color": '#9FCC9F',
-                "skip color": 'yellow'
+                "skip color": 'yellow',
+                "console line limit": 100000
                 }
 
+    _COLOR_STYLES = {'RED': STYLE_FAIL, 'GREEN': STYLE_PASS, 'YELLOW': STYLE_SKIP}
     report_regex = re.compile(r"^Report: {2}(.*\.html)$", re.MULTILINE)
     log_regex = re.compile(r"^Log: {5}(.*\.html)$", re.MULTILINE)
     title = "Run"
@@ -584,20 +587,25 @@ class TestRunnerPlugin(Plugin):
             return
         out_buffer, err_buffer, log_message = \
             self._test_runner.get_output_and_errors(self.get_current_profile())
+        batch = []
         if len(out_buffer) > 0:
-            self._append_to_console_log(out_buffer, source="stdout")
+            batch.append((out_buffer, "stdout"))
         if len(err_buffer) > 0:
-            if self._get_last_output_char() != "\n":
+            if self._get_last_output_char(out_buffer) != "\n":
                 # Robot prints partial lines to stdout to make the
                 # interactive experience better. It all goes to
                 # heck in a handbasket if something shows up on
                 # stderr. So, to fix that we'll add a newline if
                 # the previous character isn't a newline.
-                self._append_to_console_log("\n")
-            self._append_to_console_log(err_buffer, source="stderr")
+                batch.append(("\n", "stdout"))
+            batch.append((err_buffer, "stderr"))
+        if batch:
+            self._append_batch_to_console_log(batch)
 
-    def _get_last_output_char(self):
+    def _get_last_output_char(self, pending=b''):
         """Return the last character in the output window"""
+        if pending:
+            return chr(self._as_bytes(pending)[-1])
         pos = self._console_log_ctrl.PositionBefore(
             self._console_log_ctrl.GetLength())
         char = self._console_log_ctrl.GetCharAt(pos)
@@ -611,21 +619,42 @@ class TestRunnerPlugin(Plugin):
         self.show_tab(self.panel)
 
     def _append_to_message_log(self, text, source="stdout"):
-        self._append_text(self._message_log_ctrl, text, source)
+        self._append_text(self._message_log_ctrl, [(text, source)])
 
     def _append_to_console_log(self, text, source="stdout"):
         """Put output to the text control"""
-        self._append_text(self._console_log_ctrl, text, source)
+        self._append_batch_to_console_log([(text, source)])
+
+    def _append_batch_to_console_log(self, batch):
+        """Put ``(text, source)`` pairs to the text control at once"""
+        self._append_text(self._console_log_ctrl, batch,
+                          line_limit=self.__getattr__('console line limit'))
         if self._console_log:
-            FileWriter.write(self._console_log, [text], "ab", "a")
+            FileWriter.write(self._console_log,
+                             [b''.join(self._as_bytes(text) for text, _ in batch)],
+                             "ab", "a")
+
+    @staticmethod
+    def _as_bytes(text):
+        return text.encode('UTF-8') if isinstance(text, str) else text
 
-    def _append_text(self, text_ctrl, text, source="stdout"):
-        # text could be bytes or str
+    def _append_text(self, text_ctrl, batch, line_limit=None):
+        # texts could be bytes or str
         if not self.panel or not text_ctrl:
             return
-        self._color_map = list()
-        if self.use_colors:
-            text = self.parse_colors(text)
+        texts, spans, length = [], [], 0
+        for text, source in batch:
+            text = self._as_bytes(text)
+            if self.use_colors:
+                text, colors = parse_colors(text)
+                spans.extend((length + start, end - start, self._COLOR_STYLES[color])
+                             for start, end, color in color_spans(colors, len(text))
+                             if color in self._COLOR_STYLES)
+            elif source == "stderr":
+                spans.append((length, len(text), STYLE_STDERR))
+            texts.append(text)
+            length += len(text)
+        text = b''.join(texts)
         text_ctrl.update_scroll_width(text)
         # we need this information to decide whether to autoscroll or not
         new_text_start = text_ctrl.GetLength()
@@ -634,88 +663,34 @@ class TestRunnerPlugin(Plugin):
             text_ctrl.GetFirstVisibleLine() + text_ctrl.LinesOnScreen() - 1
 
         text_ctrl.SetReadOnly(False)
-        pos = text_ctrl.GetLastPosition()   # DEBUG: Process \r with Replace
-        # print(f"DEBUG: _append_text lastposition={pos}")
         text_ctrl.AppendText(text)
-        new_text_end = text_ctrl.GetLength()
-
-        if wx.VERSION < (4, 1, 0):
-            text_ctrl.StartStyling(new_text_start, 0x1f)
-        else:
-            text_ctrl.StartStyling(new_text_start)
-        text_ctrl.SetStyling(0, STYLE_DEFAULT)
-        if source == "stderr" and not self.use_colors:
-            text_ctrl.SetStyling(new_text_end - new_text_start, STYLE_STDERR)
-
-        if self.use_colors and self._color_map:
-            style = None
-            previous_start = None
-            for item in self._color_map:
-                previous_style = style
-                if item[1] == 'RED':
-                    style = STYLE_FAIL
-                elif item[1] == 'GREEN':
-                    style = STYLE_PASS
-                elif item[1] == 'YELLOW':
-                    style = STYLE_SKIP
-                elif item[1] is None:
-                    style = STYLE_DEFAULT
-                if style:
-                    if wx.VERSION < (4, 1, 0):
-                        text_ctrl.StartStyling(pos + item[0], 0x1f)
-                    else:
-                        text_ctrl.StartStyling(pos + item[0])
-                    previous_start = item[0]
-                if previous_style and style == STYLE_DEFAULT:
-                    text_ctrl.SetStyling(item[0] - previous_start, previous_style)
-            if previous_start and style:
-                text_ctrl.SetStyling(item[0] - previous_start, STYLE_DEFAULT)
-
+        self._start_styling(text_ctrl, new_text_start)
+        text_ctrl.SetStyling(text_ctrl.GetLength() - new_text_start, STYLE_DEFAULT)
+        for start, span_length, style in spans:
+            self._start_styling(text_ctrl, new_text_start + start)
+            text_ctrl.SetStyling(span_length, style)
+        if line_limit:
+            self._remove_lines_over_limit(text_ctrl, line_limit)
         text_ctrl.SetReadOnly(True)
         if last_visible_line >= line_count - 4:
             line_count = text_ctrl.GetLineCount()
             text_ctrl.ScrollToLine(line_count)
 
-    def parse_colors(self, txt):
-        # print(f"DEBUG: enter parse_colors {txt}")
-        idx = 0
-        t_size = len(txt)
-        while idx < t_size:
-            # print(f"{str(txt[idx])}")
-            if txt[idx] == 27:  # .startswith('\033[32m'):
-                color = False
-                # print(f"DEBUG: parse_colors got ESC, {txt[idx+1:idx+5]}")
-                if txt[idx + 1:idx+5] == b'[34m':
-                    color = True
-                    self.store_color(idx, 'BLUE')
-                    # print(f"DEBUG: parse_colors got BLUE")
-                if txt[idx + 1:idx+5] == b'[33m':
-                    color = True
-                    self.store_color(idx, 'YELLOW')
-                    # print(f"DEBUG: parse_colors got YELLOW")
-                if txt[idx+1:idx+5] == b'[32m':
-                    color = True
-                    self.store_color(idx, 'GREEN')
-                    # print(f"DEBUG: parse_colors got GREEN")
-                if txt[idx+1:idx+5] == b'[31m':
-                    color = True
-                    self.store_color(idx, 'RED')
-                    # print(f"DEBUG: parse_colors got RED")
-                if txt[idx+1:idx+4] == b'[0m':
-                    # print(f"DEBUG: parse_colors reset to NORMAL")
-                    self.store_color(idx, None)
-                    txt = txt[:idx] + txt[idx+4:]
-                elif color:
-                    txt = txt[:idx] + txt[idx+5:]
-                if idx >= len(txt):
-                    break
-            t_size = len(txt)
-            if idx < t_size:
-                idx += 1
-        return txt
-
-    def store_color(self, idx, color):
-        self._color_map.append((idx, color))
+    @staticmethod
+    def _start_styling(text_ctrl, position):
+        if wx.VERSION < (4, 1, 0):
+            text_ctrl.StartStyling(position, 0x1f)
+        else:
+            text_ctrl.StartStyling(position)
+
+    @staticmethod
+    def _remove_lines_over_limit(text_ctrl, line_limit):
+        # Lines are removed in batches of a tenth of the limit, so that the
+        # text is not moved in the control at every append. Removed lines
+        # are still in the console log file if one is used.
+        excess = text_ctrl.GetLineCount() - line_limit
+        if excess > line_limit // 10:
+            text_ctrl.DeleteRange(0, text_ctrl.PositionFromLine(excess))
 
     def _get_console_width(self):
         # robot wants to know a fixed size for output, so calculate the
@@ -1271,16 +1246,12 @@ class OutputStyledTextCtrl(wx.stc.StyledTextCtrl):
         self._max_row_len = 0
 
     def update_scroll_width(self, string):
-        if isinstance(string, bytes):
-            linesep = b'\n'
-        else:
-            linesep = '\n'
-        string_max_len = max(len(s) for s in string.split(linesep))
-        if string_max_len <= self._max_row_len:
+        line = longest_line(string, self._max_row_len)
+        if line is None:
             return
-        self._max_row_len = string_max_len
+        self._max_row_len = len(line)
         try:
-            width, _ = self.GetTextExtent(string)
+            width, _ = self.GetTextExtent(line)
             if self.GetScrollWidth() < width + 50:
                 self.SetScrollWidth(width + 50)
         except UnicodeDecodeError:
@@ -13,6 +13,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from .undohistory import UNDO_HISTORY
 from ..publish.messages import RideModificationPrevented
 
 
@@ -83,7 +84,11 @@ class WithNamespace(object):
     def update_namespace(self):
         if not self.namespace:
             return
-        self.namespace.update()
+        datafile = getattr(self, 'datafile', None)
+        if datafile is None:
+            self.namespace.update()
+        else:
+            self.namespace.update_datafile(datafile)
 
     def register_for_namespace_updates(self, listener):
         if not self.namespace:
@@ -122,6 +127,7 @@ class WithNamespace(object):
 
 
 class WithUndoRedoStacks(object):
+    undo_history = UNDO_HISTORY
 
     @property
     def _undo(self):
@@ -142,10 +148,19 @@ class WithUndoRedoStacks(object):
         return self._undo == []
 
     def pop_from_undo(self):
-        return self._undo.pop()
+        return self._undo.pop().command
 
     def push_to_undo(self, command):
-        self._undo.append(command)
+        self._undo.append(self.undo_history.new_entry(command))
+        self.undo_history.added(self)
+
+    def coalesce_undo(self, same_change):
+        """Forgets the latest undo command if ``same_change(latest, previous)``.
+
+        The previous command then undoes both of the latest changes.
+        """
+        if len(self._undo) > 1 and same_change(self._undo[-1].command, self._undo[-2].command):
+            self._undo.pop()
 
     def clear_redo(self):
         self._redo_stack = []
@@ -154,7 +169,19 @@ class WithUndoRedoStacks(object):
         return self._redo == []
 
     def pop_from_redo(self):
-        return self._redo.pop()
+        return self._redo.pop().command
 
     def push_to_redo(self, command):
-        self._redo.append(command)
+        self._redo.append(self.undo_history.new_entry(command))
+        self.undo_history.added(self)
+
+    def undo_history_size(self):
+        """Returns the number of undo and redo entries and their estimated bytes."""
+        entries = self._undo + self._redo
+        return len(entries), sum(entry.size for entry in entries)
+
+    def oldest_undo_serial(self):
+        return self._undo[0].serial if self._undo else None
+
+    def forget_oldest_undo(self):
+        return self._undo.pop(0).size
@@ -22,7 +22,7 @@ from . import validators
 from ..namespace.embeddedargs import EmbeddedArgsHandler
 from ..namespace import namespace
 from ..publish.messages import (RideSelectResource, RideFileNameChanged, RideSaving, RideSaved, RideSaveAll,
-                                RideExcludesChanged)
+                                RideExcludesChanged, RideModificationPrevented)
 from ..utils import overrides, variablematcher
 
 
@@ -250,6 +250,74 @@ class SetDataFile(_Command):
         context.set_datafile(self._datafile)
 
 
+class UpdateDataFile(_Command):
+    """Updates the datafile of the context to match ``datafile``.
+
+    If ``datafile`` differs from the current one only in the settings and
+    steps of some tests or keywords, just those tests and keywords are
+    replaced and their controllers are refreshed. Otherwise the whole
+    datafile is replaced like with ``SetDataFile``.
+    """
+
+    def __init__(self, datafile):
+        self._datafile = datafile
+
+    def execute(self, context):
+        changed = self._changed_items(context.data, self._datafile)
+        if changed is None:
+            return SetDataFile(self._datafile).execute(context)
+        tables = {'test case': context.tests, 'keyword': context.keywords}
+        for table_type, index, settings_changed, steps_changed in changed:
+            ctrl = tables[table_type].replace_item(index, self._items(self._datafile, table_type)[index])
+            if settings_changed:
+                ctrl.notify_settings_changed()
+            if steps_changed:
+                ctrl.notify_steps_changed()
+        if any(table_type == 'keyword' for table_type, _, _, _ in changed):
+            context.update_namespace()
+
+    def _changed_items(self, old, new):
+        """Changed tests and keywords or ``None`` if other data has changed."""
+        if type(old) is not type(new) or getattr(old, 'initfile', None) != getattr(new, 'initfile', None):
+            return None
+        changed = []
+        for old_table, new_table in zip(old, new):
+            if old_table.type != new_table.type or old_table.header != new_table.header:
+                return None
+            if old_table.type not in ('test case', 'keyword'):
+                if _rows(old_table) != _rows(new_table):
+                    return None
+                continue
+            old_items = self._items(old, old_table.type)
+            new_items = self._items(new, new_table.type)
+            if [item.name for item in old_items] != [item.name for item in new_items]:
+                return None
+            for index, (old_item, new_item) in enumerate(zip(old_items, new_items)):
+                settings_changed = _rows(old_item.settings) != _rows(new_item.settings)
+                steps_changed = _rows(old_item.steps) != _rows(new_item.steps)
+                if settings_changed or steps_changed:
+                    changed.append((old_table.type, index, settings_changed, steps_changed))
+        return changed
+
+    @staticmethod
+    def _items(datafile, table_type):
+        if table_type == 'test case':
+            return datafile.testcase_table.tests
+        return datafile.keyword_table.keywords
+
+
+def _rows(elements):
+    """Cells of ``elements`` without trailing empty rows added by parsing."""
+    rows = []
+    for element in elements:
+        rows.append(element.as_list())
+        if getattr(element, 'steps', None):
+            rows.extend(_rows(element.steps))
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
 class _StepsChangingCommand(_ReversibleCommand):
 
     def _execute(self, context):
@@ -674,10 +742,17 @@ class FindOccurrences(_Command):
     def _items_from(self, context):
         for df in context.datafiles:
             self._yield_for_other_threads()
-            if self._items_from_datafile_should_be_checked(df):
-                for item in self._items_from_datafile(df):
+            items = self._candidate_items_from(df)
+            if items and self._items_from_datafile_should_be_checked(df):
+                for item in items:
                     yield item
 
+    def _candidate_items_from(self, df):
+        if hasattr(df, 'keyword_usage_candidates'):
+            return df.keyword_usage_candidates(
+                self._keyword_regexp or self._keyword_name, self._keyword_source)
+        return list(self._items_from_datafile(df))
+
     def _items_from_datafile_should_be_checked(self, datafile):
         if datafile.filename and \
            os.path.basename(datafile.filename) == self._keyword_source:
@@ -711,7 +786,6 @@ class FindOccurrences(_Command):
                 if self._contains_item(item))
 
     def _contains_item(self, item):
-        self._yield_for_other_threads()
         return item.contains_keyword(
             self._keyword_regexp or self._keyword_name)
 
@@ -726,9 +800,15 @@ class FindVariableOccurrences(FindOccurrences):
 
     @overrides(FindOccurrences)
     def _contains_item(self, item):
-        self._yield_for_other_threads()
         return item.contains_variable(self._keyword_name)
 
+    def _candidate_items_from(self, df):
+        if hasattr(df, 'variable_usage_candidates'):
+            items = df.variable_usage_candidates(self._keyword_name)
+            if items is not None:
+                return items
+        return list(self._items_from_datafile(df))
+
     def _items_from_datafile(self, df):
         for itm in FindOccurrences._items_from_datafile(self, df):
             yield itm
@@ -751,23 +831,26 @@ class FindVariableOccurrences(FindOccurrences):
             for item in self._items_from_controller(context):
                 yield item
         else:
+            self._datafiles_to_check = self._datafiles_in_scope(context)
             for df in context.datafiles:
                 self._yield_for_other_threads()
                 if self._items_from_datafile_should_be_checked(df):
-                    for item in self._items_from_datafile(df):
+                    for item in self._candidate_items_from(df):
                         yield item
 
+    def _datafiles_in_scope(self, context):
+        """Datafiles where the variable is visible, or ``None`` for all."""
+        if self._is_file_variable(self._keyword_name, context):
+            return set([context.datafile_controller] +
+                       self._get_all_where_used(context))
+        source = self._get_source_of_imported_var(self._keyword_name, context)
+        if source not in [None, context.datafile_controller]:
+            return set([source] + self._get_all_where_used(source))
+        return None
+
     def _items_from_datafile_should_be_checked(self, datafile):
-        if self._is_file_variable(self._keyword_name, self._context):
-            return datafile in [self._context.datafile_controller] + \
-                self._get_all_where_used(self._context)
-        elif self._is_imported_variable(self._keyword_name, self._context):
-            return datafile in [self._get_source_of_imported_var(
-                                self._keyword_name, self._context)] + \
-                self._get_all_where_used(self._get_source_of_imported_var(
-                                         self._keyword_name, self._context))
-        else:
-            return True
+        return self._datafiles_to_check is None or \
+            datafile in self._datafiles_to_check
 
     @staticmethod
     def _is_local_variable(name, context):
@@ -777,13 +860,8 @@ class FindVariableOccurrences(FindOccurrences):
             any(step.contains_variable_assignment(name)
                 for step in context.steps)
 
-    @staticmethod
-    def _is_file_variable(name, context):
-        return context.datafile_controller.variables.contains_variable(name)
-
-    def _is_imported_variable(self, name, context):
-        return self._get_source_of_imported_var(name, context) not in \
-            [None, context.datafile_controller]
+    def _is_file_variable(self, name, context):
+        return self._defines_variable(context.datafile_controller, name)
 
     @staticmethod
     def _is_builtin_variable(name):
@@ -791,29 +869,23 @@ class FindVariableOccurrences(FindOccurrences):
 
     def _get_source_of_imported_var(self, name, context):
         for df in self._get_all_imported(context):
-            if df.variables.contains_variable(name):
+            if self._defines_variable(df, name):
                 return df
         return None
 
+    @staticmethod
+    def _defines_variable(datafile, name):
+        if hasattr(datafile, 'defines_variable'):
+            return datafile.defines_variable(name)
+        return datafile.variables.contains_variable(name)
+
     @staticmethod
     def _get_all_imported(context):
-        files = [context.datafile_controller]
-        for f in files:
-            files += [imp.get_imported_controller()
-                      for imp in f.imports if imp.is_resource and
-                      imp.get_imported_controller() not in files]
-        return files
+        return context.datafile_controller.imported_datafiles()
 
     @staticmethod
     def _get_all_where_used(context):
-        from .filecontrollers import ResourceFileController
-
-        files = [context.datafile_controller]
-        for f in files:
-            if isinstance(f, ResourceFileController):
-                files += [imp.datafile_controller
-                          for imp in f.get_where_used()]
-        return files
+        return context.datafile_controller.importing_datafiles()
 
 
 def AddKeywordFromCells(cells):
@@ -1012,6 +1084,17 @@ class ChangeCellValue(_StepsChangingCommand):
         self._value = self._escape_newlines(value)
         self._insert = insert
 
+    def execute(self, context):
+        result = _StepsChangingCommand.execute(self, context)
+        if not self._insert:
+            context.coalesce_undo(self._changes_same_cell)
+        return result
+
+    def _changes_same_cell(self, latest, previous):
+        return all(isinstance(command, ChangeCellValue) and not command._insert and
+                   (command._row, command._col) == (self._row, self._col)
+                   for command in (latest, previous))
+
     def change_steps(self, context):
         steps = context.steps
         while len(steps) <= self._row:
@@ -1079,13 +1162,32 @@ class SaveFile(_Command):
 
 class SaveAll(_Command):
 
-    def __init__(self, reformat=False):
+    def __init__(self, reformat=False, observer=None):
         self._reformat = reformat
+        self._observer = observer or NullObserver()
 
     def execute(self, context):
+        controllers = []
         for datafile_controller in context._get_all_dirty_controllers():
-            if datafile_controller.has_format():
-                datafile_controller.execute(SaveFile(self._reformat))
+            if not datafile_controller.has_format():
+                continue
+            if datafile_controller.is_modifiable():
+                controllers.append(datafile_controller)
+            else:
+                RideModificationPrevented(controller=datafile_controller).publish()
+        for datafile_controller in controllers:
+            RideSaving(path=datafile_controller.filename, datafile=datafile_controller).publish()
+            if self._reformat:
+                for macro_controller in chain(datafile_controller.tests, datafile_controller.keywords):
+                    macro_controller.execute(Purify())
+        try:
+            if controllers:
+                context.save_all(controllers, self._observer)
+        finally:
+            self._observer.finish()
+        for datafile_controller in controllers:
+            datafile_controller.unmark_dirty()
+            RideSaved(path=datafile_controller.filename).publish()
         RideSaveAll().publish()
 
 
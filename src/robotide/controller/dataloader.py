@@ -13,10 +13,19 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import multiprocessing
 import os
+from functools import partial
 from threading import Thread
 
+from .parsecache import ParsedFileCache
 from .. import robotapi
+from ..lib.robot.parsing import populators
+from ..context import SETTINGS_DIRECTORY
+
+# Projects with fewer suite files are loaded without worker processes
+PARALLEL_LOADING_THRESHOLD = 50
+LOADING_PROCESSES = min(os.cpu_count() or 1, 8)
 
 
 class DataLoader(object):
@@ -25,6 +34,14 @@ class DataLoader(object):
         self.namespace = namespace
         self.namespace.reset_resource_and_library_cache()
         self._settings = settings
+        self._cache = self._create_cache(settings)
+
+    @staticmethod
+    def _create_cache(settings):
+        if not (settings and settings.get('cache parsed files', False)):
+            return None
+        return ParsedFileCache(os.path.join(SETTINGS_DIRECTORY, 'parsecache'),
+                               settings.get('txt number of spaces', 2))
 
     def load_datafile(self, path, load_observer):
         return self._load(_DataLoader(path, self._settings), load_observer)
@@ -41,14 +58,23 @@ class DataLoader(object):
             datafile, self.namespace.get_resources), load_observer)
 
     def _load(self, loader, load_observer):
+        loader.set_cache(self._cache)
         self._wait_until_loaded(loader, load_observer)
         return loader.result
 
     def _wait_until_loaded(self, loader, load_observer):
         loader.start()
-        load_observer.notify()
+        self._notify(loader, load_observer)
         while loader.is_alive():
             loader.join(0.1)
+            self._notify(loader, load_observer)
+
+    @staticmethod
+    def _notify(loader, load_observer):
+        progress = loader.progress
+        if progress and hasattr(load_observer, 'update_progress'):
+            load_observer.update_progress(*progress)
+        else:
             load_observer.notify()
 
 
@@ -57,13 +83,26 @@ class _DataLoaderThread(Thread):
     def __init__(self):
         Thread.__init__(self)
         self.result = None
+        self._rows = _FileRows()
+
+    def set_cache(self, cache):
+        self._rows = _FileRows(cache)
+
+    @property
+    def progress(self):
+        """``(parsed, total)`` files when known, otherwise ``None``."""
+        return self._rows.progress
 
     def run(self):
+        populators.PRESPLIT_ROWS = self._rows
         try:
             self.result = self._run()
         except Exception as e:
             # print("DEBUG: exception at DataLoader %s\n" % str(e))
             pass  # TODO: Log this error somehow
+        finally:
+            populators.PRESPLIT_ROWS = None
+            self._rows.close()
 
 
 class _DataLoader(_DataLoaderThread):
@@ -75,9 +114,109 @@ class _DataLoader(_DataLoaderThread):
 
     def _run(self):
         # print(f"DEBUG: Dataloader returning TestData source={self._path}")
+        if os.path.isdir(self._path):
+            tab_size = self._settings.get('txt number of spaces', 2) if self._settings else 2
+            self._rows.presplit(_suite_files(self._path, getattr(self._settings, 'excludes', None)),
+                                tab_size)
         return TestData(source=self._path, settings=self._settings)
 
 
+def _suite_files(path, excludes):
+    """Yields init and suite files that populating directory ``path`` reads."""
+    init_file, children = populators.FromDirectoryPopulator()._get_children(path, None, None)
+    if init_file:
+        yield init_file
+    for child in children:
+        if excludes and excludes.contains(child):
+            continue
+        if os.path.isdir(child):
+            for suite_file in _suite_files(child, excludes):
+                yield suite_file
+        else:
+            yield child
+
+
+class _FileRows(object):
+    """Rows of test data files given to populators while loading.
+
+    Rows are read from the parsed file cache when possible. Otherwise they
+    come from worker processes started by :meth:`presplit`, or are split in
+    the loader thread, and are stored in the cache. Without a cache or
+    workers, ``None`` is returned and files are read normally.
+    """
+
+    def __init__(self, cache=None):
+        self._cache = cache
+        self._workers = None
+        self._expected = set()
+        self._total = 0
+        self._used = 0
+
+    @property
+    def progress(self):
+        return (self._used, self._total) if self._total else None
+
+    def presplit(self, paths, tab_size):
+        """Starts splitting those ``paths`` that are not cached in workers."""
+        paths = [os.path.abspath(path) for path in paths]
+        self._expected = set(paths)
+        self._total = len(paths)
+        if self._cache:
+            paths = [path for path in paths if not self._cache.contains(path)]
+        if LOADING_PROCESSES >= 2 and len(paths) >= PARALLEL_LOADING_THRESHOLD:
+            self._workers = _PresplitRows(paths, tab_size, LOADING_PROCESSES)
+
+    def __call__(self, path):
+        if path in self._expected:
+            self._expected.discard(path)
+            self._used += 1
+        rows = self._cache.get(path) if self._cache else None
+        if rows is not None:
+            return rows
+        if self._workers:
+            rows = self._workers(path)
+        if rows is None and self._cache:
+            rows = populators.split_rows(path, self._cache.tab_size, resource=True)
+        if rows is not None and self._cache:
+            self._cache.put(path, rows)
+        return rows
+
+    def close(self):
+        if self._workers:
+            self._workers.close()
+
+
+class _PresplitRows(object):
+    """Reads and splits suite files in worker processes.
+
+    Files are split in the order they were given, while the loader thread
+    builds the model. Calling an instance with a path returns the rows of
+    that file, waiting for the workers when needed, or ``None`` for files
+    that were not given.
+    """
+
+    def __init__(self, paths, tab_size, processes):
+        self._paths = paths
+        self._waiting = set(self._paths)
+        self._rows = {}
+        self._pool = multiprocessing.get_context('spawn').Pool(processes)
+        self._results = self._pool.imap(partial(populators.split_rows, tab_size=tab_size, resource=True),
+                                        self._paths, chunksize=4)
+        self._next = 0
+
+    def __call__(self, path):
+        if path not in self._waiting:
+            return None
+        self._waiting.discard(path)
+        while path not in self._rows:
+            self._rows[self._paths[self._next]] = next(self._results)
+            self._next += 1
+        return self._rows.pop(path)
+
+    def close(self):
+        self._pool.terminate()
+
+
 class _InitFileLoader(_DataLoaderThread):
 
     def __init__(self, path, settings=None):
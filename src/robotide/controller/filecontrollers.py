@@ -33,6 +33,7 @@ from .settingcontrollers import (DocumentationController, FixtureController, Tim
 from .tablecontrollers import (VariableTableController, TestCaseTableController, KeywordTableController,
                                ImportSettingsController, MetadataListController)
 from .macrocontrollers import TestCaseController, UserKeywordController
+from .usageindex import UsageIndex
 
 
 def _get_controller(project, data, parent):
@@ -109,6 +110,8 @@ class _FileSystemElement(object):
 
 
 class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
+    revision = 0
+    _usage_index = None
 
     def __init__(self, data, project=None, parent=None):
         self.data = data
@@ -124,7 +127,6 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         else:
             self._resource_file_controller_factory = None
         self.parent = parent
-        self.set_datafile(data)
         self.dirty = False
         self.children = self._children(data)
         # Filename needs to be set when creating a new datafile
@@ -132,6 +134,9 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
             self.filename = self.data.initfile
         else:
             self.filename = self.data.source
+        # Published last so that listeners, like the tree when a datafile
+        # is reloaded from disk, see the whole controller
+        self.set_datafile(data)
 
     def set_datafile(self, datafile):
         self.data = datafile
@@ -139,6 +144,7 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         self._testcase_table_controller = None
         self._keywords_table_controller = None
         self._imports = None
+        self.revision += 1
         RideDataFileSet(item=self).publish()
 
     def _children(self, data):
@@ -211,6 +217,18 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
     def metadata(self):
         return MetadataListController(self, self.data.setting_table)
 
+    def imported_datafiles(self):
+        """This datafile and all resource files imported by it, also indirectly."""
+        if not self._project:
+            return [self]
+        return self._project.import_graph.all_imported(self)
+
+    def importing_datafiles(self):
+        """This datafile and all datafiles importing it, also indirectly."""
+        if not self._project:
+            return [self]
+        return self._project.import_graph.all_importing(self)
+
     def is_user_keyword(self, value):
         return WithNamespace.is_user_keyword(self, self.datafile, value)
 
@@ -221,6 +239,7 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         return WithNamespace.keyword_info(self, self.data, keyword_name)
 
     def mark_dirty(self):
+        self.revision += 1
         if not self.dirty:
             self.dirty = True
             RideDataChangedToDirty(datafile=self).publish()
@@ -232,6 +251,30 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
             # print(f"DEBUG: filecontrollers unmark_dirty PUBLISH RideDataDirtyCleared")
             RideDataDirtyCleared(datafile=self).publish()
 
+    @property
+    def usage_index(self):
+        if self._usage_index is None:
+            self._usage_index = UsageIndex(self)
+        return self._usage_index
+
+    def keyword_usage_candidates(self, name, keyword_source=None):
+        """Steps, settings and keyword names possibly using keyword ``name``."""
+        return self.usage_index.keyword_candidates(name, keyword_source)
+
+    def keyword_references(self):
+        """Distinct step and setting values possibly referring to keywords."""
+        return self.usage_index.keyword_references()
+
+    def variable_usage_candidates(self, name):
+        """Items possibly using variable ``name``, or ``None`` if not known."""
+        return self.usage_index.variable_candidates(name)
+
+    def defines_variable(self, name):
+        variables_defined = self.usage_index.defines_variable(name)
+        if variables_defined is None:
+            return self.variables.contains_variable(name)
+        return variables_defined
+
     def create_keyword(self, name, argstr=''):
         return self.keywords.new(name, argstr)
 
@@ -542,6 +585,15 @@ class TestDataDirectoryController(_DataController, _FileSystemElement, _BaseCont
     def new_test_data_directory(self, path):
         return self._new_data_controller(NewTestDataDirectory(path))
 
+    def add_test_case_file(self, path):
+        """Adds existing test case file ``path`` as a child suite.
+
+        Raises ``DataError`` if the file is not a valid test case file.
+        """
+        ctrl = self._new_data_controller(TestCaseFile(parent=self.data, source=path).populate())
+        self.notify_suite_added(ctrl)
+        return ctrl
+
     def _new_data_controller(self, datafile):
         self.data.children.append(datafile)
         datafile.parent = self.data
@@ -603,13 +655,17 @@ class TestDataDirectoryController(_DataController, _FileSystemElement, _BaseCont
                 yield imp
 
     def _get_recursive_imports(self):
-        all_imports = self._all_imports()
         ctrls = self._find_controllers_recursively(self)
         for res in self._find_resources_recursively(self):
-            for imp in all_imports:
-                if imp.get_imported_controller() == res and imp.parent.parent not in ctrls:
+            for imp in self._imports_of(res):
+                if imp.parent.parent not in ctrls:
                     yield res, imp
 
+    def _imports_of(self, resource):
+        if self._project:
+            return self._project.import_graph.importers(resource)
+        return [imp for imp in self._all_imports() if imp.get_imported_controller() == resource]
+
     def _find_resources_recursively(self, controller):
         resources = []
         if controller.children:
@@ -757,9 +813,12 @@ class TestCaseFileController(_FileSystemElement, _DataController):
         RideDataFileRemoved(path=self.filename, datafile=self).publish()
 
     def reload(self):
-        self.__init__(TestCaseFile(parent=self.data.parent, source=self.filename).populate(),
-                      project=self._project,
-                      parent=self.parent)
+        old = self.data
+        data = TestCaseFile(parent=old.parent, source=self.filename).populate()
+        siblings = getattr(old.parent, 'children', [])
+        if old in siblings:
+            siblings[siblings.index(old)] = data
+        self.__init__(data, project=self._project, parent=self.parent)
 
     def get_template(self):
         return self.data.setting_table.test_template
@@ -905,8 +964,10 @@ class ResourceFileController(_FileSystemElement, _DataController):
         return None
 
     def reload(self):
-        self.__init__(ResourceFile(source=self.filename).populate(), self._project,
-                      parent=self.parent)
+        data = self.namespace.reload_resource(self.filename) if self.namespace else None
+        self.__init__(data or ResourceFile(source=self.filename).populate(), self._project,
+                      parent=self.parent,
+                      resource_file_controller_factory=self._resource_file_controller_factory)
 
     def remove(self):
         self._project.remove_resource(self)
@@ -924,6 +985,8 @@ class ResourceFileController(_FileSystemElement, _DataController):
             _import.import_loaded_or_modified()
 
     def is_used(self):
+        if self._project:
+            return self._project.import_graph.is_imported(self)
         if self._known_imports:
             return True
         if not self._resource_file_controller_factory:
@@ -933,7 +996,9 @@ class ResourceFileController(_FileSystemElement, _DataController):
         return any(self._resolve_known_imports())
 
     def get_where_used(self):
-        if self._resource_file_controller_factory.is_all_resource_file_imports_resolved():
+        if self._project:
+            source = self._project.import_graph.importers(self)
+        elif self._resource_file_controller_factory.is_all_resource_file_imports_resolved():
             source = self._known_imports
         else:
             source = self._resolve_known_imports()
@@ -0,0 +1,146 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+class ImportGraph(object):
+    """Resource import relations between datafile controllers of a project.
+
+    Forward edges map a datafile controller to its resource import
+    controllers and the resource file controllers they resolve to. Reverse
+    edges map a resource file controller to the import controllers that
+    refer to it. Datafiles are recalculated lazily after they have been
+    marked changed, so that queries never need to walk the whole project.
+    """
+
+    def __init__(self):
+        self._imports = {}
+        self._importers = {}
+        self._unresolved = set()
+        self._changed = set()
+        self._built = False
+
+    def is_built(self):
+        return self._built
+
+    def build(self, datafiles):
+        self.clear()
+        for datafile in datafiles:
+            self._changed.add(datafile)
+        self._built = True
+        self._refresh()
+
+    def clear(self):
+        self._imports.clear()
+        self._importers.clear()
+        self._unresolved.clear()
+        self._changed.clear()
+        self._built = False
+
+    def datafile_changed(self, datafile):
+        """Marks imports of ``datafile`` to be recalculated on next query."""
+        if self._built:
+            self._changed.add(datafile)
+
+    def datafile_set(self, datafile):
+        """Marks ``datafile`` changed after it was created or replaced.
+
+        Datafiles having unresolved imports are recalculated as well, because
+        they may refer to ``datafile`` if it is a new resource.
+        """
+        if self._built:
+            self._changed.add(datafile)
+            self._changed.update(self._unresolved)
+
+    def retry_unresolved(self):
+        """Recalculates datafiles whose resource imports have not resolved.
+
+        Needed when a resource appears on disk instead of being created in
+        the project, because then no datafile is set for it.
+        """
+        if self._built:
+            self._changed.update(self._unresolved)
+            self._refresh()
+
+    def remove(self, datafile):
+        self._changed.discard(datafile)
+        self._remove_edges_from(datafile)
+        for imp in self._importers.pop(datafile, ()):
+            self._changed.add(imp.datafile_controller)
+
+    def _refresh(self):
+        while self._changed:
+            self._update(self._changed.pop())
+
+    def _update(self, datafile):
+        self._remove_edges_from(datafile)
+        edges = []
+        for imp in datafile.imports:
+            if imp.type != 'Resource':
+                continue
+            imp.unresolve()
+            resource = imp.get_imported_controller()
+            if resource is None:
+                self._unresolved.add(datafile)
+                continue
+            edges.append((imp, resource))
+            self._importers.setdefault(resource, {})[imp] = None
+        self._imports[datafile] = edges
+
+    def _remove_edges_from(self, datafile):
+        self._unresolved.discard(datafile)
+        for imp, resource in self._imports.pop(datafile, ()):
+            importers = self._importers.get(resource)
+            if importers:
+                importers.pop(imp, None)
+
+    def imported_resources(self, datafile):
+        """Resources imported directly by ``datafile``."""
+        self._refresh()
+        resources = []
+        for _, resource in self._imports.get(datafile, ()):
+            if resource not in resources:
+                resources.append(resource)
+        return resources
+
+    def importers(self, resource):
+        """Resource import controllers referring to ``resource``."""
+        self._refresh()
+        return list(self._importers.get(resource, ()))
+
+    def is_imported(self, resource):
+        self._refresh()
+        return bool(self._importers.get(resource))
+
+    def all_imported(self, datafile):
+        """``datafile`` and all resources imported by it, also indirectly."""
+        self._refresh()
+        return self._closure(datafile, lambda df: (res for _, res in self._imports.get(df, ())))
+
+    def all_importing(self, resource):
+        """``resource`` and all datafiles using it, also indirectly."""
+        self._refresh()
+        return self._closure(resource, lambda res: (imp.datafile_controller
+                                                    for imp in self._importers.get(res, ())))
+
+    @staticmethod
+    def _closure(start, neighbours):
+        found = [start]
+        seen = {start}
+        for current in found:
+            for other in neighbours(current):
+                if other not in seen:
+                    seen.add(other)
+                    found.append(other)
+        return found
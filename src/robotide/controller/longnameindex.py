@@ -0,0 +1,90 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from threading import Lock
+
+from .filecontrollers import TestCaseFileController, TestDataDirectoryController
+from .macrocontrollers import TestCaseController
+from ..publish import PUBLISHER
+from ..publish.messages import RideItemNameChanged
+
+
+class LongnameIndex(object):
+    """Test and suite controllers of a project by their long names.
+
+    Used for mapping test execution events to controllers. The index is
+    built with :meth:`build` when a run starts and follows renamed tests.
+    Names missing from the index are searched from the project once, and
+    names not found there either, like tests generated by data drivers,
+    are remembered until the next build.
+    """
+
+    def __init__(self, project):
+        self._project = project
+        self._lock = Lock()
+        self._suites = {}
+        self._tests = {}
+        self._missing = set()
+        PUBLISHER.subscribe(self._item_name_changed, RideItemNameChanged)
+
+    def build(self):
+        suites, tests = {}, {}
+        if self._project.data:
+            for datafile in self._project.data.iter_datafiles():
+                if isinstance(datafile, (TestDataDirectoryController, TestCaseFileController)):
+                    suites.setdefault(datafile.longname, datafile)
+                if isinstance(datafile, TestCaseFileController):
+                    for test in datafile.tests:
+                        tests.setdefault(test.longname, test)
+        with self._lock:
+            self._suites = suites
+            self._tests = tests
+            self._missing = set()
+
+    def find(self, longname, testname=None):
+        """Returns the test or suite controller like
+        ``Project.find_controller_by_longname``.
+        """
+        controller = self._indexed(longname, testname)
+        if controller is not None:
+            return controller
+        key = (longname, testname)
+        if key in self._missing:
+            return None
+        controller = self._project.find_controller_by_longname(longname, testname)
+        with self._lock:
+            if controller is None:
+                self._missing.add(key)
+            elif testname is None:
+                self._suites[longname] = controller
+            else:
+                self._tests[longname] = controller
+        return controller
+
+    def _indexed(self, longname, testname):
+        if testname is None:
+            return self._suites.get(longname)
+        test = self._tests.get(longname)
+        return test if test is not None and test.name == testname else None
+
+    def _item_name_changed(self, message):
+        test = message.item
+        if not isinstance(test, TestCaseController):
+            return
+        old_longname = test.parent.parent.longname + '.' + (message.old_name or '')
+        with self._lock:
+            if self._tests.get(old_longname) is test:
+                del self._tests[old_longname]
+            self._tests[test.longname] = test
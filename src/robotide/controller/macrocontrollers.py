@@ -103,6 +103,14 @@ class WithStepsController(ControllerWithParent, WithUndoRedoStacks):
         self._clear_cached_steps()
         ControllerWithParent.set_parent(self, new_parent)
 
+    def set_data(self, data):
+        self.data = data
+        self._init(data)
+        self._clear_cached_steps()
+        # Recorded commands refer to rows of the replaced data
+        self.clear_undo()
+        self.clear_redo()
+
     def _recreate_steps(self):
         flattened_steps = []
         for step in self.data.steps:
@@ -113,6 +121,8 @@ class WithStepsController(ControllerWithParent, WithUndoRedoStacks):
             else:
                 flattened_steps.append(StepController(self, step))
         self._steps_cached = flattened_steps
+        self._step_indexes = None
+        self._assignment_rows = None
         self._has_steps_changed = False
 
     def _clear_cached_steps(self):
@@ -130,7 +140,30 @@ class WithStepsController(ControllerWithParent, WithUndoRedoStacks):
         return self.steps[index]
 
     def index_of_step(self, step):
-        return [s.step_controller_step for s in self.steps].index(step)
+        steps = self.steps
+        if self._step_indexes is None:
+            self._step_indexes = {}
+            for index, s in enumerate(steps):
+                self._step_indexes.setdefault(s.step_controller_step, index)
+        index = self._step_indexes.get(step)
+        if index is None or steps[index].step_controller_step is not step:
+            return [s.step_controller_step for s in steps].index(step)
+        return index
+
+    def assignment_rows(self):
+        """Maps variables assigned in the steps to the first row assigning them.
+
+        Variables are in the form `StepController.is_assigning` compares
+        them, without ``=`` and surrounding whitespace.
+        """
+        steps = self.steps
+        if self._assignment_rows is None:
+            self._assignment_rows = {}
+            for row, step in enumerate(steps):
+                for assignment in step.assignments:
+                    self._assignment_rows.setdefault(
+                        assignment.replace('=', '').strip(), row)
+        return self._assignment_rows
 
     def replace_step(self, index, new_step):
         corrected_index = index
@@ -169,6 +202,12 @@ class WithStepsController(ControllerWithParent, WithUndoRedoStacks):
             return None
         return steps[row].get_cell_info(col)
 
+    def get_cell_infos(self, row, columns):
+        steps = self.steps
+        if row < 0 or len(steps) <= row:
+            return [None] * len(columns)
+        return steps[row].get_cell_infos(columns)
+
     def get_keyword_info(self, kw_name):
         return self.datafile_controller.keyword_info(kw_name)
 
@@ -413,6 +452,7 @@ class UserKeywordController(WithStepsController):
 
     def _init(self, kw):
         self.kw = kw
+        self._teardown = self._TEARDOWN_NOT_SET
         # Needed for API compatibility in tag search
         self.force_tags = []
         self.default_tags = []
@@ -0,0 +1,85 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+
+from ..robotapi import ROBOT_VERSION
+from ..version import VERSION
+
+_FORMAT = (1, VERSION, ROBOT_VERSION, sys.version_info[:2])
+
+
+class ParsedFileCache(object):
+    """On-disk cache of test data files split into rows.
+
+    Rows are the ``(line, cells)`` pairs read by the row based readers, so a
+    cached file is populated to a model without reading and splitting it.
+    Every source path has its own directory holding a single entry, named
+    after the modification time and size of the source, the tab size and
+    the RIDE, Robot Framework and Python versions. An entry is thus valid
+    exactly when a file with its name exists.
+    """
+
+    def __init__(self, directory, tab_size=2):
+        self._directory = directory
+        self.tab_size = tab_size
+
+    def contains(self, path):
+        entry = self._entry_path(path)
+        return entry is not None and os.path.isfile(entry)
+
+    def get(self, path):
+        entry = self._entry_path(path)
+        if entry is None:
+            return None
+        try:
+            with open(entry, 'rb') as source:
+                return marshal.load(source)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def put(self, path, rows):
+        entry = self._entry_path(path)
+        if entry is None:
+            return
+        entry_dir = os.path.dirname(entry)
+        try:
+            if not os.path.isdir(entry_dir):
+                os.makedirs(entry_dir)
+            for name in os.listdir(entry_dir):
+                os.remove(os.path.join(entry_dir, name))
+            handle, temp_path = tempfile.mkstemp(dir=entry_dir)
+            with os.fdopen(handle, 'wb') as target:
+                marshal.dump(rows, target)
+            os.replace(temp_path, entry)
+        except (OSError, ValueError):
+            pass
+
+    def _entry_path(self, path):
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = _FORMAT + (stat.st_mtime_ns, stat.st_size, self.tab_size)
+        return os.path.join(self._directory, _digest(path), _digest(repr(key)))
+
+
+def _digest(value):
+    return hashlib.sha1(value.encode('UTF-8', 'surrogateescape')).hexdigest()
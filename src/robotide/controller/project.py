@@ -13,18 +13,31 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import io
 import os
 import shutil
 import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 
 from .basecontroller import WithNamespace, _BaseController
 from .dataloader import DataLoader
+from .importgraph import ImportGraph
 from .robotdata import NewTestCaseFile, NewTestDataDirectory
+from .undohistory import UNDO_HISTORY
 from ..context import LOG
 from ..controller.ctrlcommands import NullObserver, SaveFile
-from ..publish.messages import RideOpenSuite, RideNewProject, RideFileNameChanged
+from ..publish import PUBLISHER
+from ..robotapi import DataError
+from ..publish.messages import (RideOpenSuite, RideNewProject, RideFileNameChanged, RideImportSetting,
+                                RideDataFileSet)
 from .. import spec
 from ..spec.xmlreaders import SpecInitializer
+from ..spec.libraryworkers import default_worker_count
+
+
+SAVE_WORKERS = 4
 
 
 class Project(_BaseController, WithNamespace):
@@ -42,12 +55,20 @@ class Project(_BaseController, WithNamespace):
         self.name = None
         self.external_resources = []
         self._resource_file_controller_factory = ResourceFileControllerFactory(self._name_space, self)
+        self._import_graph = ImportGraph()
         self._serializer = Serializer(settings, LOG)
+        if settings:
+            UNDO_HISTORY.configure_from(settings)
+        PUBLISHER.subscribe(self._imports_changed, RideImportSetting)
+        PUBLISHER.subscribe(self._datafile_set, RideDataFileSet)
 
     @staticmethod
     def _construct_library_manager(library_manager, settings):
-        return library_manager or \
-            spec.LibraryManager(spec.DATABASE_FILE, SpecInitializer(settings.get('library xml directories', [])[:]))
+        if library_manager:
+            return library_manager
+        workers = settings.get('library workers', None)
+        return spec.LibraryManager(spec.DATABASE_FILE, SpecInitializer(settings.get('library xml directories', [])[:]),
+                                   workers=default_worker_count() if workers is None else workers)
 
     def __del__(self):
         if self._library_manager:
@@ -96,6 +117,21 @@ class Project(_BaseController, WithNamespace):
     def resource_file_controller_factory(self):
         return self._resource_file_controller_factory
 
+    @property
+    def import_graph(self):
+        self._build_import_graph()
+        return self._import_graph
+
+    def _build_import_graph(self):
+        if not self._import_graph.is_built():
+            self._import_graph.build(self.datafiles)
+
+    def _imports_changed(self, message):
+        self._import_graph.datafile_changed(message.datafile)
+
+    def _datafile_set(self, message):
+        self._import_graph.datafile_set(message.item)
+
     def find_controller_by_longname(self, longname, testname=None):
         return self._controller.find_controller_by_longname(longname, testname)
 
@@ -170,6 +206,7 @@ class Project(_BaseController, WithNamespace):
         self.__init__(self.namespace, self.internal_settings, library_manager=self._library_manager)
         resources = self._loader.resources_for(datafile, load_observer)
         self._create_controllers(datafile, resources)
+        self._build_import_graph()
         RideOpenSuite(path=path, datafile=self._controller).publish()
         load_observer.finish()
 
@@ -278,18 +315,24 @@ class Project(_BaseController, WithNamespace):
             self.change_format(datafile, cformat)
 
     def remove_datafile(self, controller):
+        for datafile in controller.iter_datafiles():
+            self._import_graph.remove(datafile)
         if controller is self._controller:
             self._controller = None
         else:
             self._controller.remove_child(controller)
 
     def remove_resource(self, controller):
+        self._import_graph.remove(controller)
         self._resource_file_controller_factory.remove(controller)
 
     def save(self, controller):
         assert controller is not None
         self._serializer.serialize_file(controller)
 
+    def save_all(self, controllers, observer=None):
+        self._serializer.serialize_files(controllers, observer)
+
     def _get_all_dirty_controllers(self):
         return [controller for controller in self.datafiles if controller.dirty]
 
@@ -303,6 +346,75 @@ class Project(_BaseController, WithNamespace):
         if resource:
             return self._create_resource_controller(resource)
 
+    def reload_changed_files(self, paths):
+        """Updates the project from datafiles at ``paths`` changed on disk.
+
+        Modified datafiles are reloaded, removed ones are removed from the
+        project and new files are added to their directory suites, so that
+        the rest of the project and its cached keywords are kept. Returns
+        ``False`` without changing anything if the changes cannot be applied
+        file by file, for example when directories or initialization files
+        have changed, in which case the whole project must be reloaded.
+        """
+        if not self._controller:
+            return False
+        changes = self._changes_on_disk(paths)
+        if changes is None:
+            return False
+        modified, removed, created = changes
+        try:
+            for controller in modified:
+                controller.reload()
+        except DataError:
+            return False
+        for controller in removed:
+            controller.remove()
+        for path, directory in created:
+            self._add_created_file(path, directory)
+        return True
+
+    def _changes_on_disk(self, paths):
+        known = {os.path.abspath(df.filename): df for df in self.datafiles if df.filename}
+        directories = {df.directory: df for df in self._suites() if df.is_directory_suite()}
+        root = self._controller.directory if self._controller.is_directory_suite() else None
+        modified, removed, created = [], [], []
+        for path in sorted({os.path.abspath(path) for path in paths}):
+            if self.is_excluded(path):
+                continue
+            if os.path.splitext(os.path.basename(path))[0] == '__init__':
+                return None
+            if path in directories or os.path.isdir(path):
+                if path not in directories or not os.path.isdir(path):
+                    return None
+                continue
+            controller = known.get(path)
+            if controller is None:
+                if os.path.isfile(path):
+                    if os.path.dirname(path) in directories:
+                        created.append((path, directories[os.path.dirname(path)]))
+                    elif root and path.startswith(os.path.join(root, '')):
+                        return None
+                elif any(other.startswith(os.path.join(path, '')) for other in chain(known, directories)):
+                    return None
+            elif not os.path.isfile(path):
+                removed.append(controller)
+            elif controller.has_been_modified_on_disk():
+                modified.append(controller)
+        return modified, removed, created
+
+    def _add_created_file(self, path, directory):
+        try:
+            directory.add_test_case_file(path)
+        except DataError:
+            resource = self.namespace.reload_resource(path)
+            if resource is None:
+                return
+            # Imports resolving to the new resource create its controller
+            self.import_graph.retry_unresolved()
+            controller = self._resource_file_controller_factory.find(resource)
+            if controller:
+                self._inform_resource_created(controller)
+
     def is_project_changed_from_disk(self):
         from .filecontrollers import TestDataDirectoryController
         for data_file in self.datafiles:
@@ -345,6 +457,84 @@ class Serializer(object):
                 'pipe_separated': self._get_pipe_separated(),
                 'txt_separating_spaces': self._get_separating_spaces()}
 
+    def serialize_files(self, controllers, observer=None):
+        """Saves datafiles of ``controllers`` as one batch.
+
+        Files are written in parallel into temporary files next to the
+        original files, which are replaced only after all files have been
+        written. If writing any file fails, no file is changed.
+        """
+        try:
+            self._replace_files(self._write_temporary_files(controllers, observer))
+        finally:
+            self._log_errors()
+
+    def _write_temporary_files(self, controllers, observer):
+        options = self._get_options()
+        written, failed = [], None
+        workers = max(1, min(len(controllers), self._settings.get('save workers', SAVE_WORKERS)))
+        with ThreadPoolExecutor(workers) as executor:
+            futures = {executor.submit(self._write_temporary_file, controller, options): controller
+                       for controller in controllers}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    written.append((futures[future].filename, future.result()))
+                except Exception as err:
+                    self._cache_error(futures[future], err)
+                    failed = failed or err
+                if hasattr(observer, 'update_progress'):
+                    observer.update_progress(done, len(controllers))
+        if failed:
+            for _, temporary in written:
+                os.remove(temporary)
+            raise failed
+        return written
+
+    @staticmethod
+    def _write_temporary_file(controller, options):
+        path = controller.filename
+        temporary = _sibling_path(path, 'tmp')
+        try:
+            with io.open(temporary, 'x', encoding='UTF-8', newline=options['line_separator']) as output:
+                controller.datafile.save(output=output, **options)
+                output.flush()
+                os.fsync(output.fileno())
+            if os.path.isfile(path):
+                shutil.copymode(path, temporary)
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return temporary
+
+    @staticmethod
+    def _replace_files(written):
+        replaced = []
+        try:
+            for path, temporary in written:
+                backup = _sibling_path(path, 'bak') if os.path.isfile(path) else None
+                if backup:
+                    os.replace(path, backup)
+                    replaced.append((path, backup))
+                os.replace(temporary, path)
+                if not backup:
+                    replaced.append((path, None))
+        except OSError:
+            for path, backup in reversed(replaced):
+                if backup:
+                    os.replace(backup, path)
+                elif os.path.exists(path):
+                    os.remove(path)
+            raise
+        else:
+            for _, backup in replaced:
+                if backup:
+                    os.remove(backup)
+        finally:
+            for _, temporary in written:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+
     def _get_line_separator(self):
         setting = self._settings.get('line separator', 'native').lower()
         if setting in ('crlf', 'windows'):
@@ -369,6 +559,11 @@ class Serializer(object):
             self._errors = []
 
 
+def _sibling_path(path, extension):
+    directory, name = os.path.split(path)
+    return os.path.join(directory, '.%s.%s.%s' % (name, uuid.uuid4().hex[:8], extension))
+
+
 class Backup(object):
 
     def __init__(self, file_controller):
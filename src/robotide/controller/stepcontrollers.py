@@ -22,10 +22,37 @@ from ..namespace.local_namespace import LocalNamespace
 from ..utils import variablematcher
 
 
+class _CellInfoRow(object):
+    """Cells of a step and what has been resolved from them for cell infos."""
+
+    def __init__(self, key, values):
+        self.key = key
+        self.values = values
+        self.cell_infos = {}
+        self._keyword_infos = {}
+        self.last_non_empty = None
+        for index in reversed(range(len(values))):
+            if values[index].strip() != '':
+                self.last_non_empty = index
+                break
+
+    def value(self, col):
+        if len(self.values) <= col:
+            return ''
+        return self.values[col]
+
+    def keyword_info(self, value, resolve):
+        if value not in self._keyword_infos:
+            self._keyword_infos[value] = resolve(value)
+        return self._keyword_infos[value]
+
+
 class StepController(_BaseController):
 
     _GIVEN_WHEN_THEN_MATCHER = re.compile(r'^(given|when|then|and|but)\s*',
                                           re.I)
+    _cell_info_row = None
+    _active_row = None
 
     def __init__(self, parent, step):
         self._init(parent, step)
@@ -94,6 +121,43 @@ class StepController(_BaseController):
         return values[col]
 
     def get_cell_info(self, col):
+        return self.get_cell_infos([col])[0]
+
+    def get_cell_infos(self, columns):
+        """Cell infos of ``columns``, resolved from one analysis of the row.
+
+        The keyword infos and cells of the row are resolved once and kept,
+        with the created cell infos, until the cells, the keyword column or
+        the template of the step change or ``notify_value_changed`` is called.
+        """
+        row = self._get_cell_info_row()
+        self._active_row = row
+        try:
+            for col in columns:
+                if col not in row.cell_infos:
+                    row.cell_infos[col] = self._create_cell_info(col)
+        finally:
+            self._active_row = None
+        return [row.cell_infos[col] for col in columns]
+
+    def _get_cell_info_row(self):
+        values = self.as_list()
+        key = (values, self._keyword_column, self.parent.has_template())
+        if self._cell_info_row is None or self._cell_info_row.key != key:
+            self._cell_info_row = _CellInfoRow(key, values)
+        return self._cell_info_row
+
+    def _row_value(self, col):
+        if self._active_row:
+            return self._active_row.value(col)
+        return self.get_value(col)
+
+    def _row_keyword_info(self, value):
+        if self._active_row:
+            return self._active_row.keyword_info(value, self.get_keyword_info)
+        return self.get_keyword_info(value)
+
+    def _create_cell_info(self, col):
         position = self._get_cell_position(col)
         content = self._get_content_with_type(col, position)
         if content.type == ContentType.COMMENTED:
@@ -120,30 +184,30 @@ class StepController(_BaseController):
         if self.parent.has_template():
             return CellPosition(CellType.UNKNOWN, None)
         column -= len(self.step_controller_step.assign)
-        value_at_col = self.get_value(col)
-        info = self.get_keyword_info(value_at_col)  # Getting info for the keyword cell
+        value_at_col = self._row_value(col)
+        info = self._row_keyword_info(value_at_col)  # Getting info for the keyword cell
         keyword_col = col if col >= self._keyword_column else self._keyword_column
         if info:
             return CellPosition(CellType.KEYWORD, None)
         else:
             while not info and keyword_col > 0 and keyword_col > self._keyword_column:
                 keyword_col -= 1
-                info = self.get_keyword_info(self.get_value(keyword_col))  # Getting info for the previous cell
+                info = self._row_keyword_info(self._row_value(keyword_col))  # Getting info for the previous cell
         if info:
             args = info.arguments
         else:
             args = []
         args_amount = len(args)
         # print(f"DEBUG: StepController _get_cell_position step is FOR?"
-        #       f" {self.get_value(keyword_col) == 'FOR'} is assigning? {self.is_assigning(value_at_col)}")
-        if column > keyword_col and self.get_value(keyword_col) == "FOR" and self.is_assigning(value_at_col):
+        #       f" {self._row_value(keyword_col) == 'FOR'} is assigning? {self.is_assigning(value_at_col)}")
+        if column > keyword_col and self._row_value(keyword_col) == "FOR" and self.is_assigning(value_at_col):
             return CellPosition(CellType.ASSIGN, None)
         if column <= keyword_col and self.is_assigning(value_at_col):
             return CellPosition(CellType.ASSIGN, None)
         if col < keyword_col:
             return CellPosition(CellType.UNKNOWN, None)
         if not info and not self.is_assigning(value_at_col)\
-                and not self.is_assigning(self.get_value(self._keyword_column)) and col >= keyword_col:
+                and not self.is_assigning(self._row_value(self._keyword_column)) and col >= keyword_col:
             return CellPosition(CellType.UNKNOWN, None)
         if args_amount == 0:
             return CellPosition(CellType.MUST_BE_EMPTY, None)
@@ -182,7 +246,7 @@ class StepController(_BaseController):
         return False
 
     def _get_content_with_type(self, col, position):
-        value = self.get_value(col)
+        value = self._row_value(col)
         if self._is_commented(col):
             return CellContent(ContentType.COMMENTED, value)
         last_none_empty = self._get_last_none_empty_col_idx()
@@ -195,11 +259,11 @@ class StepController(_BaseController):
         if self.is_user_keyword(value):
             return CellContent(
                 ContentType.USER_KEYWORD, value,
-                self.get_keyword_info(value).source)
+                self._row_keyword_info(value).source)
         if self.is_library_keyword(value):
             return CellContent(
                 ContentType.LIBRARY_KEYWORD, value,
-                self.get_keyword_info(value).source)
+                self._row_keyword_info(value).source)
         if value == 'END':  # DEBUG Don't consider start column (col == 0 and)
             return CellContent(ContentType.END, value)
         return CellContent(ContentType.STRING, value)
@@ -208,7 +272,8 @@ class StepController(_BaseController):
         if position.type == CellType.ASSIGN:
             return False
         try:
-            is_known = self._get_local_namespace().has_name(value)
+            local_namespace = self._get_local_namespace()
+            is_known = local_namespace.has_name(value)
         except AttributeError:
             return False
         if is_known:
@@ -216,7 +281,7 @@ class StepController(_BaseController):
         inner_value = value[2:-1]
         modified = re.split(r'\W', inner_value, 1)[0]
         # print(f"\nDEBUG: Stepcontrollers value: {value} inner_value: {inner_value} modified: {modified}")
-        return not self._get_local_namespace().has_name(
+        return not local_namespace.has_name(
             '%s{%s}' % (value[0], modified))
 
     def _get_local_namespace(self):
@@ -225,6 +290,8 @@ class StepController(_BaseController):
             self.parent, self.datafile_controller.namespace, index)
 
     def _get_last_none_empty_col_idx(self):
+        if self._active_row:
+            return self._active_row.last_non_empty
         values = self.as_list()
         for i in reversed(range(len(values))):
             if values[i].strip() != '':
@@ -332,8 +399,9 @@ class StepController(_BaseController):
     def _is_commented(self, col):
         if self._has_comment_keyword():
             return col > self._keyword_column
-        for i in range(min(col + 1, len(self.as_list()))):
-            if self.get_value(i).startswith('#'):
+        values = self._active_row.values if self._active_row else self.as_list()
+        for i in range(min(col + 1, len(values))):
+            if values[i].startswith('#'):
                 return True
         return False
 
@@ -553,6 +621,7 @@ class StepController(_BaseController):
             next_step._recreate(next_step.as_list())
 
     def notify_value_changed(self):
+        self._cell_info_row = None
         self.parent.notify_steps_changed()
 
     def increase_indent(self):
@@ -671,7 +740,7 @@ class ForLoopStepController(StepController):
             return CellPosition(CellType.OPTIONAL, None)
         return CellPosition(CellType.MUST_BE_EMPTY, None)
 
-    def get_cell_info(self, col):
+    def _create_cell_info(self, col):
         position = self._get_cell_position(col)
         content = self._get_content_with_type(col, position)
         return self._build_cell_info(content, position)
@@ -261,6 +261,18 @@ class _MacroTable(_TableController):
     def __getitem__(self, index):
         return self._create_controller(self.items[index])
 
+    def replace_item(self, index, item):
+        """Replaces the item at ``index`` with ``item`` keeping its controller."""
+        old = self.items[index]
+        ctrl = self._item_to_controller.pop(old, None)
+        item.parent = self._table
+        self.items[index] = item
+        if ctrl is None:
+            return self._create_controller(item)
+        ctrl.set_data(item)
+        self._item_to_controller[item] = ctrl
+        return ctrl
+
     def move_up(self, item):
         items = self.items
         idx = items.index(item)
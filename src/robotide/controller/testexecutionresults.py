@@ -13,6 +13,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from threading import Lock
+
 from ..publish.messages import (RideTestExecutionStarted, RideTestPaused, RideTestPassed, RideTestFailed,
                                 RideTestRunning, RideTestSkipped, RideTestStopped)
 
@@ -76,3 +78,30 @@ class TestExecutionResults(object):
     def has_skipped(self, test):
         return test in self._results and self._results[test] == self.SKIPPED
 
+
+class ExecutionStatusUpdates(object):
+    """Tests whose execution status has changed since they were last applied.
+
+    Status messages may arrive from other threads much faster than a view
+    can show them, so views collect the changed tests here and apply them
+    in batches. A test is kept only once, in the order of its latest
+    change, and views read its current status from the results when they
+    apply the batch.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._tests = {}
+
+    def add(self, test):
+        """Adds ``test`` and returns ``True`` if it started a new batch."""
+        with self._lock:
+            started = not self._tests
+            self._tests.pop(test, None)
+            self._tests[test] = None
+            return started
+
+    def pop_all(self):
+        with self._lock:
+            tests, self._tests = list(self._tests), {}
+            return tests
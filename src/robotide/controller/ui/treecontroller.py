@@ -39,6 +39,7 @@ class TreeController(object):
         self.settings = settings
         self._history = history or _History()
         self._test_selection = test_selection
+        self._nodes = {}
 
     def register_tree_actions(self):
         actions = ActionInfoCollection(tree_actions, self, self._tree)
@@ -90,11 +91,33 @@ class TreeController(object):
         if not text.startswith('*'):
             self._tree.SetItemText(node, '*' + text)
 
+    def register_node(self, node, controller):
+        """Makes ``node`` found by `find_node_by_controller` for ``controller``."""
+        entry = self._nodes.setdefault(id(controller), (controller, []))
+        if entry[0] is not controller:
+            entry = self._nodes[id(controller)] = (controller, [])
+        entry[1].append(node)
+
+    def forget_nodes(self, nodes):
+        """Forgets ``nodes`` that are about to be deleted from the tree."""
+        for node in nodes:
+            handler = self._tree.GetItemData(node)
+            if not handler:
+                continue
+            entry = self._nodes.get(id(handler.controller))
+            if entry and entry[0] is handler.controller and node in entry[1]:
+                entry[1].remove(node)
+                if not entry[1]:
+                    del self._nodes[id(handler.controller)]
+
+    def forget_all_nodes(self):
+        self._nodes.clear()
+
     def find_node_by_controller(self, controller):
-        def match_handler(n):
-            handler = self.get_handler(n)
-            return handler and controller is handler.controller
-        return self._find_node_with_predicate(self._tree._root, match_handler)
+        entry = self._nodes.get(id(controller))
+        if entry is None or entry[0] is not controller:
+            return None
+        return entry[1][0]
 
     def find_node_with_label(self, node, label):
         matcher = lambda n: utils.eq(self._tree.GetItemText(n), label)
@@ -0,0 +1,150 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import sys
+import weakref
+from collections import namedtuple
+from itertools import count
+
+ENTRIES_PER_FILE = 500
+BYTES_PER_FILE = 10 * 1000 * 1000
+ENTRIES = 5000
+BYTES = 100 * 1000 * 1000
+REFERENCE_SIZE = 64
+
+UndoEntry = namedtuple('UndoEntry', ['serial', 'size', 'command'])
+
+
+class UndoHistory(object):
+    """Limits of the undo and redo stacks of all controllers.
+
+    Undo and redo stacks are kept separately by datafile, test and keyword
+    controllers. When the entries of one datafile, including its tests and
+    keywords, or of all datafiles exceed the configured number of entries
+    or estimated bytes, the oldest undo entries are forgotten.
+    """
+
+    def __init__(self):
+        self._serials = count()
+        self._owners = weakref.WeakSet()
+        self.configure()
+
+    def configure(self, entries_per_file=ENTRIES_PER_FILE, bytes_per_file=BYTES_PER_FILE,
+                  entries=ENTRIES, bytes_=BYTES):
+        self.entries_per_file = entries_per_file
+        self.bytes_per_file = bytes_per_file
+        self.entries = entries
+        self.bytes = bytes_
+
+    def configure_from(self, settings):
+        self.configure(settings.get('undo history entries per file', ENTRIES_PER_FILE),
+                       settings.get('undo history bytes per file', BYTES_PER_FILE),
+                       settings.get('undo history entries', ENTRIES),
+                       settings.get('undo history bytes', BYTES))
+
+    def new_entry(self, command):
+        return UndoEntry(next(self._serials), estimate_size(command), command)
+
+    def added(self, owner):
+        """Forgets oldest entries if ``owner`` got entries over the limits."""
+        self._owners.add(owner)
+        datafile = _datafile_of(owner)
+        self._limit([other for other in self._owners if _datafile_of(other) is datafile],
+                    self.entries_per_file, self.bytes_per_file)
+        self._limit(list(self._owners), self.entries, self.bytes)
+
+    @staticmethod
+    def _limit(owners, max_entries, max_bytes):
+        entries, size = _total(owner.undo_history_size() for owner in owners)
+        while entries > max_entries or size > max_bytes:
+            owners = [owner for owner in owners if owner.oldest_undo_serial() is not None]
+            if not owners:
+                return
+            oldest = min(owners, key=lambda owner: owner.oldest_undo_serial())
+            entries -= 1
+            size -= oldest.forget_oldest_undo()
+
+    def size(self):
+        """Returns the number of undo and redo entries and their estimated bytes."""
+        return _total(owner.undo_history_size() for owner in list(self._owners))
+
+    def sizes_by_datafile(self):
+        """Returns ``size`` of the history by datafile controller."""
+        sizes = {}
+        for owner in list(self._owners):
+            datafile = _datafile_of(owner)
+            sizes[datafile] = _total([sizes.get(datafile, (0, 0)), owner.undo_history_size()])
+        return {datafile: size for datafile, size in sizes.items() if size[0]}
+
+
+def _datafile_of(owner):
+    try:
+        return owner.datafile_controller
+    except AttributeError:
+        return owner
+
+
+def _total(sizes):
+    entries = size = 0
+    for owner_entries, owner_size in sizes:
+        entries += owner_entries
+        size += owner_size
+    return entries, size
+
+
+def estimate_size(command):
+    """Estimates the bytes kept in memory by undo ``command``.
+
+    Strings and containers are counted by their size, commands by their
+    attributes and steps and tests by their cells. Other objects, like
+    controllers and undo entries, are counted as references only.
+    """
+    from .ctrlcommands import _Command
+
+    size = 0
+    seen = set()
+    objects = [command]
+    while objects:
+        obj = objects.pop()
+        if id(obj) in seen:
+            size += REFERENCE_SIZE
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, (str, bytes)):
+            size += sys.getsizeof(obj)
+        elif isinstance(obj, UndoEntry):
+            size += REFERENCE_SIZE
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            size += sys.getsizeof(obj)
+            objects.extend(obj)
+        elif isinstance(obj, dict):
+            size += sys.getsizeof(obj)
+            objects.extend(obj.values())
+        elif isinstance(obj, _Command):
+            size += sys.getsizeof(obj)
+            objects.extend(vars(obj).values())
+        elif hasattr(type(obj), 'as_list'):
+            size += REFERENCE_SIZE
+            objects.extend(obj.as_list())
+        elif isinstance(getattr(getattr(obj, 'data', None), 'steps', None), list):
+            # Tests and keywords recreated by undo are kept alive by the command
+            size += REFERENCE_SIZE
+            objects.extend(obj.data.steps)
+        else:
+            size += REFERENCE_SIZE
+    return size
+
+
+UNDO_HISTORY = UndoHistory()
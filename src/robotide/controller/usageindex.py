@@ -0,0 +1,197 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+from itertools import chain
+
+from .stepcontrollers import StepController
+from .. import utils
+
+_VARIABLE_MATCHER = re.compile(r'[$@&%]{[^{}]*}')
+_INDEXABLE_VARIABLE = re.compile(r'^[$@&%]{[^{}*?\[\]]*}$')
+
+
+class UsageIndex(object):
+    """Indexes of the items of a datafile using keywords and variables.
+
+    Items are the settings, steps, keyword names and variable tables that
+    ``FindOccurrences`` and ``FindVariableOccurrences`` check. Keyword
+    usages are indexed by normalized cell values, also without a BDD
+    prefix, and variable usages by the normalized variables the values
+    contain, so that finding candidates for a name is a dictionary lookup.
+    The indexes are rebuilt lazily whenever the revision of the datafile
+    controller has changed since they were built.
+    """
+
+    def __init__(self, datafile_controller):
+        self._datafile = datafile_controller
+        self._revision = None
+        self._keywords = None
+        self._variables = None
+        self._references = None
+
+    def keyword_candidates(self, name, keyword_source=None):
+        """Items that may contain keyword ``name``, in datafile order.
+
+        ``name`` is a keyword name or a regular expression matching names
+        with embedded arguments. Keyword name items are included only for
+        keywords whose source is ``keyword_source``. Callers check the
+        candidates with ``contains_keyword``.
+        """
+        self._refresh()
+        if self._keywords is None:
+            self._keywords = _ValueIndex(self._keyword_items(), _keyword_keys)
+        if isinstance(name, str):
+            positions = self._keywords.positions(utils.normalize(name))
+        else:
+            positions = self._keywords.matching_positions(name.match)
+        return [item for item, owner in self._keywords.items(positions)
+                if owner is None or owner.source == keyword_source]
+
+    def keyword_references(self):
+        """Distinct cell values of the datafile that may refer to keywords.
+
+        Keyword names in keyword definitions are not references, and cells
+        are included only if their item would match them with
+        ``contains_keyword``, which leaves out for example documentation.
+        """
+        self._refresh()
+        if self._references is None:
+            references = set()
+            for item, owner, values in self._keyword_items():
+                if owner is not None:
+                    continue
+                for value in values:
+                    if value and isinstance(value, str) and value not in references \
+                            and item.contains_keyword(value):
+                        references.add(value)
+            self._references = references
+        return self._references
+
+    def variable_candidates(self, name):
+        """Items that may contain variable ``name``, in datafile order.
+
+        Returns ``None`` if ``name`` is not a plain variable like
+        ``${name}``, in which case callers must check all the items.
+        """
+        key = _variable_key(name)
+        if key is None:
+            return None
+        positions = self._variable_index().positions(key)
+        return [item for item, _ in self._variables.items(positions)]
+
+    def defines_variable(self, name):
+        """Does the variable table contain variable ``name``.
+
+        Returns ``None`` if ``name`` is not a plain variable.
+        """
+        key = _variable_key(name)
+        if key is None:
+            return None
+        positions = self._variable_index().positions(key)
+        return bool(positions) and positions[-1] == len(self._variables) - 1
+
+    def _variable_index(self):
+        self._refresh()
+        if self._variables is None:
+            self._variables = _ValueIndex(self._variable_items(), _variable_keys)
+        return self._variables
+
+    def _refresh(self):
+        revision = getattr(self._datafile, 'revision', None)
+        if revision is None or revision != self._revision:
+            self._revision = revision
+            self._keywords = self._variables = self._references = None
+
+    def _keyword_items(self):
+        df = self._datafile
+        for setting in df.settings:
+            yield setting, None, setting.as_list()
+        for test in df.tests:
+            for setting in test.settings:
+                yield setting, None, setting.as_list()
+            for step in test.steps:
+                yield step, None, _step_values(step)
+        for kw in df.keywords:
+            yield kw.keyword_name, kw, [kw.name]
+            for item in chain(kw.steps, [kw.teardown] if kw.teardown else []):
+                yield item, None, _step_values(item)
+
+    def _variable_items(self):
+        df = self._datafile
+        for setting in df.settings:
+            yield setting, None, [setting.value]
+        for test in df.tests:
+            for setting in test.settings:
+                yield setting, None, [setting.value]
+            for step in test.steps:
+                yield step, None, step.as_list()
+        for kw in df.keywords:
+            yield kw.keyword_name, None, [kw.name]
+            for step in kw.steps:
+                yield step, None, step.as_list()
+            for setting in kw.settings:
+                yield setting, None, [setting.value]
+        yield df.variables, None, [value for var in df.variables for value in var.as_list()]
+
+
+class _ValueIndex(object):
+
+    def __init__(self, items, keys):
+        self._items = []
+        self._keys = {}
+        for position, (item, owner, values) in enumerate(items):
+            self._items.append((item, owner))
+            for value in values:
+                for key in keys(value if isinstance(value, str) else ''):
+                    positions = self._keys.setdefault(key, [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+
+    def __len__(self):
+        return len(self._items)
+
+    def positions(self, key):
+        return self._keys.get(key, [])
+
+    def matching_positions(self, matcher):
+        return sorted(set(chain.from_iterable(
+            positions for key, positions in self._keys.items() if matcher(key))))
+
+    def items(self, positions):
+        return [self._items[position] for position in positions]
+
+
+def _step_values(item):
+    values = item.as_list()
+    if isinstance(item, StepController):
+        values = values + [item.keyword] + item.args
+    return values
+
+
+def _keyword_keys(value):
+    keys = [value, utils.normalize(value)]
+    if StepController._GIVEN_WHEN_THEN_MATCHER.match(value):
+        keys.append(utils.normalize(StepController._GIVEN_WHEN_THEN_MATCHER.sub('', value)))
+    return keys
+
+
+def _variable_keys(value):
+    return _VARIABLE_MATCHER.findall(utils.normalize(value))
+
+
+def _variable_key(name):
+    key = utils.normalize(name)
+    return key if _INDEXABLE_VARIABLE.match(key) else None
@@ -13,6 +13,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from collections import Counter
+
 import wx
 from wx import Colour
 from wx.lib.expando import ExpandoTextCtrl
@@ -435,9 +437,11 @@ class Suggestions(object):
         self._suggestion_source = suggestion_source
         self._previous_value = None
         self._previous_choices = []
+        self._previous_keys = []
 
     def get_for(self, value, row=None):
-        self._previous_choices = self._get_choices(value, row)
+        self._previous_choices, self._previous_keys = \
+            self._get_choices(value, row)
         self._previous_value = value
         return [k for k, _ in self._previous_choices]
 
@@ -449,21 +453,24 @@ class Suggestions(object):
 
     def _get_choices(self, value, row):
         if self._previous_value and value.startswith(self._previous_value):
-            return [(key, val) for key, val in self._previous_choices
-                    if utils.normalize(key).startswith(utils.normalize(value))]
+            return self._narrow_previous_choices(utils.normalize(value))
         choices = self._suggestion_source.get_suggestions(value, row)
         duplicate_names = self._get_duplicate_names(choices)
-        return self._format_choices(choices, value, duplicate_names)
+        choices = self._format_choices(choices, value, duplicate_names)
+        return choices, [utils.normalize(key) for key, _ in choices]
+
+    def _narrow_previous_choices(self, normalized):
+        choices, keys = [], []
+        for choice, key in zip(self._previous_choices, self._previous_keys):
+            if key.startswith(normalized):
+                choices.append(choice)
+                keys.append(key)
+        return choices, keys
 
     @staticmethod
     def _get_duplicate_names(choices):
-        results = set()
-        normalized_names = [utils.normalize(ch.name) for ch in choices]
-        for choice in choices:
-            normalized = utils.normalize(choice.name)
-            if normalized_names.count(normalized) > 1:
-                results.add(normalized)
-        return results
+        counts = Counter(utils.normalize(ch.name) for ch in choices)
+        return set(name for name, count in counts.items() if count > 1)
 
     def _format_choices(self, choices, prefix, duplicate_names):
         return [(self._format(val, prefix, duplicate_names), val) for val in
@@ -26,6 +26,7 @@ from ..controller.cellinfo import CellType
 
 
 class Colorizer(object):
+    ROWS_PER_TASK = 20
 
     def __init__(self, grid, controller):
         self._grid = grid
@@ -44,19 +45,31 @@ class Colorizer(object):
         else:
             self._timer.Restart(50, self._current_task_id, selection_content)
 
-    def _coloring_task(self, task_index, selection_content, row=0, col=0):
+    def _coloring_task(self, task_index, selection_content, row=0):
         if task_index != self._current_task_id or self._grid is None:
             return
         if row >= self._grid.NumberRows:
             self._grid.ForceRefresh()
-        elif col < self._grid.NumberCols:
-            self._colorize_cell(row, col, selection_content)
-            wx.CallAfter(self._coloring_task, task_index, selection_content, row, col+1)
+            return
+        last_row = min(row + self.ROWS_PER_TASK, self._grid.NumberRows)
+        self._grid.BeginBatch()
+        try:
+            for current in range(row, last_row):
+                self._colorize_row(current, selection_content)
+        finally:
+            self._grid.EndBatch()
+        wx.CallAfter(self._coloring_task, task_index, selection_content, last_row)
+
+    def _colorize_row(self, row, selection_content):
+        columns = list(range(self._grid.NumberCols))
+        if hasattr(self._controller, 'get_cell_infos'):
+            cell_infos = self._controller.get_cell_infos(row, columns)
         else:
-            self._coloring_task(task_index, selection_content, row+1, 0)
+            cell_infos = [self._controller.get_cell_info(row, col) for col in columns]
+        for col, cell_info in zip(columns, cell_infos):
+            self._set_colors(row, col, cell_info, selection_content)
 
-    def _colorize_cell(self, row, col, selection_content):
-        cell_info = self._controller.get_cell_info(row, col)
+    def _set_colors(self, row, col, cell_info, selection_content):
         if cell_info is None:
             self._set_default_colors(row, col)
             return
@@ -0,0 +1,91 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from bisect import bisect_right
+from copy import deepcopy
+
+try:  # import installed version first
+    from pygments.lexers import robotframework as robotframeworklexer
+except ImportError:
+    robotframeworklexer = None
+
+STATE_INTERVAL = 50
+
+
+class IncrementalLexer(object):
+    """Lexes Robot Framework data line by line with the pygments tokenizers.
+
+    The state of the row tokenizer is stored before section headings and
+    before test, task and keyword names at least ``state_interval`` lines
+    after the previously stored state. Lexing can thus be restarted from
+    the nearest stored state before an edited line instead of from the
+    beginning of the document. States are valid as long as the lines
+    before them have not changed, so callers must call :meth:`restart_line`
+    with the first changed line before lexing again.
+    """
+
+    def __init__(self, state_interval=STATE_INTERVAL):
+        self._state_interval = state_interval
+        self._lines = []
+        self._states = {}
+
+    def reset(self):
+        self._lines = []
+        self._states = {}
+
+    def restart_line(self, line):
+        """Forgets states after ``line`` and returns the line to lex from."""
+        index = bisect_right(self._lines, line)
+        for forgotten in self._lines[index:]:
+            del self._states[forgotten]
+        del self._lines[index:]
+        return self._lines[-1] if self._lines else 0
+
+    def tokenize(self, rows, first_line):
+        """Yields line numbers and ``(value, token)`` pairs of ``rows``.
+
+        ``first_line`` must be a line returned by :meth:`restart_line`.
+        Every row is terminated by a newline token like with the pygments
+        ``RobotFrameworkLexer``.
+        """
+        row_tokenizer = self._state_at(first_line)
+        var_tokenizer = robotframeworklexer.VariableTokenizer()
+        previous = self._lines[-1] if self._lines else None
+        for line, row in enumerate(rows, start=first_line):
+            if line != first_line and self._is_block_start(row, line, previous):
+                self._store(line, row_tokenizer)
+                previous = line
+            yield line, [(value, token)
+                         for cell, cell_token in row_tokenizer.tokenize(row)
+                         for value, token in var_tokenizer.tokenize(cell, cell_token)
+                         if value]
+
+    def _state_at(self, line):
+        if line in self._states:
+            return deepcopy(self._states[line])
+        self.reset()
+        row_tokenizer = robotframeworklexer.RowTokenizer()
+        self._store(0, row_tokenizer)
+        return row_tokenizer
+
+    def _is_block_start(self, row, line, previous):
+        if row.startswith('*'):
+            return True
+        return row[:1] not in ('', ' ', '\t', '#', '|') and \
+            (previous is None or line - previous >= self._state_interval)
+
+    def _store(self, line, row_tokenizer):
+        self._lines.append(line)
+        self._states[line] = deepcopy(row_tokenizer)
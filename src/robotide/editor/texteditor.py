@@ -23,7 +23,7 @@ from wx.adv import HyperlinkCtrl, EVT_HYPERLINK
 
 from .. import robotapi
 from ..context import IS_WINDOWS, IS_MAC
-from ..controller.ctrlcommands import SetDataFile, INDENTED_START
+from ..controller.ctrlcommands import UpdateDataFile, INDENTED_START
 from ..controller.filecontrollers import ResourceFileController
 from ..controller.macrocontrollers import WithStepsController
 from ..namespace.suggesters import SuggestionSource
@@ -35,6 +35,7 @@ from ..publish import RideSettingsChanged, PUBLISHER
 from ..publish.messages import RideMessage
 from ..widgets import TextField, Label, HtmlDialog
 from ..widgets import VerticalSizer, HorizontalSizer, ButtonWithHandler, RIDEDialog
+from .incrementallexer import IncrementalLexer
 
 try:  # import installed version first
     from pygments.lexers import robotframework as robotframeworklexer
@@ -44,6 +45,7 @@ except ImportError:
 PLUGIN_NAME = 'Text Edit'
 TXT_NUM_SPACES = 'txt number of spaces'
 ZOOM_FACTOR = 'zoom factor'
+_WHITESPACE_REMOVER = str.maketrans('', '', string.whitespace)
 
 
 class TextEditorPlugin(Plugin, TreeAwarePluginMixin):
@@ -266,12 +268,13 @@ class DataValidationHandler(object):
 
     def validate_and_update(self, data, text):
         m_text = text.decode("utf-8")
-        if not self._sanity_check(data, m_text):
+        target = data.parse(m_text)
+        if not self._sanity_check(data, m_text, target):
             handled = self._handle_sanity_check_failure()
             if not handled:
                 return False
         self._editor.reset()
-        data.update_from(m_text)
+        data.update_from_target(target)
         """
         # DEBUG: This is the area where we will implement to not reformat code
         if self.source_editor._reformat:
@@ -286,23 +289,19 @@ class DataValidationHandler(object):
         self._editor.set_editor_caret_position()
         return True
 
-    def _sanity_check(self, data, text):
-        # First remove all lines starting with #
-        for line in text.split('\n'):
-            comment = line.strip().startswith('#')
-            if comment:
-                text = text.replace(line, '')
-        formatted_text = data.format_text(text)
-        c = self._normalize(formatted_text)
-        e = self._normalize(text)
+    def _sanity_check(self, data, text, target):
+        c = self._normalize(self._remove_comment_lines(data.format_target(target)))
+        e = self._normalize(self._remove_comment_lines(text))
         return len(c) == len(e)
 
+    @staticmethod
+    def _remove_comment_lines(text):
+        return '\n'.join(line for line in text.split('\n')
+                         if not line.strip().startswith('#'))
+
     @staticmethod
     def _normalize(text):
-        for item in tuple(string.whitespace) + ('...', '*'):
-            if item in text:
-                text = text.replace(item, '')
-        return text
+        return text.translate(_WHITESPACE_REMOVER).replace('...', '').replace('*', '')
 
     def _handle_sanity_check_failure(self):
         if self._last_answer == wx.ID_NO and time() - self._last_answer_time <= 0.2:
@@ -344,16 +343,22 @@ class DataFileWrapper(object):  # DEBUG: bad class name
         return self.wrapper_data == other.wrapper_data
 
     def update_from(self, content):
-        self.wrapper_data.execute(SetDataFile(self._create_target_from(content)))
+        self.update_from_target(self.parse(content))
+
+    def update_from_target(self, target):
+        self.wrapper_data.execute(UpdateDataFile(target))
 
-    def _create_target_from(self, content):
+    def parse(self, content):
         src = BytesIO(content.encode("utf-8"))
         target = self._create_target()
         FromStringIOPopulator(target).populate(src, self._tab_size)
         return target
 
     def format_text(self, text):
-        return self._txt_data(self._create_target_from(text))
+        return self.format_target(self.parse(text))
+
+    def format_target(self, target):
+        return self._txt_data(target)
 
     def mark_data_dirty(self):
         self.wrapper_data.mark_dirty()
@@ -1478,8 +1483,7 @@ class RobotDataEditor(stc.StyledTextCtrl):
         return self.GetText().encode('UTF-8')
 
     def OnStyle(self, event):
-        _ = event
-        self.stylizer.stylize()
+        self.stylizer.stylize(event.GetPosition())
 
     def OnZoom(self, event):
         _ = event
@@ -1533,6 +1537,7 @@ class RobotStylizer(object):
         self.tokens = {}
         self.editor = editor
         self.lexer = None
+        self.incremental_lexer = IncrementalLexer()
         self.settings = settings
         self._readonly = readonly
         self._ensure_default_font_is_valid()
@@ -1653,19 +1658,39 @@ class RobotStylizer(object):
             sys_font = wx.SystemSettings.GetFont(wx.SYS_ANSI_FIXED_FONT)
             self.settings[PLUGIN_NAME]['font face'] = sys_font.GetFaceName()
 
-    def stylize(self):
+    def stylize(self, end=None):
+        """Styles the document up to position ``end``.
+
+        Without ``end`` the whole document is styled from scratch. Otherwise
+        styling starts from the line Scintilla has styled up to, and lexing
+        from the nearest cached lexer state before it.
+        """
         if not self.lexer:
             return
-        self.editor.ConvertEOLs(2)
-        shift = 0
-        for position, token, value in self.lexer.get_tokens_unprocessed(self.editor.GetText()):
-            if wx.VERSION < (4, 1, 0):
-                self.editor.StartStyling(position + shift, 31)
-            else:
-                self.editor.StartStyling(position + shift)
-            try:
-                self.editor.SetStyling(len(value.encode('utf-8')), self.tokens[token])
-                shift += len(value.encode('utf-8')) - len(value)
-            except UnicodeEncodeError:
-                self.editor.SetStyling(len(value), self.tokens[token])
-                shift += len(value) - len(value)
+        if end is None:
+            self.editor.ConvertEOLs(2)
+            self.incremental_lexer.reset()
+            start_line = 0
+            end = self.editor.GetLength()
+        else:
+            start_line = self.editor.LineFromPosition(self.editor.GetEndStyled())
+        first_line = self.incremental_lexer.restart_line(start_line)
+        end_line = self.editor.LineFromPosition(end)
+        text = self.editor.GetTextRange(self.editor.PositionFromLine(first_line),
+                                        self.editor.GetLineEndPosition(end_line))
+        if wx.VERSION < (4, 1, 0):
+            self.editor.StartStyling(self.editor.PositionFromLine(start_line), 31)
+        else:
+            self.editor.StartStyling(self.editor.PositionFromLine(start_line))
+        for line, tokens in self.incremental_lexer.tokenize(text.split('\n'), first_line):
+            if line < start_line:
+                continue
+            for value, token in tokens:
+                self.editor.SetStyling(_byte_length(value), self.tokens[token])
+
+
+def _byte_length(value):
+    try:
+        return len(value.encode('UTF-8'))
+    except UnicodeEncodeError:
+        return len(value)
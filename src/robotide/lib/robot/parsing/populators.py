@@ -18,7 +18,7 @@ import os
 from robotide.lib.robot.errors import DataError
 from robotide.lib.robot.model import SuiteNamePatterns
 from robotide.lib.robot.output import LOGGER
-from robotide.lib.robot.utils import get_error_message, unic
+from robotide.lib.robot.utils import get_error_message, unic, Utf8Reader
 
 from .datarow import DataRow
 from .tablepopulators import (SettingTablePopulator, VariableTablePopulator,
@@ -37,6 +37,27 @@ READERS = {'html': HtmlReader, 'htm': HtmlReader, 'xhtml': HtmlReader,
 # Hook for external tools for altering ${CURDIR} processing
 PROCESS_CURDIR = True
 
+# Hook for external tools reading files in advance, for example in parallel
+# processes. Called with an absolute path, it returns rows created by
+# `split_rows` or None to read the file normally.
+PRESPLIT_ROWS = None
+
+
+def split_rows(path, tab_size=2, resource=False):
+    """Reads `path` and splits it into a list of `(line, cells)` pairs.
+
+    Returns None if the file cannot be read or its format is not row based.
+    Populating the file normally reports the error in that case.
+    """
+    try:
+        reader = FromFilePopulator.create_reader(path, resource, tab_size)
+        if not isinstance(reader, RobotReader):
+            return None
+        with open(path, 'rb') as source:
+            return list(reader.split_lines(Utf8Reader(source).readlines()))
+    except Exception:
+        return None
+
 
 class NoTestsFound(DataError):
     pass
@@ -67,6 +88,10 @@ class FromFilePopulator(object):
 
     def populate(self, path, resource=False):
         LOGGER.info("Parsing file '%s'." % path)
+        rows = PRESPLIT_ROWS(os.path.abspath(path)) if PRESPLIT_ROWS else None
+        if rows is not None:
+            self._populate_rows(path, rows, resource)
+            return
         source = self._open(path)
         try:
             # print(f"DEBUG: populators populate READER={self._get_reader(path, resource)}")
@@ -77,6 +102,12 @@ class FromFilePopulator(object):
         finally:
             source.close()
 
+    def _populate_rows(self, path, rows, resource):
+        try:
+            self._get_reader(path, resource).read_rows(rows, self)
+        except Exception:
+            raise DataError(get_error_message())
+
     @staticmethod
     def _open(path):
         if not os.path.isfile(path):
@@ -89,11 +120,15 @@ class FromFilePopulator(object):
             raise DataError(get_error_message())
 
     def _get_reader(self, path, resource=False):
+        return self.create_reader(path, resource, self._tab_size)
+
+    @staticmethod
+    def create_reader(path, resource=False, tab_size=2):
         file_format = os.path.splitext(path.lower())[-1][1:]
         if resource and file_format == 'resource':
             file_format = 'robot'
         try:
-            return READERS[file_format](self._tab_size)
+            return READERS[file_format](tab_size)
         except KeyError:
             raise DataError("Unsupported file format '%s'." % file_format)
 
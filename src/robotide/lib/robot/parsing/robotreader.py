@@ -19,6 +19,7 @@ from robotide.lib.robot.output import LOGGER
 from robotide.lib.robot.utils import Utf8Reader, prepr
 
 NBSP = u'\xa0'
+_COMMENT_OR_QUOTE = re.compile(r"""^#|(?<!\\)#(?=[ #])|["']""")
 
 
 class RobotReader(object):
@@ -37,12 +38,21 @@ class RobotReader(object):
     def read(self, file, populator, path=None):
         path = path or getattr(file, 'name', '<file-like object>')
         _ = path
+        return self.read_rows(self.split_lines(Utf8Reader(file).readlines()),
+                              populator)
+
+    def split_lines(self, lines):
+        """Yields `(line, cells)` pairs that can be given to `read_rows`."""
+        for line in lines:
+            row = line.rstrip()
+            if not self._separator_check:
+                self.check_separator(row)
+            yield line, self.split_row(row)
+
+    def read_rows(self, rows, populator):
         process = table_start = preamble = comments = False
         # print(f"DEBUG: RFLib RobotReader start Reading file")
-        for lineno, line in enumerate(Utf8Reader(file).readlines(), start=1):
-            if not self._separator_check:
-                self.check_separator(line.rstrip())
-            cells = self.split_row(line.rstrip())
+        for line, cells in rows:
             # DEBUG cells = list(self._check_deprecations(cells, path, lineno))
             # DEBUG Not parsing # before any table
             if line.lstrip().startswith('#'):
@@ -83,67 +93,27 @@ class RobotReader(object):
         return populator.eof()
 
     def sharp_strip(self, line):
-        row = []
-        i = 0
-        start_d_quote = end_d_quote = False
-        start_s_quote = end_s_quote = False
-        index = len(line)
-        while i < len(line):
-            if line[i] == '"':
-                if end_d_quote:
-                    start_d_quote = True
-                    end_d_quote = False
-                elif start_d_quote:
-                    end_d_quote = True
-                else:
-                    start_d_quote = True
-            if line[i] == "'":
-                if end_s_quote:
-                    start_s_quote = True
-                    end_s_quote = False
-                elif start_s_quote:
-                    end_s_quote = True
-                else:
-                    start_s_quote = True
-            if line[i] == '#' and not start_d_quote and not start_s_quote:
-                if i == 0:
-                    index = 0
-                    break
-                try:
-                    if i > 0 and line[i-1] != '\\' and (line[i+1] == ' ' or line[i+1] == '#'):
-                        index = i
-                        # print(f"DEBUG: RFLib RobotReader sharp_strip BREAK at # index={index}")
-                        break
-                except IndexError:
-                    i += 1
-                    continue
-            i += 1
-        if index < len(line):
-            cells = self._space_splitter.split(line[:index])
-            row.extend(cells)
+        # A comment starts from a `#` at the beginning of the line or from an
+        # unescaped `#` followed by a space or another `#`. Nothing after the
+        # first quote character can start a comment.
+        match = _COMMENT_OR_QUOTE.search(line)
+        if match and match.group() == '#':
+            index = match.start()
+            row = self._space_splitter.split(line[:index])
             row.append(line[index:])
         else:
             row = self._space_splitter.split(line)
-        # print(f"DEBUG: RFLib RobotReader sharp_strip after cells split index={index} row={row[:]}")
         # Remove empty cells after first non-empty
-        first_non_empty = -1
-        if row:
-            for i, v in enumerate(row):
-                if v != '':
-                    first_non_empty = i
-                    break
-            # print(f"DEBUG: RFLib RobotReader sharp_strip row first_non_empty={first_non_empty}")
-            if first_non_empty != -1:
-                for i in range(len(row)-1, first_non_empty, -1):
-                    if row[i] == '':
-                        # print(f"DEBUG: RFLib RobotReader sharp_strip popping ow i ={i} row[i]={row[i]}")
-                        row.pop(i)
-                # Remove initial empty cell
-                if len(row) > 1 and first_non_empty > 1 and row[0] == '' and row[1] != '':  # don't cancel indentation
-                    # print(f"DEBUG: RFLib RobotReader sharp_strip removing initial empty cell
-                    # first_non_empty={first_non_empty}")
-                    row.pop(0)
-        # print(f"DEBUG: RFLib RobotReader sharp_strip returning row={row[:]}")
+        for first_non_empty, value in enumerate(row):
+            if value != '':
+                break
+        else:
+            return row
+        if '' in row[first_non_empty + 1:]:
+            row[first_non_empty + 1:] = [value for value in row[first_non_empty + 1:] if value != '']
+        # Remove initial empty cell
+        if len(row) > 1 and first_non_empty > 1 and row[0] == '' and row[1] != '':  # don't cancel indentation
+            row.pop(0)
         return row
 
     def split_row(self, row):
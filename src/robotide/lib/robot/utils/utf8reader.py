@@ -43,7 +43,7 @@ class Utf8Reader(object):
         return self._decode(self._file.read())
 
     def readlines(self):
-        for index, line in enumerate(self._file.readlines()):
+        for index, line in enumerate(self._file):
             yield self._decode(line, remove_bom=index == 0)
 
     def _decode(self, content, remove_bom=True):
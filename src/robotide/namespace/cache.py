@@ -15,6 +15,7 @@
 
 import os
 import time
+from itertools import chain
 
 from ..robotapi import normpath, ALIAS_MARKER
 from ..spec.iteminfo import BlockKeywordInfo
@@ -35,6 +36,7 @@ class LibraryCache(object):
             self.set_library_manager(library_manager)
         self._libraries_need_refresh_listener = libraries_need_refresh_listener
         self._library_keywords = {}
+        self._used_libraries = {}
         self.__default_libraries = None
         self.__default_kws = None
 
@@ -60,19 +62,57 @@ class LibraryCache(object):
     def get_all_cached_library_names(self):
         return [name for name, _ in self._library_keywords]
 
+    def is_default_library(self, name):
+        return name in (self.__default_libraries or {})
+
     def _get_library(self, name, args):
-        library_database = \
-            self._library_manager.get_new_connection_to_library_database()
-        try:
-            last_updated = library_database.get_library_last_updated(name, args)
-            if last_updated:
-                if time.time() - last_updated > 10.0:
-                    self._library_manager.fetch_keywords(
-                        name, args, self._libraries_need_refresh_listener)
-                return library_database.fetch_library_keywords(name, args)
-            return self._library_manager.get_and_insert_keywords(name, args)
-        finally:
-            library_database.close()
+        return self._get_libraries([(name, args)])[0]
+
+    def _get_libraries(self, libraries):
+        """Returns keywords of each ``(name, args)`` pair in ``libraries``.
+
+        Stored libraries are read from the database in one batch and
+        refreshed in the background when their fingerprint has changed.
+        Libraries missing from the database are imported together and
+        waited for under one deadline. Keywords of libraries that are not
+        imported by then are ``None`` and the refresh listener is notified
+        once they are.
+        """
+        library_database = self._library_manager.get_library_database()
+        stored = library_database.fetch_libraries(libraries)
+        result = []
+        missing = []
+        for name, args in libraries:
+            self._used_libraries[(name, str(args))] = (name, args)
+            found = stored.get((name, str(args)))
+            if found:
+                _, fingerprint, keywords = found
+                if fingerprint != self._library_manager.library_fingerprint(name):
+                    self._refresh_library(name, args)
+                result.append(keywords)
+            else:
+                missing.append((len(result), (name, args)))
+                result.append(None)
+        if missing:
+            imported = self._library_manager.get_and_insert_libraries(
+                [library for _, library in missing], self._library_refreshed)
+            for (index, _), keywords in zip(missing, imported):
+                result[index] = keywords
+        return result
+
+    def refresh_libraries(self):
+        """Re-imports all libraries used so far, even if they look unchanged."""
+        for name, args in list(self._used_libraries.values()):
+            self._refresh_library(name, args)
+
+    def _refresh_library(self, name, args):
+        self._library_manager.fetch_keywords(
+            name, args, lambda *_: self._library_refreshed(name))
+
+    def _library_refreshed(self, name):
+        for key in [k for k in self._library_keywords if k[0] == name]:
+            del self._library_keywords[key]
+        self._libraries_need_refresh_listener(name)
 
     @staticmethod
     def _key(name, args):
@@ -82,8 +122,12 @@ class LibraryCache(object):
         args_with_alias = self._alias_to_args(alias, args)
         key = self._key(name, args_with_alias)
         if key not in self._library_keywords:
+            keywords = self._get_library(name, args)
+            if keywords is None:
+                # Not cached while importing, listener is notified when done
+                return []
             self._library_keywords[key] = [k.with_alias(alias) for k in
-                                           self._get_library(name, args)]
+                                           keywords]
 
         return self._library_keywords[key]
 
@@ -184,11 +228,10 @@ class LibraryCache(object):
         return kws
 
     def _get_default_libraries(self):
-        default_libs = {}
-        for libsetting in self._settings['auto imports'] + ['BuiltIn']:
-            name, args = self._get_name_and_args(libsetting)
-            default_libs[name] = self._get_library(name, args)
-        return default_libs
+        libraries = [self._get_name_and_args(libsetting) for libsetting in
+                     self._settings['auto imports'] + ['BuiltIn']]
+        return dict((name, keywords or []) for (name, _), keywords in
+                    zip(libraries, self._get_libraries(libraries)))
 
     @staticmethod
     def _get_name_and_args(libsetting):
@@ -198,6 +241,40 @@ class LibraryCache(object):
         return parts[0], parts[1:]
 
 
+class DependencyCache(object):
+    """Cache whose entries stay valid until one of their dependencies changes.
+
+    Every entry is stored together with the keys it was built from, e.g.
+    sources of imported resources. Invalidating such a key evicts only the
+    entries depending on it.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._dependents = {}
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def put(self, key, values, dependencies=()):
+        self._cache[key] = values
+        for dependency in chain([key], dependencies):
+            self._dependents.setdefault(dependency, set()).add(key)
+
+    def invalidate(self, dependency):
+        evicted = self._dependents.pop(dependency, set())
+        for key in evicted:
+            self._cache.pop(key, None)
+        return evicted
+
+    def clear(self):
+        self._cache.clear()
+        self._dependents.clear()
+
+    def __contains__(self, key):
+        return key in self._cache
+
+
 class ExpiringCache(object):
 
     def __init__(self, timeout=0.5):
@@ -33,6 +33,8 @@ class LocalMacroNamespace(object):
         return self.namespace.get_suggestions_for(self._controller, start)
 
     def has_name(self, value):
+        if self.namespace.looks_like_variable(value):
+            return self.namespace.has_variable(self._controller, value)
         for sug in self.namespace.get_suggestions_for(self._controller, value):
             if sug.name == value:
                 return True
@@ -79,14 +81,17 @@ class LocalRowNamespace(LocalMacroNamespace):
         return len(start) == 0 or start[0] in ['$', '@', '&']
 
     def has_name(self, value):
-        if self._row is not None:
-            for row, step in enumerate(self._controller.steps):
-                if self._row == row:
-                    break
-                if step.is_assigning(value):
-                    return True
+        if self._row is not None and self._is_assigned_before_row(value):
+            return True
         return LocalMacroNamespace.has_name(self, value)
 
+    def _is_assigned_before_row(self, value):
+        # Same as asking `is_assigning` from the steps before the row
+        if value.strip().endswith('='):
+            return self._row > 0 and bool(self._controller.steps)
+        row = self._controller.assignment_rows().get(value.replace('=', '').strip())
+        return row is not None and row < self._row
+
     def _remove_duplicates(self, suggestions, local_variables):
         def is_unique(gvar):
             return utils.normalize(gvar.name) not in \
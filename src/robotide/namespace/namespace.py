@@ -18,15 +18,20 @@ import os
 import re
 import sys
 import tempfile
+import time
+from bisect import bisect_left
 from itertools import chain
 
 
 from .. import robotapi, utils
 from ..publish import PUBLISHER, RideSettingsChanged, RideLogMessage
+from ..publish.messages import (RideDataChangedToDirty, RideDataFileSet, RideDataFileRemoved,
+                                RideImportSetting, RideVariableUpdated, RideVariableMovedUp,
+                                RideVariableMovedDown)
 from ..robotapi import VariableFileSetter
 from ..spec.iteminfo import (TestCaseUserKeywordInfo, ResourceUserKeywordInfo, VariableInfo, UserKeywordInfo,
                              ArgumentInfo)
-from .cache import LibraryCache, ExpiringCache
+from .cache import LibraryCache, DependencyCache
 from .resourcefactory import ResourceFactory
 from .embeddedargs import EmbeddedArgsHandler
 
@@ -42,14 +47,22 @@ class Namespace(object):
         self._init_caches()
         self._set_pythonpath()
         PUBLISHER.subscribe(self._setting_changed, RideSettingsChanged)
+        PUBLISHER.subscribe(self._datafile_changed, RideDataChangedToDirty)
+        PUBLISHER.subscribe(self._datafile_changed, RideImportSetting)
+        PUBLISHER.subscribe(self._datafile_set, RideDataFileSet)
+        PUBLISHER.subscribe(self._datafile_removed, RideDataFileRemoved)
+        PUBLISHER.subscribe(self._variable_changed, RideVariableUpdated)
+        PUBLISHER.subscribe(self._variable_changed, RideVariableMovedUp)
+        PUBLISHER.subscribe(self._variable_changed, RideVariableMovedDown)
 
     def _init_caches(self):
         self._lib_cache = LibraryCache(
-            self.settings, self.update, self._library_manager)
+            self.settings, self._library_refreshed, self._library_manager)
         self._resource_factory = ResourceFactory(self.settings)
         self._retriever = DatafileRetriever(self._lib_cache,
                                             self._resource_factory, self)
         self._context_factory = _RetrieverContextFactory()
+        self._variable_names = {}
 
     def _set_pythonpath(self):
         """Add user configured paths to PYTHONAPATH.
@@ -71,6 +84,45 @@ class Namespace(object):
                     sys.path.remove(p)
             self._set_pythonpath()
 
+    def _datafile_changed(self, message):
+        self._invalidate(message.datafile)
+
+    def _datafile_set(self, message):
+        self._invalidate(message.item)
+
+    def _datafile_removed(self, message):
+        self._resource_factory.forget(message.path)
+        self._invalidate_dependency(message.path)
+
+    def _variable_changed(self, message):
+        # Values can be used in import paths, and changing them in a datafile
+        # that is already dirty does not publish RideDataChangedToDirty
+        self._invalidate(message.item)
+
+    def _invalidate(self, controller):
+        datafile = getattr(controller, 'datafile', None)
+        if datafile is not None:
+            self._invalidate_dependency(datafile.source)
+
+    def _invalidate_dependency(self, dependency):
+        sources = self._retriever.invalidate(dependency)
+        self._context_factory.forget(sources)
+        self._variable_names.clear()
+
+    def _check_variable_files(self):
+        for path in self._retriever.modified_variable_files():
+            self._invalidate_dependency(path)
+
+    def _library_refreshed(self, name):
+        if self._lib_cache.is_default_library(name):
+            self.update()
+        else:
+            self._invalidate_dependency(DatafileRetriever.library_dependency(name))
+            self._notify_update_listeners()
+
+    def refresh_libraries(self):
+        self._lib_cache.refresh_libraries()
+
     def update_exec_dir_global_var(self, exec_dir):
         _VariableStash.global_variables['${EXECDIR}'] = exec_dir
         self._context_factory.reload_context_global_vars()
@@ -87,11 +139,36 @@ class Namespace(object):
         _ = args
         self._retriever.expire_cache()
         self._context_factory = _RetrieverContextFactory()
-        for listener in self._update_listeners:
+        self._variable_names.clear()
+        self._notify_update_listeners()
+
+    def update_datafile(self, datafile):
+        """Updates cached data of ``datafile`` and of datafiles importing it.
+
+        Unlike `update`, keywords and variables of unrelated datafiles are
+        kept in cache.
+        """
+        self._invalidate_dependency(datafile.source)
+        self._notify_update_listeners()
+
+    def _notify_update_listeners(self):
+        for listener in list(self._update_listeners):
             listener()
 
     def resource_filename_changed(self, old_name, new_name):
         self._resource_factory.resource_filename_changed(old_name, new_name)
+        self._invalidate_dependency(old_name)
+
+    def reload_resource(self, path):
+        """Parses resource file ``path`` again and returns the new model.
+
+        Cached data of datafiles importing the resource, and of datafiles
+        whose imports have not resolved, are updated.
+        """
+        self._resource_factory.forget(path)
+        self._invalidate_dependency(path)
+        self._invalidate_dependency(DatafileRetriever.UNRESOLVED_IMPORTS)
+        return self.get_resource(path)
 
     def reset_resource_and_library_cache(self):
         self._init_caches()
@@ -119,11 +196,12 @@ class Namespace(object):
         return self._lib_cache.get_default_keywords()
 
     def get_suggestions_for(self, controller, start):
+        self._check_variable_files()
         datafile = controller.datafile
         ctx = self._context_factory.ctx_for_controller(controller)
         sugs = set()
         sugs.update(self._get_suggestions_from_hooks(datafile, start))
-        if self._blank(start) or not self._looks_like_variable(start):
+        if self._blank(start) or not self.looks_like_variable(start):
             sugs.update(self._variable_suggestions(controller, start, ctx))
             sugs.update(self._keyword_suggestions(datafile, start, ctx))
         else:
@@ -132,6 +210,31 @@ class Namespace(object):
         sugs_list.sort()
         return sugs_list
 
+    def has_variable(self, controller, name):
+        """Is variable ``name`` visible in ``controller``.
+
+        Gives the same answer as looking for ``name`` in the suggestions
+        for it, but the names of the built-in variables, the variables of
+        the datafile, its variable files and resources, and the arguments
+        of ``controller`` are collected once and kept until the namespace
+        is updated or the arguments change.
+        """
+        self._check_variable_files()
+        if name in self._visible_variable_names(controller):
+            return True
+        return any(sug.name == name for sug in
+                   self._get_suggestions_from_hooks(controller.datafile, name))
+
+    def _visible_variable_names(self, controller):
+        arguments = tuple(controller.get_local_variables())
+        cached = self._variable_names.get(controller)
+        if cached is None or cached[0] != arguments:
+            ctx = self._context_factory.ctx_for_controller(controller)
+            names = frozenset(var.name for var in
+                              self._variable_suggestions(controller, '', ctx))
+            cached = self._variable_names[controller] = (arguments, names)
+        return cached[1]
+
     def _get_suggestions_from_hooks(self, datafile, start):
         sugs = []
         for hook in self._content_assist_hooks:
@@ -146,7 +249,7 @@ class Namespace(object):
         return start == ''
 
     @staticmethod
-    def _looks_like_variable(start):
+    def looks_like_variable(start):
         return len(start) == 1 and start[0] in ['$', '@', '&'] \
             or (len(start) >= 2 and start[:2] in ['${', '@{', '&{']) \
             or len(start) >= 2 and start[0] == '$'
@@ -164,12 +267,7 @@ class Namespace(object):
             variables.set_argument(name, value)
 
     def _keyword_suggestions(self, datafile, start, ctx):
-        start_normalized = utils.normalize(start)
-        all_kws = chain(self._get_default_keywords(),
-                        self._retriever.get_keywords_from(datafile, ctx))
-        return (sug for sug in all_kws
-                if sug.name_begins_with(start_normalized) or
-                sug.longname_begins_with(start_normalized))
+        return self._retriever.get_keyword_suggestions(datafile, ctx).get(start)
 
     def get_resources(self, datafile):
         return self._retriever.get_resources_from(datafile)
@@ -184,7 +282,9 @@ class Namespace(object):
         return self._resource_factory.get_resource_from_import(imp, ctx)
 
     def new_resource(self, path, directory=''):
-        return self._resource_factory.new_resource(directory, path)
+        resource = self._resource_factory.new_resource(directory, path)
+        self._invalidate_dependency(DatafileRetriever.UNRESOLVED_IMPORTS)
+        return resource
 
     def find_user_keyword(self, datafile, kw_name):
         kw = self.find_keyword(datafile, kw_name)
@@ -198,16 +298,19 @@ class Namespace(object):
         return kw if kw and kw.is_library_keyword() else None
 
     def is_library_import_ok(self, datafile, imp):
+        self._check_variable_files()
         return self._retriever.is_library_import_ok(
             datafile, imp, self._context_factory.ctx_for_datafile(datafile))
 
     def is_variables_import_ok(self, datafile, imp):
+        self._check_variable_files()
         return self._retriever.is_variables_import_ok(
             datafile, imp, self._context_factory.ctx_for_datafile(datafile))
 
     def find_keyword(self, datafile, kw_name):
         if not kw_name:
             return None
+        self._check_variable_files()
         kwds = self._retriever.get_keywords_cached(datafile,
                                                    self._context_factory)
         return kwds.get(kw_name)
@@ -242,11 +345,19 @@ class _RetrieverContextFactory(object):
         for retrieve_context in self._context_cache.values():
             retrieve_context.vars.load_builtin_global_vars()
 
+    def forget(self, sources):
+        """Removes contexts of controllers and datafiles having given sources."""
+        for key in list(self._context_cache):
+            datafile = getattr(key, 'datafile', key)
+            if getattr(datafile, 'source', None) in sources:
+                del self._context_cache[key]
+
 
 class RetrieverContext(object):
     def __init__(self):
         self.vars = _VariableStash()
         self.parsed = set()
+        self.dependencies = set()
 
     def set_variables_from_datafile_variable_table(self, datafile):
         self.vars.set_from_variable_table(datafile.variable_table)
@@ -386,12 +497,25 @@ class _VariableStash(object):
 
 
 class DatafileRetriever(object):
+    # Dependency of datafiles having resource imports that could not be
+    # resolved, they need refreshing when new resources are created
+    UNRESOLVED_IMPORTS = object()
+    # Seconds between checking imported variable files for modifications
+    VARIABLE_FILE_CHECK_INTERVAL = 1.0
+
     def __init__(self, lib_cache, resource_factory, namespace):
         self._namespace = namespace
         self._lib_cache = lib_cache
         self._resource_factory = resource_factory
-        self.keyword_cache = ExpiringCache()
+        self.keyword_cache = DependencyCache()
+        self.suggestion_cache = DependencyCache()
         self._default_kws = None
+        self._variable_files = {}
+        self._variable_files_checked = time.time()
+
+    @staticmethod
+    def library_dependency(name):
+        return 'library', name
 
     def get_all_cached_library_names(self):
         return self._lib_cache.get_all_cached_library_names()
@@ -403,9 +527,38 @@ class DatafileRetriever(object):
         return self._default_kws
 
     def expire_cache(self):
-        self.keyword_cache = ExpiringCache()
+        self.keyword_cache = DependencyCache()
+        self.suggestion_cache = DependencyCache()
         self._lib_cache.expire()
 
+    def invalidate(self, dependency):
+        """Evicts keywords cached for datafiles depending on ``dependency``.
+
+        Returns sources of the evicted datafiles, including ``dependency``.
+        """
+        sources = self.keyword_cache.invalidate(dependency)
+        sources.update(self.suggestion_cache.invalidate(dependency))
+        sources.add(dependency)
+        return sources
+
+    def modified_variable_files(self):
+        """Returns imported variable files modified on disk since import.
+
+        Files are checked at most once in ``VARIABLE_FILE_CHECK_INTERVAL``
+        seconds. Python variable files that are returned are removed from
+        ``sys.modules`` so that importing them again reads the new values.
+        """
+        now = time.time()
+        if now - self._variable_files_checked < self.VARIABLE_FILE_CHECK_INTERVAL:
+            return []
+        self._variable_files_checked = now
+        modified = [path for path, mtime in list(self._variable_files.items())
+                    if _modification_time(path) != mtime]
+        for path in modified:
+            del self._variable_files[path]
+            _forget_module(path)
+        return modified
+
     def get_keywords_from_several(self, datafiles):
         kws = set()
         kws.update(self.default_kws)
@@ -453,6 +606,7 @@ class DatafileRetriever(object):
         name = self._convert_to_absolute_path(name, imp)
         args = [ctx.replace_variables(a) for a in imp.args]
         alias = ctx.replace_variables(imp.alias) if imp.alias else None
+        ctx.dependencies.add(self.library_dependency(name))
         return self._lib_cache.get_library_keywords(name, args, alias)
 
     @staticmethod
@@ -475,9 +629,13 @@ class DatafileRetriever(object):
     def _res_kw_recursive_getter(self, imp, ctx):
         kws = []
         res = self._resource_factory.get_resource_from_import(imp, ctx)
-        if not res or res in ctx.parsed:
+        if not res:
+            ctx.dependencies.add(self.UNRESOLVED_IMPORTS)
+            return kws
+        if res in ctx.parsed:
             return kws
         ctx.parsed.add(res)
+        ctx.dependencies.add(res.source)
         ctx.set_variables_from_datafile_variable_table(res)
         for child in self._collect_import_of_type(res, robotapi.Resource):
             kws.extend(self._res_kw_recursive_getter(child, ctx))
@@ -498,11 +656,13 @@ class DatafileRetriever(object):
         for imp in self._collect_import_of_type(datafile, robotapi.Variables):
             self._import_vars(ctx, datafile, imp)
 
-    @staticmethod
-    def _import_vars(ctx, datafile, imp):
+    def _import_vars(self, ctx, datafile, imp):
         varfile_path = os.path.join(datafile.directory,
                                     ctx.replace_variables(imp.name))
         args = [ctx.replace_variables(a) for a in imp.args]
+        ctx.dependencies.add(varfile_path)
+        if varfile_path not in self._variable_files:
+            self._variable_files[varfile_path] = _modification_time(varfile_path)
         # print("DEBUG: Namespace _import_vars: %s args %s\n" % (varfile_path, args))
         try:
             ctx.vars.set_from_file(varfile_path, args)
@@ -515,14 +675,31 @@ class DatafileRetriever(object):
         _ = items
         self._get_vars_recursive(res, ctx)
 
+    def get_keyword_suggestions(self, datafile, ctx):
+        """Index of the keywords that can be suggested in ``datafile``.
+
+        The index is built from the default keywords and the keywords of
+        ``datafile`` and its imports once, and kept until one of them is
+        invalidated.
+        """
+        source = datafile.source
+        suggestions = self.suggestion_cache.get(source) if source else None
+        if suggestions is None:
+            suggestions = _KeywordSuggestions(chain(
+                self._lib_cache.get_default_keywords(),
+                self.get_keywords_from(datafile, ctx)))
+            if source:
+                self.suggestion_cache.put(source, suggestions, ctx.dependencies)
+        return suggestions
+
     def get_keywords_cached(self, datafile, context_factory):
         values = self.keyword_cache.get(datafile.source)
-        if not values:
-            words = self.get_keywords_from(
-                datafile, context_factory.ctx_for_datafile(datafile))
+        if values is None:
+            ctx = context_factory.ctx_for_datafile(datafile)
+            words = self.get_keywords_from(datafile, ctx)
             words.extend(self.default_kws)
             values = _Keywords(words)
-            self.keyword_cache.put(datafile.source, values)
+            self.keyword_cache.put(datafile.source, values, ctx.dependencies)
         return values
 
     def _get_user_keywords_from(self, datafile):
@@ -544,8 +721,11 @@ class DatafileRetriever(object):
         ctx.set_variables_from_datafile_variable_table(datafile)
         for imp in self._collect_import_of_type(datafile, robotapi.Resource):
             res = self._resource_factory.get_resource_from_import(imp, ctx)
-            if res and res not in ctx.parsed:
+            if not res:
+                ctx.dependencies.add(self.UNRESOLVED_IMPORTS)
+            elif res not in ctx.parsed:
                 ctx.parsed.add(res)
+                ctx.dependencies.add(res.source)
                 collector(res, ctx, items)
         return items
 
@@ -568,6 +748,21 @@ class DatafileRetriever(object):
         items.update(self._get_resources_recursive(res, ctx))
 
 
+def _modification_time(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _forget_module(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    source = getattr(sys.modules.get(name), '__file__', None)
+    if source and os.path.normcase(os.path.abspath(source)) == \
+            os.path.normcase(os.path.abspath(path)):
+        del sys.modules[name]
+
+
 class _Keywords(object):
 
     regexp = re.compile(r"\s*(given|when|then|and|but)\s*(.*)", re.IGNORECASE)
@@ -613,3 +808,44 @@ class _Keywords(object):
     def _get_bdd_name(self, kw_name):
         match = self.regexp.match(kw_name)
         return match.group(2) if match else None
+
+
+class _KeywordSuggestions(object):
+    """Keywords sorted by their normalized names and long names.
+
+    Keywords whose name or long name begins with a prefix are found by
+    bisecting the sorted names. A prefix starting with a BDD prefix like
+    ``Given`` also matches keywords by the rest of it.
+    """
+
+    bdd_prefix = re.compile(r'(given|when|then|and|but)\s+(.+)$', re.IGNORECASE)
+
+    def __init__(self, keywords):
+        self._keywords = sorted(set(keywords))
+        entries = []
+        for index, kw in enumerate(self._keywords):
+            name = utils.normalize(kw.name)
+            entries.append((name, index))
+            longname = utils.normalize(kw.longname)
+            if longname != name:
+                entries.append((longname, index))
+        entries.sort()
+        self._names = [name for name, _ in entries]
+        self._indexes = [index for _, index in entries]
+
+    def get(self, start):
+        """Keywords whose name or long name begins with ``start``."""
+        if not start:
+            return list(self._keywords)
+        indexes = set(self._matching(utils.normalize(start)))
+        match = self.bdd_prefix.match(start.strip())
+        if match:
+            indexes.update(self._matching(utils.normalize(match.group(2))))
+        return [self._keywords[index] for index in sorted(indexes)]
+
+    def _matching(self, prefix):
+        position = bisect_left(self._names, prefix)
+        while position < len(self._names) and \
+                self._names[position].startswith(prefix):
+            yield self._indexes[position]
+            position += 1
@@ -35,6 +35,21 @@ CREATE TABLE keywords (name TEXT,
                        FOREIGN KEY(library) REFERENCES libraries(id));
 """
 
+INDEX_SCRIPT = """\
+CREATE INDEX IF NOT EXISTS libraries_by_name
+    ON libraries (name, arguments, last_updated);
+CREATE INDEX IF NOT EXISTS keywords_by_library ON keywords (library);
+"""
+
+# Scripts upgrading the database schema from the previous version,
+# indexed by the version they upgrade to.
+MIGRATIONS = {1: INDEX_SCRIPT,
+              2: 'ALTER TABLE libraries ADD COLUMN fingerprint TEXT;'}
+SCHEMA_VERSION = max(MIGRATIONS)
+
+# Maximum number of host parameters in a single SQLite statement
+_MAX_PARAMETERS = 900
+
 DATABASE_FILE = os.path.join(system_decode(SETTINGS_DIRECTORY),
                              'librarykeywords.db')
 
@@ -43,9 +58,41 @@ def _create_database():
     print('Creating librarykeywords database to "%s"' % DATABASE_FILE)
 
     connection = sqlite3.connect(DATABASE_FILE)
+    connection.execute('PRAGMA journal_mode=WAL')
+    _create_schema(connection)
+    connection.close()
+
+
+def _create_schema(connection):
     connection.executescript(CREATION_SCRIPT)
+    for version in sorted(MIGRATIONS):
+        connection.executescript(MIGRATIONS[version])
+    _set_schema_version(connection, SCHEMA_VERSION)
     connection.commit()
-    connection.close()
+
+
+def _get_schema_version(connection):
+    return connection.execute('PRAGMA user_version').fetchone()[0]
+
+
+def _set_schema_version(connection, version):
+    connection.execute('PRAGMA user_version = %d' % version)
+
+
+def _migrate_database():
+    connection = sqlite3.connect(DATABASE_FILE)
+    try:
+        connection.execute('PRAGMA journal_mode=WAL')
+        version = _get_schema_version(connection)
+        if version > SCHEMA_VERSION:
+            raise sqlite3.DatabaseError('unknown schema version %d' % version)
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            print('migrating librarykeywords database to version %d' % target)
+            connection.executescript(MIGRATIONS[target])
+            _set_schema_version(connection, target)
+            connection.commit()
+    finally:
+        connection.close()
 
 
 def _validate_database():
@@ -67,6 +114,7 @@ def initialize_database():
     else:
         try:
             _validate_database()
+            _migrate_database()
         except sqlite3.DatabaseError as err:
             print('removing database "%s"' % DATABASE_FILE)
             print('error during database validation "%s"' % err)
@@ -80,12 +128,12 @@ def initialize_database():
 
 class LibraryDatabase(object):
 
-    def __init__(self, database):
-        self._connection = sqlite3.connect(database, timeout=30.0)
+    def __init__(self, database, check_same_thread=True):
+        self._connection = sqlite3.connect(database, timeout=30.0,
+                                           check_same_thread=check_same_thread)
 
     def create_database(self):
-        self._cursor().executescript(CREATION_SCRIPT)
-        self._connection.commit()
+        _create_schema(self._connection)
 
     def _cursor(self):
         return self._connection.cursor()
@@ -94,7 +142,7 @@ class LibraryDatabase(object):
         self._connection.close()
 
     def insert_library_keywords(self, library_name, library_arguments,
-                                keywords):
+                                keywords, fingerprint=None):
         library_doc_format = "ROBOT"
         if len(keywords) > 0:
             library_doc_format = keywords[0].doc_format
@@ -110,31 +158,60 @@ class LibraryDatabase(object):
         cur.executemany('delete from keywords where library = ?', old_versions)
         cur.executemany('delete from libraries where id = ?', old_versions)
         lib = self._insert_library(library_name, library_doc_format,
-                                   library_arguments, cur)
+                                   library_arguments, fingerprint, cur)
         keyword_values = [[kw.name, kw.doc, u' | '.join(kw.arguments),
                            kw.source,
                            lib[0]] for kw in keywords if kw is not None]
         self._insert_library_keywords(keyword_values, cur)
         self._connection.commit()
 
-    def update_library_timestamp(self, name, arguments, milliseconds=None):
-        self._cursor().execute('update libraries set last_updated = ?'
+    def update_library_timestamp(self, name, arguments, milliseconds=None,
+                                 fingerprint=None):
+        self._cursor().execute('update libraries set last_updated = ?,'
+                               ' fingerprint = coalesce(?, fingerprint)'
                                ' where name = ? and arguments = ?',
-                               (milliseconds or time.time(), name,
-                                str(arguments)))
+                               (milliseconds or time.time(), fingerprint,
+                                name, str(arguments)))
         self._connection.commit()
 
     def fetch_library_keywords(self, library_name, library_arguments):
         lib = self._fetch_lib(library_name, library_arguments, self._cursor())
         if lib is None:
             return []
-        return [LibraryKeywordInfo(name, doc, lib[2], library_name,
-                                   arguments.split(u' | ') if arguments else [])
-                for name, doc, arguments, library_name in
+        return [self._keyword_info(row, lib[2]) for row in
                 self._connection.execute('select name, doc, arguments,'
                                          ' library_name from keywords where'
                                          ' library = ?', [lib[0]])]
 
+    def fetch_libraries(self, libraries):
+        """Fetches keywords of many libraries with few queries.
+
+        ``libraries`` is an iterable of ``(name, arguments)`` pairs. Returns
+        a dictionary mapping each stored pair, with arguments converted to
+        string, to a ``(last_updated, fingerprint, keywords)`` tuple.
+        Libraries that are not in the database are left out.
+        """
+        cursor = self._cursor()
+        libs = dict((lib[0], lib) for lib in
+                    self._fetch_libs(libraries, cursor).values())
+        keywords = dict((lib_id, []) for lib_id in libs)
+        lib_ids = list(libs)
+        for start in range(0, len(lib_ids), _MAX_PARAMETERS):
+            chunk = lib_ids[start:start + _MAX_PARAMETERS]
+            rows = cursor.execute('select name, doc, arguments, library_name,'
+                                  ' library from keywords where library in'
+                                  ' (%s)' % ', '.join('?' * len(chunk)), chunk)
+            for row in rows:
+                keywords[row[4]].append(self._keyword_info(row[:4], libs[row[4]][2]))
+        return dict(((lib[1], lib[3]), (lib[4], lib[5], keywords[lib_id]))
+                    for lib_id, lib in libs.items())
+
+    @staticmethod
+    def _keyword_info(row, doc_format):
+        name, doc, arguments, library_name = row
+        return LibraryKeywordInfo(name, doc, doc_format, library_name,
+                                  arguments.split(u' | ') if arguments else [])
+
     def library_exists(self, library_name, library_arguments):
         return self._fetch_lib(library_name, library_arguments,
                                self._cursor()) is not None
@@ -145,18 +222,46 @@ class LibraryDatabase(object):
             return 0.0
         return lib[4]
 
-    def _insert_library(self, name, doc_format, arguments, cursor):
-        cursor.execute('insert into libraries values (null, ?, ?, ?, ?)',
-                       (name, doc_format, str(arguments), time.time()))
-        return self._fetch_lib(name, arguments, cursor)
-
-    def _fetch_lib(self, name, arguments, cursor):
-        t = cursor.execute('select max(last_updated) from libraries where name'
-                           ' = ?  and arguments = ?',
-                           (name, str(arguments))).fetchone()[0]
-        return cursor.execute('select * from libraries where name = ?'
-                              '  and arguments = ? and last_updated = ?',
-                              (name, str(arguments), t)).fetchone()
+    def get_library_fingerprint(self, library_name, library_arguments):
+        lib = self._fetch_lib(library_name, library_arguments, self._cursor())
+        return lib[5] if lib else None
+
+    def _insert_library(self, name, doc_format, arguments, fingerprint,
+                        cursor):
+        values = (name, doc_format, str(arguments), time.time(), fingerprint)
+        cursor.execute('insert into libraries (id, name, doc_format,'
+                       ' arguments, last_updated, fingerprint)'
+                       ' values (null, ?, ?, ?, ?, ?)', values)
+        return (cursor.lastrowid,) + values
+
+    @staticmethod
+    def _fetch_lib(name, arguments, cursor):
+        return cursor.execute('select id, name, doc_format, arguments,'
+                              ' last_updated, fingerprint from libraries'
+                              ' where name = ?'
+                              ' and arguments = ? order by last_updated desc'
+                              ' limit 1', (name, str(arguments))).fetchone()
+
+    @staticmethod
+    def _fetch_libs(libraries, cursor):
+        # Newest row of every (name, arguments) pair, like _fetch_lib
+        pairs = list(set((name, str(arguments)) for name, arguments in libraries))
+        chunk_size = _MAX_PARAMETERS // 2
+        libs = {}
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start:start + chunk_size]
+            rows = cursor.execute('with wanted (name, arguments) as (values %s)'
+                                  ' select id, libraries.name, doc_format,'
+                                  ' libraries.arguments, last_updated,'
+                                  ' fingerprint from libraries join wanted'
+                                  ' on libraries.name = wanted.name and'
+                                  ' libraries.arguments = wanted.arguments'
+                                  ' order by last_updated'
+                                  % ', '.join(['(?, ?)'] * len(chunk)),
+                                  [value for pair in chunk for value in pair])
+            for row in rows:
+                libs[(row[1], row[3])] = row
+        return libs
 
     def _insert_library_keywords(self, data, cursor):
         cursor.executemany('insert into keywords values (?, ?, ?, ?, ?)', data)
@@ -13,9 +13,19 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import os
+from functools import lru_cache
+from importlib.util import find_spec
+
 from .. import robotapi
+from ..lib.robot import libraries as standard_libraries
 from .iteminfo import LibraryKeywordInfo
 
+try:
+    from importlib.metadata import packages_distributions, version
+except ImportError:  # Python < 3.10
+    packages_distributions = version = None
+
 
 def get_import_result(path, args):
     lib = robotapi.TestLibrary(path, args)
@@ -41,3 +51,72 @@ def _parse_args(args):
     if args.kwargs:
         parsed.append('**%s' % args.kwargs)
     return parsed
+
+
+def get_library_fingerprint(path):
+    """Returns a string that changes when library ``path`` is modified.
+
+    The fingerprint contains the library source file, its modification time
+    and size, and the version of the installed distribution providing it.
+    Libraries whose source cannot be located without importing them have
+    no fingerprint and ``None`` is returned.
+    """
+    source = _library_source(path)
+    if not source:
+        return None
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    return '%s|%s|%s|%s' % (source, stat.st_mtime, stat.st_size,
+                            _distribution_version(path))
+
+
+def _library_source(path):
+    if os.path.isdir(path):
+        path = os.path.join(path, '__init__.py')
+    if os.path.isfile(path):
+        return path
+    if path in robotapi.STDLIB_NAMES:
+        path = '%s.%s' % (standard_libraries.__name__, path)
+    return _module_source(path.split('.'))
+
+
+def _module_source(parts):
+    try:
+        spec = find_spec(parts[0])
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    source, locations = spec.origin, spec.submodule_search_locations
+    for part in parts[1:]:
+        if not locations:
+            break
+        base = os.path.join(list(locations)[0], part)
+        if os.path.isfile(os.path.join(base, '__init__.py')):
+            source, locations = os.path.join(base, '__init__.py'), [base]
+        elif os.path.isfile(base + '.py'):
+            source, locations = base + '.py', None
+        else:
+            break
+    return source if source and os.path.isfile(source) else None
+
+
+def _distribution_version(path):
+    if not packages_distributions:
+        return None
+    top_level = os.path.splitext(os.path.basename(path))[0].split('.')[0] \
+        if os.path.exists(path) else path.split('.')[0]
+    names = _distributions().get(top_level)
+    if not names:
+        return None
+    try:
+        return version(names[0])
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _distributions():
+    return packages_distributions()
@@ -16,26 +16,38 @@
 import os
 import queue as Queue
 from sqlite3 import OperationalError
-from threading import Thread
+from threading import Condition, Lock, Thread, get_ident
 
 from ..publish import RideLogException, RideLogMessage
 from ..spec.librarydatabase import LibraryDatabase
-from ..spec.libraryfetcher import get_import_result
+from ..spec.libraryfetcher import get_import_result, get_library_fingerprint
+from ..spec.libraryworkers import LibraryWorkerPool, DEFAULT_TIMEOUT
 from ..spec.xmlreaders import get_path, SpecInitializer
 
 
 class LibraryManager(Thread):
 
-    def __init__(self, database_name, spec_initializer=None):
+    def __init__(self, database_name, spec_initializer=None, workers=0,
+                 library_timeout=DEFAULT_TIMEOUT):
+        """Library keywords are imported in this thread when ``workers`` is
+        zero, otherwise concurrently by a pool of that many worker processes.
+        Database writes are always done in this thread.
+        """
         self._database_name = database_name
         self._database = None
+        self._read_connections = {}
+        self._read_connections_lock = Lock()
         self._messages = Queue.Queue()
         self._spec_initializer = spec_initializer or SpecInitializer()
+        self._pool = LibraryWorkerPool(workers, library_timeout) \
+            if workers else None
         Thread.__init__(self)
         self.daemon = True
 
     def run(self):
         self._initiate_database_connection()
+        if self._pool:
+            self._pool.start()
         while True:
             try:
                 if not self._handle_message():
@@ -48,14 +60,38 @@ class LibraryManager(Thread):
     def _initiate_database_connection(self):
         self._database = LibraryDatabase(self._database_name)
 
-    def get_new_connection_to_library_database(self):
-        library_database = LibraryDatabase(self._database_name)
+    def get_new_connection_to_library_database(self, check_same_thread=True):
+        library_database = LibraryDatabase(self._database_name,
+                                           check_same_thread)
         if self._database_name == ':memory:':
             # In memory database does not point to the right place..
             # this is here for unit tests..
             library_database.create_database()
         return library_database
 
+    def get_library_database(self):
+        """Returns a long-lived read connection owned by the calling thread.
+
+        Connections are pooled per thread and closed when the manager stops,
+        so readers do not need to open a new connection for every lookup.
+        They are only used by their own thread, but are not restricted to
+        it so that :meth:`stop` can close them.
+        """
+        key = get_ident()
+        with self._read_connections_lock:
+            if key not in self._read_connections:
+                self._read_connections[key] = \
+                    self.get_new_connection_to_library_database(
+                        check_same_thread=False)
+            return self._read_connections[key]
+
+    def _close_read_connections(self):
+        with self._read_connections_lock:
+            connections = list(self._read_connections.values())
+            self._read_connections.clear()
+        for connection in connections:
+            connection.close()
+
     def _handle_message(self):
         message = self._messages.get()
         if not message:
@@ -67,40 +103,95 @@ class LibraryManager(Thread):
             self._handle_insert_keywords_message(message)
         elif msg_type == 'create':
             self._database.create_database()
+        elif msg_type == 'fetched':
+            self._handle_fetched_keywords_message(message)
+        elif msg_type == 'inserted':
+            self._handle_inserted_keywords_message(message)
         return True
 
     def _handle_fetch_keywords_message(self, message):
         _, library_name, library_args, callback = message
+        if self._pool:
+            self._import_in_pool('fetched', library_name, library_args,
+                                 callback)
+            return
         keywords = self._fetch_keywords(library_name, library_args)
         self._update_database_and_call_callback_if_needed(
             (library_name, library_args), keywords, callback)
 
+    def _handle_fetched_keywords_message(self, message):
+        _, library_name, library_args, keywords, error, callback = message
+        if error:
+            keywords = self._keywords_from_spec(library_name, error)
+        self._update_database_and_call_callback_if_needed(
+            (library_name, library_args), keywords, callback)
+
+    def _import_in_pool(self, msg_type, library_name, library_args, target):
+        try:
+            path = self._library_path(library_name)
+        except Exception as err:
+            self._messages.put((msg_type, library_name, library_args, None,
+                                err, target))
+            return
+        self._pool.submit(path, library_args,
+                          lambda keywords, error: self._messages.put(
+                              (msg_type, library_name, library_args, keywords,
+                               error, target)))
+
+    @staticmethod
+    def _library_path(library_name):
+        return get_path(
+            library_name.replace('/', os.sep), os.path.abspath('.'))
+
+    def library_fingerprint(self, library_name):
+        """Returns the current fingerprint of ``library_name`` or ``None``.
+
+        Stored keywords are up-to-date while the stored fingerprint equals
+        this one.
+        """
+        try:
+            return get_library_fingerprint(self._library_path(library_name))
+        except Exception:
+            return None
+
     def _fetch_keywords(self, library_name, library_args):
         try:
-            path = get_path(
-                library_name.replace('/', os.sep), os.path.abspath('.'))
+            path = self._library_path(library_name)
             return get_import_result(path, library_args)
         except Exception as err:
-            try:
-                print('FAILED', library_name, err)
-            except IOError:
-                pass
-            kws = self._spec_initializer.init_from_spec(library_name)
-            if not kws:
-                msg = 'Importing test library "%s" failed' % library_name
-                RideLogException(
-                    message=msg, exception=err, level='WARN').publish()
-            return kws
+            return self._keywords_from_spec(library_name, err)
+
+    def _keywords_from_spec(self, library_name, err):
+        try:
+            print('FAILED', library_name, err)
+        except IOError:
+            pass
+        kws = self._spec_initializer.init_from_spec(library_name)
+        if not kws:
+            msg = 'Importing test library "%s" failed' % library_name
+            RideLogException(
+                message=msg, exception=err, level='WARN').publish()
+        return kws
 
     def _handle_insert_keywords_message(self, message):
-        _, library_name, library_args, result_queue = message
+        _, library_name, library_args, callback = message
+        if self._pool:
+            self._import_in_pool('inserted', library_name, library_args,
+                                 callback)
+            return
         keywords = self._fetch_keywords(library_name, library_args)
-        self._insert(library_name, library_args, keywords,
-                     lambda res: result_queue.put(res, timeout=3))
+        self._insert(library_name, library_args, keywords, callback)
+
+    def _handle_inserted_keywords_message(self, message):
+        _, library_name, library_args, keywords, error, callback = message
+        if error:
+            keywords = self._keywords_from_spec(library_name, error)
+        self._insert(library_name, library_args, keywords, callback)
 
     def _insert(self, library_name, library_args, keywords, callback):
         self._database.insert_library_keywords(
-            library_name, library_args, keywords or [])
+            library_name, library_args, keywords or [],
+            self.library_fingerprint(library_name))
         self._call(callback, keywords)
 
     def _update_database_and_call_callback_if_needed(
@@ -111,7 +202,9 @@ class LibraryManager(Thread):
                 self._insert(
                     library_key[0], library_key[1], keywords, callback)
             else:
-                self._database.update_library_timestamp(*library_key)
+                self._database.update_library_timestamp(
+                    *library_key,
+                    fingerprint=self.library_fingerprint(library_key[0]))
         except OperationalError:
             pass
 
@@ -127,21 +220,37 @@ class LibraryManager(Thread):
                            timeout=3)
 
     def get_and_insert_keywords(self, library_name, library_args):
-        result_queue = Queue.Queue(maxsize=1)
-        self._messages.put(
-            ('insert', library_name, library_args, result_queue), timeout=3)
-        try:
-            return result_queue.get(timeout=5)
-        except Queue.Empty as e:
+        return self.get_and_insert_libraries(
+            [(library_name, library_args)])[0] or []
+
+    def get_and_insert_libraries(self, libraries, late_callback=None):
+        """Imports ``(name, args)`` pairs in ``libraries`` and stores them.
+
+        All libraries are queued before waiting, so a worker pool imports
+        them concurrently, and they are all waited for under one deadline.
+        Keywords of libraries not imported by then are returned as ``None``
+        and ``late_callback`` is called with their name once they are stored.
+        """
+        result = _InsertResult(libraries, late_callback)
+        for index, (name, args) in enumerate(libraries):
+            self._messages.put(('insert', name, args, result.callback(index)),
+                               timeout=3)
+        keywords = result.wait(self._pool.timeout + 5 if self._pool else 5)
+        late = [name for (name, _), kws in zip(libraries, keywords)
+                if kws is None]
+        if late:
             RideLogMessage(u'Failed to read keywords from library db: {}'
-                           .format(str(e))).publish()
-            return []
+                           .format(', '.join(late))).publish()
+        return keywords
 
     def create_database(self):
         self._messages.put(('create',), timeout=3)
 
     def stop(self):
         self._messages.put(False, timeout=3)
+        if self._pool:
+            self._pool.stop()
+        self._close_read_connections()
 
     def _keywords_differ(self, keywords1, keywords2):
         if keywords1 != keywords2 and None in (keywords1, keywords2):
@@ -160,3 +269,34 @@ class LibraryManager(Thread):
             if k1.source != k2.source:
                 return True
         return False
+
+
+class _InsertResult(object):
+    """Keywords of libraries inserted in one batch until its deadline."""
+
+    def __init__(self, libraries, late_callback):
+        self._libraries = libraries
+        self._late_callback = late_callback
+        self._keywords = [None] * len(libraries)
+        self._pending = len(libraries)
+        self._waiting = True
+        self._condition = Condition()
+
+    def callback(self, index):
+        return lambda keywords: self._inserted(index, keywords)
+
+    def _inserted(self, index, keywords):
+        with self._condition:
+            if self._waiting:
+                self._keywords[index] = keywords or []
+                self._pending -= 1
+                self._condition.notify()
+                return
+        if self._late_callback:
+            self._late_callback(self._libraries[index][0])
+
+    def wait(self, timeout):
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending, timeout)
+            self._waiting = False
+            return list(self._keywords)
@@ -0,0 +1,139 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import multiprocessing
+import os
+import queue as Queue
+import sys
+from threading import Thread
+
+from .iteminfo import LibraryKeywordInfo
+from .libraryfetcher import get_import_result
+
+DEFAULT_TIMEOUT = 60.0
+
+
+def default_worker_count():
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class LibraryImportError(Exception):
+    pass
+
+
+class LibraryWorkerPool(object):
+    """Introspects test libraries concurrently in worker processes.
+
+    Every worker process is driven by its own thread taking jobs from a
+    shared queue, so a slow library only occupies one worker. A library
+    that does not finish within ``timeout`` seconds, or that crashes its
+    worker, fails with :class:`LibraryImportError` and the worker process
+    is replaced before the next job.
+    """
+
+    def __init__(self, size, timeout=DEFAULT_TIMEOUT):
+        self._size = size
+        self.timeout = timeout
+        self._jobs = Queue.Queue()
+        self._threads = []
+        self._context = multiprocessing.get_context('spawn')
+
+    def start(self):
+        for _ in range(self._size):
+            thread = Thread(target=self._serve)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+        self._threads = []
+
+    def submit(self, path, args, callback):
+        """Introspects library ``path`` with ``args`` in a worker process.
+
+        ``callback`` is called from a pool thread with the keywords and
+        ``None``, or with ``None`` and the error if the import failed.
+        """
+        self._jobs.put((path, args, callback))
+
+    def _serve(self):
+        worker = None
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                path, args, callback = job
+                if worker is None or not worker.is_alive():
+                    worker = _Worker(self._context)
+                try:
+                    keywords, error = worker.introspect(path, args, self.timeout), None
+                except LibraryImportError as err:
+                    keywords, error = None, err
+                callback(keywords, error)
+        finally:
+            if worker:
+                worker.close()
+
+
+class _Worker(object):
+
+    def __init__(self, context):
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(target=_work, args=(child_connection,))
+        self._process.daemon = True
+        self._process.start()
+        child_connection.close()
+
+    def is_alive(self):
+        return self._process.is_alive()
+
+    def introspect(self, path, args, timeout):
+        try:
+            self._connection.send((path, args, sys.path[:]))
+            if self._connection.poll(timeout):
+                status, result = self._connection.recv()
+            else:
+                status, result = 'error', 'Importing timed out after %s seconds' % timeout
+                self.close()
+        except (EOFError, OSError) as err:
+            status, result = 'error', 'Library worker process died: %s' % err
+            self.close()
+        if status != 'ok':
+            raise LibraryImportError(result)
+        return [LibraryKeywordInfo(*values) for values in result]
+
+    def close(self):
+        self._connection.close()
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join(1)
+
+
+def _work(connection):
+    while True:
+        try:
+            path, args, pythonpath = connection.recv()
+        except EOFError:
+            return
+        sys.path[:] = pythonpath
+        try:
+            result = 'ok', [(kw.name, kw.doc, kw.doc_format, kw.source, kw.arguments)
+                            for kw in get_import_result(path, args)]
+        except Exception as err:
+            result = 'error', '%s: %s' % (type(err).__name__, err)
+        connection.send(result)
@@ -31,6 +31,7 @@ from ..widgets import PopupMenuItem, ButtonWithHandler, Label, Font, HtmlWindow,
 ALL_KEYWORDS = '<all keywords>'
 ALL_USER_KEYWORDS = '<all user keywords>'
 ALL_LIBRARY_KEYWORDS = '<all library keywords>'
+_FUZZY_PATTERN_MIN_LENGTH = 3
 
 
 class KeywordSearch(Plugin):
@@ -39,6 +40,7 @@ class KeywordSearch(Plugin):
     def __init__(self, app):
         Plugin.__init__(self, app)
         self.all_keywords = []
+        self._index = _KeywordIndex(self.all_keywords)
         self._criteria = _SearchCriteria()
         self.dirty = False
 
@@ -70,13 +72,14 @@ class KeywordSearch(Plugin):
     def _update(self):
         self.dirty = False
         self.all_keywords = self.model.get_all_keywords()
+        self._index = _KeywordIndex(self.all_keywords)
 
     def search(self, pattern, search_docs, source_filter):
         self._criteria = _SearchCriteria(pattern, search_docs, source_filter)
         return self._search()
 
     def _search(self):
-        return [ kw for kw in self.all_keywords if self._criteria.matches(kw) ]
+        return self._index.search(self._criteria)
 
     def _search_resource(self, item):
         if isinstance(item, (TestCaseFileController, ResourceFileController)):
@@ -100,13 +103,42 @@ class _SearchCriteria(object):
         self._pattern = pattern
         self._search_docs = search_docs
         self._source_filter = source_filter
+        self.normalized_pattern = utils.normalize(pattern)
+
+    @property
+    def source_filter(self):
+        return self._source_filter
 
     def matches(self, kw):
         if not self._matches_source_filter(kw):
             return False
-        if self._contains(kw.name, self._pattern):
-            return True
-        return self._search_docs and self._contains(kw.doc, self._pattern)
+        name, word_starts = _normalized_name(kw)
+        return self.rank(name, word_starts, _normalized_doc(kw)) is not None
+
+    def rank(self, name, word_starts, doc):
+        """Rank of a keyword with normalized ``name`` and ``doc``, or ``None``.
+
+        ``word_starts`` are the positions in ``name`` where words begin.
+
+        Keywords whose name begins with the pattern rank first, then ones
+        with a word in the name beginning with it, containing it in the
+        name, containing it in the documentation and finally ones having
+        its characters in the name in the same order.
+        """
+        pattern = self.normalized_pattern
+        position = name.find(pattern)
+        if position == 0:
+            return 0
+        if position > 0:
+            if any(name.startswith(pattern, start) for start in word_starts):
+                return 1
+            return 2
+        if self._search_docs and pattern in doc:
+            return 3
+        if len(pattern) >= _FUZZY_PATTERN_MIN_LENGTH and \
+                _is_subsequence(pattern, name):
+            return 4
+        return None
 
     def _matches_source_filter(self, kw):
         if self._source_filter == ALL_KEYWORDS:
@@ -117,8 +149,65 @@ class _SearchCriteria(object):
             return True
         return self._source_filter == kw.source
 
-    def _contains(self, string, pattern):
-        return utils.normalize(pattern) in utils.normalize(string)
+
+class _KeywordIndex(object):
+    """Keywords with normalized names and documentation and source buckets.
+
+    Built once after keywords have changed, so that searching does not
+    normalize keyword names and documentation again for every query.
+    """
+
+    def __init__(self, keywords):
+        self._keywords = list(keywords)
+        self._names = [_normalized_name(kw) for kw in self._keywords]
+        self._docs = [_normalized_doc(kw) for kw in self._keywords]
+        self._buckets = {ALL_KEYWORDS: range(len(self._keywords)),
+                         ALL_USER_KEYWORDS: [], ALL_LIBRARY_KEYWORDS: []}
+        self._sources = {}
+        for index, kw in enumerate(self._keywords):
+            if kw.is_user_keyword():
+                self._buckets[ALL_USER_KEYWORDS].append(index)
+            if kw.is_library_keyword():
+                self._buckets[ALL_LIBRARY_KEYWORDS].append(index)
+            self._sources.setdefault(kw.source, []).append(index)
+
+    def search(self, criteria):
+        """Keywords matching ``criteria`` ordered by their rank."""
+        indexes = self._indexes_for(criteria.source_filter)
+        if not criteria.normalized_pattern:
+            return [self._keywords[index] for index in indexes]
+        ranked = []
+        for index in indexes:
+            name, word_starts = self._names[index]
+            rank = criteria.rank(name, word_starts, self._docs[index])
+            if rank is not None:
+                ranked.append((rank, index))
+        ranked.sort()
+        return [self._keywords[index] for _, index in ranked]
+
+    def _indexes_for(self, source_filter):
+        if source_filter in self._buckets:
+            return self._buckets[source_filter]
+        return self._sources.get(source_filter, [])
+
+
+def _normalized_name(kw):
+    words = kw.name.split()
+    word_starts = []
+    start = 0
+    for word in words:
+        word_starts.append(start)
+        start += len(utils.normalize(word))
+    return utils.normalize(kw.name), word_starts
+
+
+def _normalized_doc(kw):
+    return utils.normalize(getattr(kw, 'doc', None) or '')
+
+
+def _is_subsequence(pattern, string):
+    characters = iter(string)
+    return all(character in characters for character in pattern)
 
 
 class KeywordSearchDialog(RIDEDialog):
@@ -342,15 +431,21 @@ class _KeywordData(list):
 
     def _sort_by_search(self, keywords, sort_order, search_criteria):
         search_criteria = search_criteria.lower()
-        starts_with = [kw for kw in keywords if kw.name.lower().startswith(search_criteria)]
-        name_contains = [kw for kw in keywords if (search_criteria in kw.name.lower()
-                                                   and kw not in starts_with)]
-        doc_contains = [kw for kw in keywords if (search_criteria in kw.details.lower()
-                                                  and kw not in starts_with
-                                                  and kw not in name_contains)]
+        starts_with, name_contains, doc_contains, others = [], [], [], []
+        for kw in keywords:
+            name = kw.name.lower()
+            if name.startswith(search_criteria):
+                starts_with.append(kw)
+            elif search_criteria in name:
+                name_contains.append(kw)
+            elif search_criteria in kw.details.lower():
+                doc_contains.append(kw)
+            else:
+                others.append(kw)
         result = []
         for to_sort in (starts_with, name_contains, doc_contains):
             result.extend(self._sort_by_attr(to_sort, sort_order))
+        result.extend(others)
         return result
 
     def _sort_by_attr(self, keywords, sort_order):
@@ -25,13 +25,14 @@ from .filedialogs import (NewProjectDialog, InitFileFormatDialog)
 from .fileexplorerplugin import FileExplorer
 from .notebook import NoteBook
 from .pluginmanager import PluginManager
-from .progress import LoadProgressObserver
+from .progress import LoadProgressObserver, SaveProgressObserver
 from .review import ReviewDialog
 from .treeplugin import Tree
 from ..action import ActionInfoCollection, ActionFactory, SeparatorInfo
 from ..action.shortcut import localize_shortcuts
 from ..context import ABOUT_RIDE, SHORTCUT_KEYS, IS_MAC
 from ..controller.ctrlcommands import SaveFile, SaveAll
+from ..controller.undohistory import UNDO_HISTORY
 from ..editor import customsourceeditor
 from ..preferences import PreferenceEditor
 from ..preferences.settings import RideSettings, _Section
@@ -57,6 +58,8 @@ _menudata = """
 
 [Tools]
 !Search Unused Keywords | | | | POSITION-54
+!Refresh Libraries | Re-import keywords of all used libraries | | | POSITION-55
+!Undo History Size | Show the size of undo history | | | POSITION-56
 !Manage Plugins | | | | POSITION-81
 !View All Tags | | F7 | | POSITION-82
 !Preferences | | | | POSITION-99
@@ -556,7 +559,7 @@ class RideFrame(wx.Frame):
 
     def save_all(self):
         self._show_dialog_for_files_without_format()
-        self._controller.execute(SaveAll(self.reformat))
+        self._controller.execute(SaveAll(self.reformat, SaveProgressObserver(self)))
 
     def save(self, controller=None):
         if controller is None:
@@ -592,6 +595,13 @@ class RideFrame(wx.Frame):
             self._review_dialog = ReviewDialog(self._controller, self)
         self._review_dialog.show_dialog()
 
+    def OnRefreshLibraries(self, event):
+        self._controller.namespace.refresh_libraries()
+
+    def OnUndoHistorySize(self, event):
+        entries, size = UNDO_HISTORY.size()
+        self.SetStatusText('Undo history: %d entries, about %d kB' % (entries, size // 1000))
+
     def OnPreferences(self, event):
         dlg = PreferenceEditor(self, "RIDE - Preferences",
                                self._application.preferences, style='tree')
@@ -682,6 +692,8 @@ class RideFrame(wx.Frame):
                             style=wx.YES_NO | wx.ICON_WARNING)
         confirmed = ret == wx.YES
         if confirmed:
+            if self._controller.reload_changed_files(RideFSWatcherHandler.get_changed_paths()):
+                return
             # workspace_path should update after open directory/suite
             # There're two scenarios:
             # 1. path is a directory
@@ -23,6 +23,7 @@ from .. import context
 class ProgressObserver(object):
 
     def __init__(self, frame, title, message):
+        self._message = message
         self._progressbar = wx.ProgressDialog(title, message,
                                               maximum=100, parent=frame,
                                               style=wx.PD_ELAPSED_TIME)
@@ -30,6 +31,10 @@ class ProgressObserver(object):
     def notify(self):
         self._progressbar.Pulse()
 
+    def update_progress(self, done, total):
+        self._progressbar.Update(min(100, done * 100 // max(total, 1)),
+                                 '%s (%d/%d files)' % (self._message, done, total))
+
     def finish(self):
         self._progressbar.Destroy()
         context.LOG.report_parsing_errors()
@@ -55,3 +60,23 @@ class RenameProgressObserver(ProgressObserver):
         if time.time() - self._notification_occured > 0.1:
             self._progressbar.Pulse()
             self._notification_occured = time.time()
+
+
+class SaveProgressObserver(ProgressObserver):
+    """Progress dialog is shown only when saving more than one file."""
+
+    def __init__(self, frame):
+        self._frame = frame
+        self._message = 'Saving'
+        self._progressbar = None
+
+    def update_progress(self, done, total):
+        if self._progressbar is None and total > 1:
+            ProgressObserver.__init__(self, self._frame, 'RIDE', self._message)
+        if self._progressbar:
+            ProgressObserver.update_progress(self, done, total)
+
+    def finish(self):
+        if self._progressbar:
+            self._progressbar.Destroy()
+            self._progressbar = None
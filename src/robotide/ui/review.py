@@ -15,7 +15,6 @@
 
 import os
 import re
-import time
 from threading import Thread
 
 import wx
@@ -25,7 +24,7 @@ from wx import Colour
 from ..context import IS_MAC
 from ..spec.iteminfo import LibraryKeywordInfo
 from ..ui.searchdots import DottedSearch
-from ..usages.commands import FindUsages
+from ..usages.commands import FindUnusedKeywords
 from ..widgets import ButtonWithHandler, Label, RIDEDialog
 
 
@@ -387,29 +386,15 @@ class ReviewRunner(object):
     def _run(self):
         self._stop_requested = False
         self._model.status = 'listing datafiles'
-        for df in self._get_datafile_list():
-            libname = os.path.basename(df.source).rsplit('.', 1)[0]
-            self._model.status = 'searching from ' + str(libname)
-            for keyword in df.keywords:
-                time.sleep(0) # GIVE SPACE TO OTHER THREADS -- Thread.yield in Java
-                self._model.status = "%s.%s" % (libname, keyword.name)
-                if not self._model.searching:
-                    break
-                # Check if it is unused
-                if not isinstance(keyword, LibraryKeywordInfo) and keyword.name:
-                    if self._is_unused(keyword):
-                        self._model.add_unused_keyword(keyword)
+        datafiles = self._get_datafile_list()
+        self._model.status = 'analysing keyword usages'
+        for keyword in self._controller.execute(FindUnusedKeywords(datafiles)):
             if not self._model.searching:
                 break
+            if not isinstance(keyword, LibraryKeywordInfo):
+                self._model.add_unused_keyword(keyword)
         self._model.end_search()
 
-    def _is_unused(self, keyword):
-        try:
-            next(self._controller.execute(FindUsages(keyword.name, keyword_info=keyword.info)))
-            return False
-        except StopIteration:
-            return True
-
 
 class ResultFilter(object):
 
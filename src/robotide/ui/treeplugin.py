@@ -40,6 +40,7 @@ from ..publish import (PUBLISHER, RideTreeSelection, RideFileNameChanged, RideIt
                        RideVariableMovedUp, RideVariableMovedDown, RideVariableUpdated, RideOpenResource,
                        RideSuiteAdded, RideSelectResource, RideDataFileSet)
 from ..controller.ctrlcommands import MoveTo
+from ..controller.testexecutionresults import ExecutionStatusUpdates
 from ..pluginapi import Plugin
 from ..action import ActionInfo
 from ..widgets import PopupCreator
@@ -49,6 +50,9 @@ from .images import TreeImageList
 
 TREETEXTCOLOUR = Colour(0xA9, 0xA9, 0xA9)
 
+# Milliseconds between applying batches of test execution status changes
+STATUS_UPDATE_INTERVAL = 50
+
 _TREE_ARGS = {'style': wx.HSCROLL | wx.VSCROLL,
               'agwStyle': customtreectrl.TR_DEFAULT_STYLE | customtreectrl.TR_HIDE_ROOT | customtreectrl.TR_EDIT_LABELS}
 _TREE_ARGS['agwStyle'] |= customtreectrl.TR_TOOLTIP_ON_LONG_ITEMS | customtreectrl.TR_HAS_VARIABLE_ROW_HEIGHT
@@ -216,6 +220,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         self._bind_tree_events()
         self._images = TreeImageList()
         self._animctrl = None
+        self._animated_node = None
         self._silent_mode = False
         self.SetImageList(self._images)
         self.label_editor = TreeLabelEditListener(self, action_registerer)
@@ -226,6 +231,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         self._clear_tree_data()
         self._editor = None
         self._execution_results = None
+        self._status_updates = ExecutionStatusUpdates()
         self._resources = []
         self._right_click = False
         # DEBUG: This menu is not working because is being attached to main frame
@@ -375,11 +381,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         if not test:
             # test object will be None when running with DataDriver
             # when runner is interrupted, is also None, so let's stop animation
-            if self._animctrl:
-                self._animctrl.Stop()
-                self._animctrl.Animation.Destroy()
-                self._animctrl.Destroy()
-                self._animctrl = None
+            self._stop_animation()
             return
         if isinstance(message, RideTestPassed):
             test.run_passed = True
@@ -389,39 +391,59 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
             test.run_passed = False
         else:
             test.run_passed = None
-        wx.CallAfter(self._set_icon_from_execution_results, message.item)
+        if self._status_updates.add(message.item):
+            wx.CallAfter(self._schedule_status_updates)
 
-    def _set_icon_from_execution_results(self, controller):
-        node = self._controller.find_node_by_controller(controller)
-        if not node:
+    def _schedule_status_updates(self):
+        wx.CallLater(STATUS_UPDATE_INTERVAL, self._apply_status_updates)
+
+    def _apply_status_updates(self):
+        running = None
+        updated = False
+        for controller in self._status_updates.pop_all():
+            node = self._controller.find_node_by_controller(controller)
+            if not node:
+                continue
+            updated = True
+            img_index = self._get_icon_index_for(controller)
+            # Always set the static icon
+            self.SetItemImage(node, img_index)
+            if img_index in (RUNNING_IMAGE_INDEX, PAUSED_IMAGE_INDEX):
+                running = node, img_index
+        if not updated:
             return
-        img_index = self._get_icon_index_for(controller)
-        # Always set the static icon
-        self.SetItemImage(node, img_index)
+        self._stop_animation()
+        if running:
+            self._animate_running_test(*running)
+
+    def _stop_animation(self):
         if self._animctrl:
             self._animctrl.Stop()
             self._animctrl.Animation.Destroy()
             self._animctrl.Destroy()
             self._animctrl = None
-            self.DeleteItemWindow(node)
-        if img_index in (RUNNING_IMAGE_INDEX, PAUSED_IMAGE_INDEX):
-            from wx.adv import Animation, AnimationCtrl
-            import os
-            _BASE = os.path.join(os.path.dirname(__file__), '..', 'widgets')
-            if img_index == RUNNING_IMAGE_INDEX:
-                img = os.path.join(_BASE, 'robot-running.gif')
-            else:
-                img = os.path.join(_BASE, 'robot-pause.gif')
-            ani = Animation(img)
-            obj = self
-            rect = (node.GetX()+20, node.GetY())  # Overlaps robot icon
-            self._animctrl = AnimationCtrl(obj, -1, ani, rect)
-            """
-            self._animctrl.SetBackgroundColour(obj.GetBackgroundColour())
-            """
-            self._animctrl.SetBackgroundColour('white')
-            self.SetItemWindow(node, self._animctrl, False)
-            self._animctrl.Play()
+        if self._animated_node:
+            self.DeleteItemWindow(self._animated_node)
+            self._animated_node = None
+
+    def _animate_running_test(self, node, img_index):
+        from wx.adv import Animation, AnimationCtrl
+        _BASE = os.path.join(os.path.dirname(__file__), '..', 'widgets')
+        if img_index == RUNNING_IMAGE_INDEX:
+            img = os.path.join(_BASE, 'robot-running.gif')
+        else:
+            img = os.path.join(_BASE, 'robot-pause.gif')
+        ani = Animation(img)
+        obj = self
+        rect = (node.GetX()+20, node.GetY())  # Overlaps robot icon
+        self._animctrl = AnimationCtrl(obj, -1, ani, rect)
+        """
+        self._animctrl.SetBackgroundColour(obj.GetBackgroundColour())
+        """
+        self._animctrl.SetBackgroundColour('white')
+        self.SetItemWindow(node, self._animctrl, False)
+        self._animated_node = node
+        self._animctrl.Play()
         # Make visible the running or paused test
         self.EnsureVisible(node.GetParent())
         self.EnsureVisible(node)
@@ -452,6 +474,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         self._root = self.AddRoot('')
         self._resource_root = self._create_resource_root()
         self._datafile_nodes = []
+        self._datafile_index = {}
         self._resources = []
         self._controller.clear_history()
 
@@ -465,6 +488,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         # print(f"DEBUG: _populate_model model={model} self._resource_root={self._resource_root}"
         #       f" self._controller.settings={self._controller.settings}")
         self.SetPyData(self._resource_root, handler)
+        self._controller.register_node(self._resource_root, model)
         if model.data:
             self._render_datafile(self._root, model.data, 0)
         for res in model.external_resources:
@@ -519,6 +543,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         if controller.dirty:
             self._controller.mark_node_dirty(node)
         self._datafile_nodes.append(node)
+        self._datafile_index[id(controller.data)] = node
         self.SetItemHasChildren(node, True)
 
         for child in controller.children:
@@ -553,6 +578,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
             self.SetItemTextColour(node, TREETEXTCOLOUR)  # wxPython3 hack
         action_handler = handler_class(controller, self, node, self._controller.settings)
         self.SetPyData(node, action_handler)
+        self._controller.register_node(node, controller)
 
         # if we have a TestCase node we have to make sure that
         # we retain the checked state
@@ -673,7 +699,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
 
     def _datafile_removed(self, message):
         dfnode = self._get_datafile_node(message.datafile.data)
-        self._datafile_nodes.remove(dfnode)
+        self._forget_datafile_node(dfnode)
         self.DeleteChildren(dfnode)
         self.Delete(dfnode)
 
@@ -741,11 +767,33 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
             self.SelectItem(node)
 
     def _get_datafile_node(self, datafile):
+        node = self._datafile_index.get(id(datafile))
+        if node is not None and self._controller.get_handler(node).item == datafile:
+            return node
         for node in self._datafile_nodes:
             if self._controller.get_handler(node).item == datafile:
+                self._datafile_index[id(datafile)] = node
                 return node
         return None
 
+    def _forget_datafile_node(self, node):
+        self._datafile_nodes.remove(node)
+        for key, indexed in list(self._datafile_index.items()):
+            if indexed is node:
+                del self._datafile_index[key]
+
+    def Delete(self, item):
+        self._controller.forget_nodes([item] + self.GetItemChildren(item, recursively=True))
+        super().Delete(item)
+
+    def DeleteChildren(self, item):
+        self._controller.forget_nodes(self.GetItemChildren(item, recursively=True))
+        super().DeleteChildren(item)
+
+    def DeleteAllItems(self):
+        self._controller.forget_all_nodes()
+        super().DeleteAllItems()
+
     def get_selected_datafile(self):
         """Returns currently selected data file.
 
@@ -890,7 +938,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         for child in self.GetItemChildren(node):
             if child in self._datafile_nodes:
                 self._remove_datafile_node(child)
-        self._datafile_nodes.remove(node)
+        self._forget_datafile_node(node)
         self.Delete(node)
 
     def _handle_pending_selection(self, to_be_selected, parent_node):
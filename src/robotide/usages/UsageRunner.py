@@ -13,7 +13,6 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-import time
 from threading import Thread
 
 import wx
@@ -23,6 +22,8 @@ from robotide.usages import commands
 from . import usagesdialog
 # import UsagesDialog, UsagesDialogWithUserKwNavigation, ResourceImportUsageDialog
 
+USAGE_BATCH_SIZE = 100
+
 
 class Usages(object):
 
@@ -48,11 +49,16 @@ class Usages(object):
 
     def _run(self):
         wx.CallAfter(self._begin_search)
+        usages = []
         for usage in self._find_usages():
-            time.sleep(0)  # GIVE SPACE TO OTHER THREADS -- Thread.yield in Java
             if self._dialog_closed:
                 return
-            wx.CallAfter(self._add_usage, usage)
+            usages.append(usage)
+            if len(usages) == USAGE_BATCH_SIZE:
+                wx.CallAfter(self._add_usages, usages)
+                usages = []
+        if usages:
+            wx.CallAfter(self._add_usages, usages)
         wx.CallAfter(self._end_search)
 
     def _find_usages(self):
@@ -62,9 +68,10 @@ class Usages(object):
         if not self._dialog_closed:
             self._dlg.begin_searching()
 
-    def _add_usage(self, usage):
+    def _add_usages(self, usages):
         if not self._dialog_closed:
-            self._dlg.add_usage(usage)
+            for usage in usages:
+                self._dlg.add_usage(usage)
 
     def _end_search(self):
         if not self._dialog_closed:
@@ -41,6 +41,46 @@ class FindUsages(FindOccurrences):
             yield prev
 
 
+class FindUnusedKeywords(_Command):
+    """Finds the user keywords of ``datafiles`` that are not used anywhere.
+
+    Instead of searching the usages of every keyword separately, the steps
+    and settings of all the datafiles of the context are walked once and
+    each distinct value is resolved to the keyword it refers to in its
+    datafile, which handles BDD prefixes and embedded arguments. Keywords
+    are yielded in datafile order.
+    """
+    modifying = False
+
+    def __init__(self, datafiles):
+        self._datafiles = datafiles
+
+    def execute(self, context):
+        used = set()
+        for df in context.datafiles:
+            used.update(self._used_keywords_in(df))
+        for df in self._datafiles:
+            for keyword in df.keywords:
+                if keyword.name and self._key(keyword.info) not in used:
+                    yield keyword
+
+    def _used_keywords_in(self, df):
+        from ..controller.usageindex import UsageIndex
+
+        if hasattr(df, 'keyword_references'):
+            references = df.keyword_references()
+        else:
+            references = UsageIndex(df).keyword_references()
+        for value in references:
+            info = df.keyword_info(value)
+            if info is not None and info.is_user_keyword():
+                yield self._key(info)
+
+    @staticmethod
+    def _key(info):
+        return info.source, info.name
+
+
 class FindVariableUsages(FindVariableOccurrences):
     
     def execute(self, context):
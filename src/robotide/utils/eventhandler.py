@@ -23,6 +23,7 @@ class _RideFSWatcherHandler:
     def __init__(self):
         self._fs_watcher = None
         self._is_workspace_dirty = False
+        self._changed_paths = set()
         self._initial_watched_path = None
         self._watched_path = set()
 
@@ -73,6 +74,7 @@ class _RideFSWatcherHandler:
     def stop_listening(self):
         # print(f"DEBUG: FileSystemWatcher stop_listening")
         self._is_workspace_dirty = False
+        self._changed_paths = set()
         self._fs_watcher.RemoveAll()
         self._watched_path = set()
 
@@ -83,6 +85,10 @@ class _RideFSWatcherHandler:
         else:
             return False
 
+    def get_changed_paths(self):
+        """Paths created, modified, removed or renamed since last cleared."""
+        return set(self._changed_paths)
+
     def is_watcher_created(self):
         return self._fs_watcher is not None
 
@@ -92,6 +98,9 @@ class _RideFSWatcherHandler:
     def _on_fs_event(self, event):
         if self._is_mark_dirty_needed(event):
             self._is_workspace_dirty = True
+            self._changed_paths.add(event.GetPath())
+            if event.GetChangeType() == wx.FSW_EVENT_RENAME:
+                self._changed_paths.add(event.GetNewPath())
 
     def _is_mark_dirty_needed(self, event):
         new_path = event.GetNewPath()
@@ -39,7 +39,7 @@ class CommandCreationTests(unittest.TestCase):
 
         result = command.build()
         self.assertEqual(result,
-                         'prefix -A "C:\\User name\\Temp\\Ride\\arg_file.robot" --listener "C:\\My Work\\Python\\TestRunnerAgent.py:5522:False" "C:\\My Work\\TestSuite.robot"')
+                         'prefix -A "C:\\User name\\Temp\\Ride\\arg_file.robot" --listener "C:\\My Work\\Python\\TestRunnerAgent.py:5522:False:2" "C:\\My Work\\TestSuite.robot"')
 
     def test_build_command_call_some_method_twice(self):
         command = CommandStub() \
@@ -0,0 +1,140 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import threading
+import unittest
+
+from robotide.contrib.testrunner.consoleoutput import (color_spans, longest_line, parse_colors,
+                                                       split_unfinished)
+from robotide.contrib.testrunner.Process import StreamReaderThread
+
+OUTPUT = (b'Passing    | \x1b[32mPASS\x1b[0m |\n'
+          b'Failing    | \x1b[31mFAIL\x1b[0m |\n'
+          b'Skipped    | \x1b[33mSKIP\x1b[0m | \x1b[1munknown\n')
+
+
+class TestParseColors(unittest.TestCase):
+
+    def test_codes_are_removed(self):
+        text, _ = parse_colors(OUTPUT)
+        assert text == (b'Passing    | PASS |\n'
+                        b'Failing    | FAIL |\n'
+                        b'Skipped    | SKIP | \x1b[1munknown\n')
+
+    def test_color_positions_are_in_parsed_text(self):
+        text, colors = parse_colors(OUTPUT)
+        assert [(text[position:position + 4], color) for position, color in colors] == \
+            [(b'PASS', 'GREEN'), (b' |\nF', None), (b'FAIL', 'RED'), (b' |\nS', None),
+             (b'SKIP', 'YELLOW'), (b' | \x1b', None)]
+
+    def test_text_without_colors_is_returned_as_is(self):
+        text = b'No colors here\n'
+        assert parse_colors(text) == (text, [])
+
+    def test_color_spans(self):
+        text, colors = parse_colors(OUTPUT)
+        assert [(text[start:end], color) for start, end, color in color_spans(colors, len(text))] == \
+            [(b'PASS', 'GREEN'), (b'FAIL', 'RED'), (b'SKIP', 'YELLOW')]
+
+    def test_color_lasts_until_end_without_reset(self):
+        text, colors = parse_colors(b'start \x1b[31mred\n\x1b[34m\x1b[32mgreen')
+        assert color_spans(colors, len(text)) == [(6, 10, 'RED'), (10, 15, 'GREEN')]
+
+
+class TestLongestLine(unittest.TestCase):
+
+    def test_longest_line(self):
+        assert longest_line(b'a\nlongest\nmid\n') == b'longest'
+        assert longest_line('a\nlongest\nmid\n') == 'longest'
+
+    def test_none_when_not_longer(self):
+        assert longest_line(b'a\nlongest\nmid\n', 7) is None
+        assert longest_line(b'short', 10) is None
+
+
+class TestSplitUnfinished(unittest.TestCase):
+
+    def test_complete_data_is_not_split(self):
+        for data in (b'', b'text', b'\x1b[32mPASS\x1b[0m', 'caf\xe9 \u20ac \U0001f916'.encode('UTF-8')):
+            assert split_unfinished(data) == (data, b'')
+
+    def test_unfinished_escape_is_split(self):
+        for escape in (b'\x1b', b'\x1b[', b'\x1b[3', b'\x1b[1;3'):
+            assert split_unfinished(b'PASS ' + escape) == (b'PASS ', escape)
+
+    def test_unfinished_utf8_character_is_split(self):
+        for character in ('\xe9', '\u20ac', '\U0001f916'):
+            encoded = character.encode('UTF-8')
+            for end in range(1, len(encoded)):
+                assert split_unfinished(b'caf' + encoded[:end]) == (b'caf', encoded[:end])
+
+
+class _ChunkStream(object):
+
+    def __init__(self, *chunks):
+        self._chunks = list(chunks)
+        self.read_all = threading.Event()
+        self.closed = threading.Event()
+
+    def read1(self, size):
+        if self._chunks:
+            return self._chunks.pop(0)
+        self.read_all.set()
+        self.closed.wait(5)
+        return b''
+
+    read = read1
+
+
+class TestStreamReaderThread(unittest.TestCase):
+
+    def _start(self, stream, partial_line_timeout):
+        reader = StreamReaderThread(stream)
+        reader.PARTIAL_LINE_TIMEOUT = partial_line_timeout
+        reader.run()
+        stream.read_all.wait(5)
+        return reader
+
+    def _close(self, reader, stream):
+        stream.closed.set()
+        reader._thread.join()
+
+    def test_only_full_lines_are_returned_while_reading(self):
+        stream = _ChunkStream(b'Passing | \x1b[3', b'2mPASS\x1b[0m |\nFail', b'ing | \xc3', b'\xa9')
+        reader = self._start(stream, 60)
+        assert reader.pop() == b'Passing | \x1b[32mPASS\x1b[0m |\n'
+        self._close(reader, stream)
+        assert reader.pop() == b'Failing | \xc3\xa9'
+
+    def test_partial_line_is_returned_without_unfinished_sequence(self):
+        stream = _ChunkStream(b'caf\xc3', b'\xa9 \x1b[3')
+        reader = self._start(stream, 0)
+        assert reader.pop() == b'caf\xc3\xa9 '
+        assert reader.pop() == b''
+        self._close(reader, stream)
+        assert reader.pop() == b'\x1b[3'
+
+    def test_pop_returns_all_output_read(self):
+        reader = StreamReaderThread(io.BytesIO(OUTPUT * 100))
+        reader.CHUNK_SIZE = 100
+        reader.run()
+        reader._thread.join()
+        assert reader.pop() == OUTPUT * 100
+        assert reader.pop() == b''
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import unittest
+from io import BytesIO
+
+from robotide.contrib.testrunner.TestRunnerAgent import (
+    PROTOCOL_VERSION, StreamHandler, TestRunnerAgent as Agent, dumps, loads)
+from robotide.contrib.testrunner.testrunner import (
+    RideListenerServer, RideListenerHandler)
+
+PACKETS = [('start_keyword', ['BuiltIn.Log', {'kwname': 'Log', 'status': 'NOT RUN'}]),
+           ('log_message', [{'message': 'Hyvää päivää', 'level': 'INFO'}]),
+           ('end_keyword', ['BuiltIn.Log', {'kwname': 'Log', 'status': 'PASS'}])]
+
+
+class _CountingReader(object):
+
+    def __init__(self, data):
+        self._data = BytesIO(data)
+        self.reads = 0
+
+    def read1(self, size):
+        self.reads += 1
+        return self._data.read1(size)
+
+
+def _load_all(handler, count):
+    return [tuple(handler.load()) for _ in range(count)]
+
+
+class TestStreamHandler(unittest.TestCase):
+
+    def test_version_1_message_format(self):
+        data = dumps(['pid', [42]])
+        self.assertEqual(data, b'J12|["pid",[42]]')
+        self.assertEqual(loads(data), ['pid', [42]])
+
+    def test_version_2_message_format(self):
+        fp = BytesIO()
+        StreamHandler(fp, protocol=2).dump(['pid', [42]])
+        self.assertEqual(fp.getvalue(), b'J\x00\x00\x00\x0c["pid",[42]]')
+
+    def test_batches_are_loaded_one_packet_at_a_time(self):
+        fp = BytesIO()
+        writer = StreamHandler(fp, protocol=2)
+        writer.dump_batch(PACKETS)
+        writer.dump(('close', []))
+        self.assertEqual(fp.getvalue()[:1], b'B')
+        reader = StreamHandler(BytesIO(fp.getvalue()), protocol=2)
+        self.assertEqual(_load_all(reader, 4), [(name, list(args)) for name, args in PACKETS] +
+                         [('close', [])])
+        self.assertRaises(EOFError, reader.load)
+
+    def test_batches_are_separate_messages_in_version_1(self):
+        fp = BytesIO()
+        StreamHandler(fp).dump_batch(PACKETS)
+        reader = StreamHandler(BytesIO(fp.getvalue()))
+        self.assertEqual(_load_all(reader, 3), [(name, list(args)) for name, args in PACKETS])
+
+    def test_switching_protocol_keeps_buffered_data(self):
+        fp = BytesIO()
+        writer = StreamHandler(fp)
+        writer.dump(('protocol', [2]))
+        writer.protocol = 2
+        writer.dump_batch(PACKETS)
+        reader = StreamHandler(BytesIO(fp.getvalue()))
+        self.assertEqual(tuple(reader.load()), ('protocol', [2]))
+        reader.protocol = 2
+        self.assertEqual(len(_load_all(reader, 3)), 3)
+
+    def test_messages_are_read_in_bulk(self):
+        fp = BytesIO()
+        writer = StreamHandler(fp)
+        for _ in range(100):
+            writer.dump_batch(PACKETS)
+        reader_fp = _CountingReader(fp.getvalue())
+        reader = StreamHandler(reader_fp)
+        self.assertEqual(len(_load_all(reader, 300)), 300)
+        self.assertTrue(reader_fp.reads < 5)
+
+    def test_pickle_fallback(self):
+        for protocol in 1, 2:
+            fp = BytesIO()
+            StreamHandler(fp, protocol).dump({'value': {1, 2}})
+            reader = StreamHandler(BytesIO(fp.getvalue()), protocol)
+            self.assertEqual(reader.load(), {'value': {1, 2}})
+
+
+class TestAgentProtocolNegotiation(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.closed = threading.Event()
+        self.server = RideListenerServer(RideListenerHandler, self._event)
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _event(self, name, *args):
+        self.events.append(name)
+        if name == 'close':
+            self.closed.set()
+
+    def _run_agent(self, *args):
+        agent = Agent(self.server.server_address[1], *args)
+        try:
+            for _ in range(3):
+                agent.start_keyword('Log', {'args': [], 'doc': '', 'assign': []})
+                agent.end_keyword('Log', {'args': [], 'doc': '', 'assign': [],
+                                          'status': 'PASS'})
+            agent.close()
+        finally:
+            agent._killer.shutdown()
+            agent._killer.server_close()
+        self.assertTrue(self.closed.wait(10))
+        return agent
+
+    def test_agent_uses_version_requested_by_ride(self):
+        agent = self._run_agent('False', str(PROTOCOL_VERSION))
+        self.assertEqual(agent.protocol, 2)
+        self.assertEqual(self.events, ['pid', 'port'] +
+                         ['start_keyword', 'end_keyword'] * 3 + ['close'])
+
+    def test_agent_uses_version_1_without_request(self):
+        agent = self._run_agent('False')
+        self.assertEqual(agent.protocol, 1)
+        self.assertEqual(self.events, ['pid', 'port'] +
+                         ['start_keyword', 'end_keyword'] * 3 + ['close'])
+
+
+if __name__ == '__main__':
+    unittest.main()
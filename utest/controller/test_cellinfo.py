@@ -338,6 +338,39 @@ class TestCellInfo(unittest.TestCase):
         self._verify_cell_info(0, 0, ContentType.STRING, CellType.UNKNOWN)
         self._verify_cell_info(0, 1, ContentType.EMPTY, CellType.UNKNOWN)
 
+    def test_row_cell_infos_are_same_as_cell_infos(self):
+        self.test.execute(ChangeCellValue(0, 0, self.keyword1.name))
+        self.test.execute(ChangeCellValue(0, 1, 'foo'))
+        self.test.execute(ChangeCellValue(0, 3, 'bar'))
+        columns = list(range(6))
+        row_infos = self.test.get_cell_infos(0, columns)
+        self.test.execute(ChangeCellValue(0, 1, 'foo'))
+        for col, info in zip(columns, row_infos):
+            cell_info = self.test.get_cell_info(0, col)
+            assert (info.cell_type, info.content_type) == \
+                (cell_info.cell_type, cell_info.content_type)
+
+    def test_keyword_infos_are_resolved_once_per_row(self):
+        self.test.execute(ChangeCellValue(0, 0, self.keyword4.name))
+        self.test.execute(ChangeCellValue(0, 2, 'foo'))
+        resolved = []
+        get_keyword_info = self.test.get_keyword_info
+        self.test.get_keyword_info = lambda name: resolved.append(name) or get_keyword_info(name)
+        try:
+            self.test.get_cell_infos(0, list(range(12)))
+            self.test.get_cell_infos(0, list(range(12)))
+        finally:
+            del self.test.get_keyword_info
+        assert sorted(resolved) == sorted([self.keyword4.name, 'foo'])
+
+    def test_row_analysis_is_dropped_when_value_changes(self):
+        self.test.execute(ChangeCellValue(0, 0, self.keyword1.name))
+        step = self.test.step(0)
+        step.get_cell_infos([0, 1])
+        assert step._cell_info_row is not None
+        step.notify_value_changed()
+        assert step._cell_info_row is None
+
     def _verify_string_change(self, row, col, celltype):
         self._verify_cell_info(row, col, ContentType.EMPTY, celltype)
         self.test.execute(ChangeCellValue(row, col, 'diipadaapa'))
@@ -16,8 +16,14 @@
 import sys
 import pathlib
 import unittest
+from io import BytesIO, StringIO
+
+from robotide import robotapi
 from robotide.controller.tags import DefaultTag
 from robotide.controller.ctrlcommands import *
+from robotide.publish import PUBLISHER
+from robotide.publish.messages import RideDataFileSet, RideItemStepsChanged
+from utest.resources import datafilereader
 
 # Workaround for relative import in non-module
 # see https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
@@ -158,20 +164,31 @@ class TestCaseEditingTest(TestCaseCommandTest):
 
     def test_undo_undo_redo_redo(self):
         original_cell_value = self._data_step_as_list(STEP1)[1]
+        original_cell_value_2 = self._data_step_as_list(STEP2)[1]
         changed_cell_value_1 = 'Changed Step'
         changed_cell_value_2 = 'Again changed Step'
         self._exec(ChangeCellValue(0, 0, changed_cell_value_1))
         assert self._steps[0].keyword == changed_cell_value_1
-        self._exec(ChangeCellValue(0, 0, changed_cell_value_2))
-        assert self._steps[0].keyword == changed_cell_value_2
+        self._exec(ChangeCellValue(1, 0, changed_cell_value_2))
+        assert self._steps[1].keyword == changed_cell_value_2
         self._exec(Undo())
-        assert self._steps[0].keyword == changed_cell_value_1
+        assert self._steps[1].keyword == original_cell_value_2
         self._exec(Undo())
         assert self._steps[0].keyword == original_cell_value
         self._exec(Redo())
         assert self._steps[0].keyword == changed_cell_value_1
         self._exec(Redo())
-        assert self._steps[0].keyword == changed_cell_value_2
+        assert self._steps[1].keyword == changed_cell_value_2
+
+    def test_consecutive_changes_to_same_cell_are_undone_together(self):
+        original_cell_value = self._data_step_as_list(STEP1)[1]
+        self._exec(ChangeCellValue(0, 0, 'Changed Step'))
+        self._exec(ChangeCellValue(0, 0, 'Again changed Step'))
+        self._exec(Undo())
+        assert self._steps[0].keyword == original_cell_value
+        assert self._ctrl.is_undo_empty()
+        self._exec(Redo())
+        assert self._steps[0].keyword == 'Again changed Step'
 
     def test_redo_does_nothing_after_state_changing_command_that_is_not_undo(self):
         changed_cell_value_1 = 'Changed Step'
@@ -1083,5 +1100,84 @@ class RowMovingTest(TestCaseCommandTest):
         assert self._ctrl.dirty
 
 
+class UpdateDataFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project = datafilereader.construct_project(
+            datafilereader.SIMPLE_TEST_SUITE_PATH)
+        self.ctrl = datafilereader.get_ctrl_by_name('TestSuite1', self.project.datafiles)
+        self.ctrl.unmark_dirty()
+        self.messages = []
+        PUBLISHER.subscribe(self._record, RideDataFileSet)
+        PUBLISHER.subscribe(self._record, RideItemStepsChanged)
+
+    def tearDown(self):
+        PUBLISHER.unsubscribe_all()
+        self.project.close()
+
+    def _record(self, message):
+        self.messages.append(message)
+
+    def _update(self, old, new):
+        output = StringIO()
+        self.ctrl.data.save(output=output, format='txt', txt_separating_spaces=4)
+        text = output.getvalue()
+        self.assertIn(old, text)
+        target = type(self.ctrl.data)(source=self.ctrl.data.source)
+        robotapi.RobotReader(spaces=4).read(BytesIO(text.replace(old, new).encode('UTF-8')),
+                                            robotapi.populators.FromFilePopulator(target))
+        self.ctrl.execute(UpdateDataFile(target))
+        return target
+
+    def test_changed_steps_replace_only_changed_item(self):
+        data = self.ctrl.data
+        test, keywords = self.ctrl.tests[0], list(self.ctrl.keywords)
+        old_keyword_data = [kw.data for kw in keywords]
+        self._update('Log    From builtin', 'Log    Changed')
+        self.assertIs(self.ctrl.data, data)
+        self.assertIs(self.ctrl.tests[0], test)
+        self.assertEqual(test.steps[-1].as_list(), ['Log', 'Changed'])
+        self.assertEqual(list(self.ctrl.keywords), keywords)
+        self.assertEqual([kw.data for kw in self.ctrl.keywords], old_keyword_data)
+        self.assertEqual([type(m) for m in self.messages], [RideItemStepsChanged])
+        self.assertIs(self.messages[0].item, test)
+        self.assertTrue(self.ctrl.dirty)
+
+    def test_changed_keyword_refreshes_its_controller(self):
+        keyword = self.ctrl.keywords[0]
+        self._update('My Keyword\n    No Operation', 'My Keyword\n    Log    new')
+        self.assertIs(self.ctrl.keywords[0], keyword)
+        self.assertIs(keyword.data, self.ctrl.data.keyword_table.keywords[0])
+        self.assertIs(keyword.data.parent, self.ctrl.data.keyword_table)
+        self.assertEqual([step.as_list() for step in keyword.steps], [['Log', 'new']])
+
+    def test_replaced_item_forgets_undo_and_redo(self):
+        test = self.ctrl.tests[0]
+        test.execute(ChangeCellValue(1, 0, 'Grid KW'))
+        test.execute(ChangeCellValue(0, 0, 'Other KW'))
+        test.execute(Undo())
+        self._update('My Test\n    My Keyword\n', 'My Test\n')
+        self.assertIs(self.ctrl.tests[0], test)
+        self.assertTrue(test.is_undo_empty())
+        self.assertTrue(test.is_redo_empty())
+        test.execute(Undo())
+        self.assertEqual([step.as_list() for step in test.steps],
+                         [['Grid KW'], ['Log', 'From builtin']])
+
+    def test_unchanged_data_is_not_modified(self):
+        self._update('', '')
+        self.assertEqual(self.messages, [])
+        self.assertFalse(self.ctrl.dirty)
+
+    def test_renamed_item_replaces_whole_datafile(self):
+        target = self._update('None Keyword\n    No', 'Renamed Keyword\n    No')
+        self.assertIs(self.ctrl.data, target)
+        self.assertEqual([type(m) for m in self.messages], [RideDataFileSet])
+
+    def test_changed_variables_replace_whole_datafile(self):
+        target = self._update('robotista', 'changed')
+        self.assertIs(self.ctrl.data, target)
+
+
 if __name__ == "__main__":
     unittest.main()
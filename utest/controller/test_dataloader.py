@@ -0,0 +1,108 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from robotide.controller import dataloader
+from robotide.controller.dataloader import DataLoader
+from robotide.namespace import Namespace
+from robotide.preferences.excludes_class import Excludes
+from utest.resources import FakeSettings
+from utest.resources.mocks import MessageRecordingLoadObserver
+
+SUITE = """\
+*** Settings ***
+Documentation    Suite %(index)d
+
+*** Test Cases ***
+Test %(index)d
+    Log    ${CURDIR}
+    My Keyword    %(index)d
+
+*** Keywords ***
+My Keyword
+    [Arguments]    ${arg}
+    Log    ${arg}
+"""
+
+
+class _ProgressRecordingLoadObserver(MessageRecordingLoadObserver):
+
+    def __init__(self):
+        MessageRecordingLoadObserver.__init__(self)
+        self.progress = []
+
+    def update_progress(self, done, total):
+        self.progress.append((done, total))
+
+
+class TestParallelLoading(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._threshold = dataloader.PARALLEL_LOADING_THRESHOLD
+        self._processes = dataloader.LOADING_PROCESSES
+        dataloader.PARALLEL_LOADING_THRESHOLD = 5
+        dataloader.LOADING_PROCESSES = 2
+        for name in ('first', 'second', 'excluded'):
+            os.mkdir(os.path.join(self._dir, name))
+            for index in range(4):
+                with open(os.path.join(self._dir, name, 'suite%d.robot' % index), 'w') as suite:
+                    suite.write(SUITE % {'index': index})
+        with open(os.path.join(self._dir, 'first', 'no_tests.robot'), 'w') as resource:
+            resource.write('*** Keywords ***\nKeyword\n    No Operation\n')
+        with open(os.path.join(self._dir, '__init__.robot'), 'w') as init_file:
+            init_file.write('*** Settings ***\nDocumentation    Root\n')
+        self._settings_dir = tempfile.mkdtemp()
+        self._settings = FakeSettings()
+        self._settings.excludes = Excludes(self._settings_dir)
+        self._settings.excludes.update_excludes([os.path.join(self._dir, 'excluded')])
+
+    def tearDown(self):
+        dataloader.PARALLEL_LOADING_THRESHOLD = self._threshold
+        dataloader.LOADING_PROCESSES = self._processes
+        shutil.rmtree(self._dir)
+        shutil.rmtree(self._settings_dir)
+
+    def test_parallel_loading_builds_same_model_as_serial_loading(self):
+        observer = _ProgressRecordingLoadObserver()
+        parallel = self._load(observer)
+        dataloader.PARALLEL_LOADING_THRESHOLD = 1000
+        serial = self._load(MessageRecordingLoadObserver())
+        self.assertEqual(self._describe(parallel), self._describe(serial))
+        self.assertEqual(parallel.setting_table.doc.value, 'Root')
+        self.assertEqual(observer.progress[-1], (10, 10))
+
+    def test_excluded_directory_is_not_read(self):
+        suites = [os.path.basename(path) for path in
+                  dataloader._suite_files(self._dir, self._settings.excludes)]
+        self.assertEqual(suites, ['__init__.robot', 'no_tests.robot'] +
+                         ['suite%d.robot' % i for i in range(4)] * 2)
+
+    def _load(self, observer):
+        return DataLoader(Namespace(self._settings), self._settings).load_datafile(self._dir, observer)
+
+    def _describe(self, datafile):
+        tests = [(test.name, [(step.name, step.args) for step in test.steps])
+                 for test in datafile.testcase_table.tests]
+        return (os.path.basename(datafile.source), tests,
+                [self._describe(child) for child in datafile.children])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from utest.resources import datafilereader
+
+
+class TestImportGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.project = datafilereader.construct_project(datafilereader.SIMPLE_TEST_SUITE_PATH)
+        self.graph = self.project.import_graph
+        self.suite1 = datafilereader.get_ctrl_by_name('TestSuite1', self.project.datafiles)
+        self.suite2 = datafilereader.get_ctrl_by_name('TestSuite2', self.project.datafiles)
+        self.suite3 = datafilereader.get_ctrl_by_name('TestSuite3', self.project.datafiles)
+        self.resource = datafilereader.get_ctrl_by_name(
+            datafilereader.SIMPLE_TEST_SUITE_RESOURCE_NAME, self.project.datafiles)
+        self.inner = datafilereader.get_ctrl_by_name('Inner Resource', self.project.datafiles)
+
+    def tearDown(self):
+        self.project.close()
+
+    def test_graph_is_built_when_project_is_loaded(self):
+        assert self.graph.is_built()
+
+    def test_importers(self):
+        importing = {imp.datafile_controller for imp in self.graph.importers(self.resource)}
+        assert importing == {self.suite1, self.suite2}
+        assert self.graph.is_imported(self.resource)
+        assert self.resource.is_used()
+
+    def test_imported_resources(self):
+        assert self.graph.imported_resources(self.suite2) == [self.resource]
+        assert self.graph.imported_resources(self.resource) == [self.inner]
+
+    def test_all_imported(self):
+        assert self.graph.all_imported(self.suite2) == [self.suite2, self.resource, self.inner]
+        assert self.suite2.imported_datafiles() == [self.suite2, self.resource, self.inner]
+
+    def test_all_importing(self):
+        importing = self.inner.importing_datafiles()
+        assert importing[:2] == [self.inner, self.resource]
+        assert set(importing[2:]) == {self.suite1, self.suite2}
+        assert self.suite3 not in importing
+
+    def test_removing_import_updates_graph(self):
+        imports = self.suite2.imports
+        index = [imp.name for imp in imports].index('testdata_resource.robot')
+        imports.delete(index)
+        importing = {imp.datafile_controller for imp in self.graph.importers(self.resource)}
+        assert importing == {self.suite1}
+
+    def test_adding_import_updates_graph(self):
+        self.suite3.imports.add_resource('testdata_resource.robot')
+        assert self.resource in self.graph.imported_resources(self.suite3)
+        assert self.suite3 in self.resource.importing_datafiles()
+
+    def test_removed_resource_is_not_imported(self):
+        self.project.remove_resource(self.inner)
+        assert self.graph.importers(self.inner) == []
+
+
+if __name__ == '__main__':
+    unittest.main()
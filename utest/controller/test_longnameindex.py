@@ -0,0 +1,95 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from robotide.controller.ctrlcommands import RenameTest
+from robotide.controller.longnameindex import LongnameIndex
+from utest.resources import datafilereader
+
+ROOT = 'Simple Testsuite With Different Namespaces'
+
+
+class TestLongnameIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.project = datafilereader.construct_project(datafilereader.SIMPLE_TEST_SUITE_PATH)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.project.close()
+
+    def setUp(self):
+        self.searches = []
+        self.index = LongnameIndex(self)
+        self.index.build()
+
+    @property
+    def data(self):
+        return self.project.data
+
+    def find_controller_by_longname(self, longname, testname=None):
+        self.searches.append((longname, testname))
+        return self.project.find_controller_by_longname(longname, testname)
+
+    def test_finding_tests(self):
+        for suite in self.project.data.suites:
+            for test in suite.tests:
+                assert self.index.find(test.longname, test.name) is test
+        assert self.searches == []
+
+    def test_finding_suites(self):
+        suite = datafilereader.get_ctrl_by_name('TestSuite2', self.project.datafiles)
+        assert self.index.find(ROOT) is self.project.data
+        assert self.index.find(ROOT + '.TestSuite2') is suite
+        assert self.searches == []
+
+    def test_test_name_must_match(self):
+        longname = ROOT + '.TestSuite2.My Test'
+        assert self.index.find(longname, 'Other') is None
+        assert self.index.find(longname, 'My Test').name == 'My Test'
+
+    def test_unknown_tests_are_searched_once(self):
+        longname = ROOT + '.TestSuite2.Generated Test 1'
+        assert self.index.find(longname, 'Generated Test 1') is None
+        assert self.index.find(longname, 'Generated Test 1') is None
+        assert self.searches == [(longname, 'Generated Test 1')]
+
+    def test_tests_missing_from_index_are_searched(self):
+        suite = datafilereader.get_ctrl_by_name('TestSuite3', self.project.datafiles)
+        test = suite.create_test('Added After Build')
+        try:
+            assert self.index.find(test.longname, test.name) is test
+            assert self.index.find(test.longname, test.name) is test
+            assert len(self.searches) == 1
+        finally:
+            test.delete()
+
+    def test_renamed_tests_are_followed(self):
+        suite = datafilereader.get_ctrl_by_name('TestSuite3', self.project.datafiles)
+        test = suite.tests[0]
+        old_longname = test.longname
+        test.execute(RenameTest('Renamed Test'))
+        try:
+            assert self.index.find(ROOT + '.TestSuite3.Renamed Test', 'Renamed Test') is test
+            assert self.searches == []
+            assert self.index.find(old_longname, 'My Second Test') is None
+        finally:
+            test.execute(RenameTest('My Second Test'))
+
+
+if __name__ == '__main__':
+    unittest.main()
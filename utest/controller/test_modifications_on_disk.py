@@ -26,7 +26,7 @@ from robotide.controller.filecontrollers import (
     TestCaseFileController, TestDataDirectoryController,
     ResourceFileController)
 from robotide.controller import Project
-from robotide.publish.messages import RideDataFileRemoved
+from robotide.publish.messages import RideDataFileRemoved, RideDataFileSet
 from robotide.publish import PUBLISHER
 from robotide.namespace.namespace import Namespace
 from robotide.spec.librarymanager import LibraryManager
@@ -227,5 +227,86 @@ class DeleteCommandTest(_DataDependentTest):
         assert len(self.suite.setting_table.imports) == import_count
 
 
+class TestReloadChangedFiles(_DataDependentTest):
+
+    def setUp(self):
+        _DataDependentTest.setUp(self)
+        self.project = create_project()
+        self.project.load_data(self._dirpath)
+        self.suite = self.project.data.children[0]
+        self.resource = self.project.resources[0]
+
+    def test_modified_suite_is_reloaded(self):
+        with open(self._filepath, 'a') as file:
+            file.write('Second Test\n  Log  Hello World!\n')
+        assert self.project.reload_changed_files([self._filepath])
+        assert self.project.data.children[0] is self.suite
+        assert [t.name for t in self.suite.tests] == ['Ride Unit Test', 'Second Test']
+        assert self.project.suite.children[0] is self.suite.data
+
+    def test_reloaded_suite_is_published_when_complete(self):
+        published = []
+
+        def datafile_set(message):
+            published.append((message.item, [t.name for t in message.item.tests],
+                              message.item.filename, message.item.dirty))
+
+        PUBLISHER.subscribe(datafile_set, RideDataFileSet)
+        try:
+            self.suite.mark_dirty()
+            with open(self._filepath, 'a') as file:
+                file.write('Second Test\n  Log  Hello World!\n')
+            assert self.project.reload_changed_files([self._filepath])
+        finally:
+            PUBLISHER.unsubscribe(datafile_set, RideDataFileSet)
+        assert published == [(self.suite, ['Ride Unit Test', 'Second Test'], self._filepath, False)]
+
+    def test_modified_resource_is_reloaded_in_namespace(self):
+        with open(self._resource_path, 'a') as file:
+            file.write('Ninjaed Keyword  Log  I am taking over!\n')
+        assert self.project.reload_changed_files([self._resource_path])
+        assert self.project.resources == [self.resource]
+        assert self.resource.keywords[-1].name == 'Ninjaed Keyword'
+        assert self.project.namespace.get_resource(self._resource_path) is self.resource.data
+        assert self.project.namespace.find_user_keyword(self.suite.datafile, 'Ninjaed Keyword')
+
+    def test_unchanged_files_are_not_reloaded(self):
+        data = self.suite.data
+        assert self.project.reload_changed_files([self._filepath, self._resource_path])
+        assert self.suite.data is data
+
+    def test_removed_resource_is_removed(self):
+        os.remove(self._resource_path)
+        assert self.project.reload_changed_files([self._resource_path])
+        assert self.project.resources == []
+        assert not self.project.namespace.find_user_keyword(self.suite.datafile, 'Unit Test Keyword')
+
+    def test_created_suite_is_added(self):
+        path = os.path.join(self._dirpath, 'new.robot')
+        with open(path, 'w') as file:
+            file.write('*** Test Cases ***\nNew Test\n  No Operation\n')
+        assert self.project.reload_changed_files([path])
+        assert [s.name for s in self.project.data.suites] == ['Tests', 'New']
+        assert self.project.suite.children[-1].source == path
+
+    def test_created_resource_resolves_imports(self):
+        path = os.path.join(self._dirpath, 'new.resource')
+        with open(self._filepath, 'a') as file:
+            file.write('*** Settings ***\nResource  new.resource\n')
+        assert self.project.reload_changed_files([self._filepath])
+        assert len(self.project.resources) == 1
+        with open(path, 'w') as file:
+            file.write('*** Keywords ***\nNew Keyword\n  No Operation\n')
+        assert self.project.reload_changed_files([path])
+        assert [r.filename for r in self.project.resources] == [self._resource_path, path]
+        assert self.project.namespace.find_user_keyword(self.suite.datafile, 'New Keyword')
+
+    def test_changed_init_file_or_directory_needs_full_reload(self):
+        assert not self.project.reload_changed_files([self._init_path])
+        directory = os.path.join(self._dirpath, 'subdir')
+        os.mkdir(directory)
+        assert not self.project.reload_changed_files([directory])
+
+
 if __name__ == "__main__":
     unittest.main()
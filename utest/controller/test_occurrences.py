@@ -394,6 +394,55 @@ class FindVariableOccurrencesTest(unittest.TestCase):
              (self._case3.name, 'Steps', 1)))
 
 
+class UsageIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.test_ctrl, self.namespace = TestCaseControllerWithSteps()
+        self.datafile = self.test_ctrl.datafile_controller
+
+    def _occurrences(self, name):
+        return list(self.test_ctrl.execute(FindOccurrences(name)))
+
+    def test_candidates_are_found_by_normalized_value(self):
+        candidates = self.datafile.keyword_usage_candidates('r un KEYWORD')
+        assert [c.keyword for c in candidates] == ['Run Keyword']
+
+    def test_candidates_without_bdd_prefix(self):
+        self.test_ctrl.execute(ChangeCellValue(0, 0, 'Given ' + STEP1_KEYWORD))
+        assert len(self._occurrences(STEP1_KEYWORD)) == 1
+
+    def test_index_follows_step_changes(self):
+        assert self._occurrences(UNUSED_KEYWORD_NAME) == []
+        self.test_ctrl.execute(ChangeCellValue(0, 0, UNUSED_KEYWORD_NAME))
+        assert len(self._occurrences(UNUSED_KEYWORD_NAME)) == 1
+        self.test_ctrl.execute(Undo())
+        assert self._occurrences(UNUSED_KEYWORD_NAME) == []
+
+    def test_index_is_rebuilt_only_after_changes(self):
+        revision = self.datafile.revision
+        self._occurrences(STEP1_KEYWORD)
+        index = self.datafile.usage_index
+        items = index._keywords
+        self._occurrences(STEP2_ARGUMENT)
+        assert index._keywords is items
+        self.test_ctrl.execute(ChangeCellValue(0, 1, 'Hi'))
+        assert self.datafile.revision > revision
+        self._occurrences(STEP1_KEYWORD)
+        assert index._keywords is not items
+
+    def test_variable_candidates_follow_step_changes(self):
+        assert self.datafile.variable_usage_candidates('${greeting}') == []
+        self.test_ctrl.execute(ChangeCellValue(0, 1, 'Hello ${Gree ting}!'))
+        candidates = self.datafile.variable_usage_candidates('${greeting}')
+        assert [c.as_list() for c in candidates] == [
+            [STEP1_KEYWORD, 'Hello ${Gree ting}!']]
+        assert self.datafile.variable_usage_candidates('@{greeting}') == []
+
+    def test_variable_candidates_are_not_known_for_patterns(self):
+        assert self.datafile.variable_usage_candidates('${gree*}') is None
+        assert self.datafile.variable_usage_candidates('greeting') is None
+
+
 class RenameOccurrenceTest(unittest.TestCase):
 
     def setUp(self):
@@ -0,0 +1,83 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from robotide.controller.dataloader import DataLoader
+from robotide.controller.parsecache import ParsedFileCache
+from robotide.lib.robot.parsing import populators
+from robotide.namespace import Namespace
+from utest.resources import FakeSettings
+from utest.resources.mocks import MessageRecordingLoadObserver
+
+SUITE = """\
+*** Test Cases ***
+Test
+    Log    Hello
+"""
+
+
+class TestParsedFileCache(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._path = os.path.join(self._dir, 'suite.robot')
+        self._write(SUITE)
+        self._cache = ParsedFileCache(os.path.join(self._dir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_storing_rows(self):
+        rows = populators.split_rows(self._path)
+        self.assertFalse(self._cache.contains(self._path))
+        self._cache.put(self._path, rows)
+        self.assertTrue(self._cache.contains(self._path))
+        self.assertEqual(self._cache.get(self._path), rows)
+
+    def test_modified_file_is_not_in_cache(self):
+        self._cache.put(self._path, populators.split_rows(self._path))
+        self._write(SUITE + '    Log    World\n')
+        os.utime(self._path, ns=(1, 1))
+        self.assertFalse(self._cache.contains(self._path))
+        self.assertEqual(self._cache.get(self._path), None)
+
+    def test_missing_file_is_not_in_cache(self):
+        self.assertEqual(self._cache.get(os.path.join(self._dir, 'missing.robot')), None)
+
+    def test_loading_project_uses_cache(self):
+        settings = FakeSettings({'cache parsed files': True})
+        loader = DataLoader(Namespace(settings), settings)
+        loader._cache = self._cache
+        loader.load_datafile(self._dir, MessageRecordingLoadObserver())
+        self.assertTrue(self._cache.contains(self._path))
+        original = populators.split_rows
+        populators.split_rows = None
+        try:
+            datafile = loader.load_datafile(self._dir, MessageRecordingLoadObserver())
+        finally:
+            populators.split_rows = original
+        self.assertEqual(datafile.children[0].testcase_table.tests[0].name, 'Test')
+
+    def _write(self, content):
+        with open(self._path, 'w') as suite:
+            suite.write(content)
+
+
+if __name__ == '__main__':
+    unittest.main()
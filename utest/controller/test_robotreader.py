@@ -0,0 +1,80 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+from io import BytesIO
+
+from robotide.lib.robot.parsing.robotreader import RobotReader
+from robotide.lib.robot.utils import Utf8Reader
+
+
+class TestSplitRow(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = RobotReader()
+        self.reader._separator_check = True
+
+    def _assert_split(self, line, expected):
+        self.assertEqual(self.reader.split_row(line), expected)
+
+    def test_cells(self):
+        self._assert_split('Log  a  b    c', ['Log', 'a', 'b', 'c'])
+        self._assert_split('  Log  a', ['', 'Log', 'a'])
+        self._assert_split('\tLog\tx', ['', 'Log', 'x'])
+        self._assert_split('    \tLog  a', ['', '', '', 'Log', 'a'])
+        self._assert_split('x  y  ', ['x', 'y'])
+        self._assert_split('', [''])
+        self._assert_split('    ', ['', '', ''])
+
+    def test_comments(self):
+        self._assert_split('#', ['', '#'])
+        self._assert_split('# comment', ['', '# comment'])
+        self._assert_split('  # indented', ['', '', '# indented'])
+        self._assert_split('Log  x  # comment  here', ['Log', 'x', '# comment  here'])
+        self._assert_split('Log  x#  y', ['Log', 'x', '#  y'])
+        self._assert_split('Log  x  ## double', ['Log', 'x', '## double'])
+
+    def test_sharp_not_starting_comment(self):
+        self._assert_split('Log  x  #comment', ['Log', 'x', '#comment'])
+        self._assert_split('a#', ['a#'])
+        self._assert_split('Log  \\#  not  # yes', ['Log', '\\#', 'not', '# yes'])
+
+    def test_no_comments_after_quotes(self):
+        self._assert_split('Log  "a # b"  # c  d', ['Log', '"a # b"', '# c', 'd'])
+        self._assert_split("Log  'q'  # c  d", ['Log', "'q'", '# c', 'd'])
+        self._assert_split('# a "b"  # c', ['', '# a "b"  # c'])
+
+    def test_comments_with_four_space_separator(self):
+        reader = RobotReader(4)
+        list(reader.split_lines(['    Log    x']))
+        self.assertEqual(reader.split_row('Log    x  # a  b'), ['Log', 'x  ', '# a  b'])
+        self.assertEqual(reader.split_row('Log    x  #a  b'), ['Log', 'x  #a  b'])
+
+    def test_pipes(self):
+        self._assert_split('| Log | x |', ['Log', 'x'])
+
+
+class TestUtf8Reader(unittest.TestCase):
+
+    def test_lines_are_read_lazily_without_bom(self):
+        source = BytesIO(b'\xef\xbb\xbf*** Test Cases ***\nT\xc3\xa4st\n')
+        lines = Utf8Reader(source).readlines()
+        self.assertEqual(next(lines), '*** Test Cases ***\n')
+        self.assertEqual(source.tell(), len(b'\xef\xbb\xbf*** Test Cases ***\n'))
+        self.assertEqual(list(lines), [u'T\xe4st\n'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from robotide.controller.ctrlcommands import ChangeCellValue, SaveAll
+from robotide.controller.project import Serializer
+from robotide.publish import PUBLISHER
+from robotide.publish.messages import (RideModificationPrevented, RideSaveAll, RideSaved,
+                                       RideSaving)
+from utest.resources import datafilereader
+
+
+class _DataFile(object):
+
+    def __init__(self, content):
+        self.content = content
+        self.source = None
+
+    def save(self, output, **options):
+        if self.content is None:
+            raise IOError('Writing failed')
+        output.write(self.content)
+
+
+class _Controller(object):
+
+    def __init__(self, filename, content):
+        self.filename = filename
+        self.datafile = self.data = _DataFile(content)
+        self.data.source = filename
+
+
+class _Logger(object):
+
+    def __init__(self):
+        self.errors = []
+
+    def error(self, message):
+        self.errors.append(message)
+
+
+class _Observer(object):
+
+    def __init__(self):
+        self.progress = []
+
+    def update_progress(self, done, total):
+        self.progress.append((done, total))
+
+
+class TestSerializeFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.logger = _Logger()
+        self.serializer = Serializer({'save workers': 3}, self.logger)
+        self.existing = self._path('existing.robot')
+        with open(self.existing, 'w') as output:
+            output.write('old content')
+        os.chmod(self.existing, 0o640)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read(self, path):
+        with open(path) as source:
+            return source.read()
+
+    def test_files_are_written(self):
+        observer = _Observer()
+        controllers = [_Controller(self.existing, 'new content')] + \
+            [_Controller(self._path('new%d.robot' % i), 'content %d' % i) for i in range(5)]
+        self.serializer.serialize_files(controllers, observer)
+        assert self._read(self.existing) == 'new content'
+        for i in range(5):
+            assert self._read(self._path('new%d.robot' % i)) == 'content %d' % i
+        assert sorted(os.listdir(self.directory)) == \
+            sorted(['existing.robot'] + ['new%d.robot' % i for i in range(5)])
+        assert observer.progress == [(done, 6) for done in range(1, 7)]
+
+    def test_file_mode_is_kept(self):
+        self.serializer.serialize_files([_Controller(self.existing, 'new content')])
+        assert os.stat(self.existing).st_mode & 0o777 == 0o640
+
+    def test_no_file_is_changed_when_writing_fails(self):
+        controllers = [_Controller(self.existing, 'new content'),
+                       _Controller(self._path('new.robot'), 'content'),
+                       _Controller(self._path('failing.robot'), None)]
+        self.assertRaises(IOError, self.serializer.serialize_files, controllers)
+        assert self._read(self.existing) == 'old content'
+        assert os.listdir(self.directory) == ['existing.robot']
+        assert 'failing.robot' in self.logger.errors[0]
+
+    def test_files_are_restored_when_replacing_fails(self):
+        directory = self._path('directory.robot')
+        os.mkdir(directory)
+        controllers = [_Controller(self.existing, 'new content'),
+                       _Controller(directory, 'content')]
+        self.assertRaises(OSError, self.serializer.serialize_files, controllers)
+        assert self._read(self.existing) == 'old content'
+        assert sorted(os.listdir(self.directory)) == ['directory.robot', 'existing.robot']
+
+
+class TestSaveAll(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'suite')
+        shutil.copytree(datafilereader.SIMPLE_TEST_SUITE_PATH, path)
+        self.project = datafilereader.construct_project(path)
+        self.first = datafilereader.get_ctrl_by_name('TestSuite1', self.project.datafiles)
+        self.second = datafilereader.get_ctrl_by_name('TestSuite2', self.project.datafiles)
+        self.messages = []
+        for topic in (RideSaving, RideSaved, RideSaveAll, RideModificationPrevented):
+            PUBLISHER.subscribe(self._record, topic)
+
+    def tearDown(self):
+        PUBLISHER.unsubscribe_all()
+        self.project.close()
+        shutil.rmtree(self.directory)
+
+    def _record(self, message):
+        self.messages.append(message)
+
+    def _messages(self):
+        return [(type(message), getattr(message, 'path', None)) for message in self.messages]
+
+    def test_dirty_files_are_saved(self):
+        self.first.tests[0].execute(ChangeCellValue(0, 0, 'Changed Keyword'))
+        self.second.mark_dirty()
+        self.project.execute(SaveAll())
+        assert not self.first.dirty and not self.second.dirty
+        with open(self.first.filename) as source:
+            assert 'Changed Keyword' in source.read()
+        paths = [self.first.filename, self.second.filename]
+        assert sorted(self._messages()[:2]) == sorted((RideSaving, path) for path in paths)
+        assert sorted(self._messages()[2:4]) == sorted((RideSaved, path) for path in paths)
+        assert self._messages()[4:] == [(RideSaveAll, None)]
+
+    def test_read_only_files_are_not_saved(self):
+        self.first.mark_dirty()
+        self.second.mark_dirty()
+        self.second.is_modifiable = lambda: False
+        self.project.execute(SaveAll())
+        assert not self.first.dirty
+        assert self.second.dirty
+        assert self.messages[0].controller is self.second
+        assert self._messages() == [(RideModificationPrevented, None), (RideSaving, self.first.filename),
+                                    (RideSaved, self.first.filename), (RideSaveAll, None)]
+
+
+if __name__ == '__main__':
+    unittest.main()
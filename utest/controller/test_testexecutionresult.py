@@ -14,7 +14,7 @@
 #  limitations under the License.
 
 import unittest
-from robotide.controller.testexecutionresults import TestExecutionResults
+from robotide.controller.testexecutionresults import ExecutionStatusUpdates, TestExecutionResults
 
 class TestExecutionResultTestCase(unittest.TestCase):
 
@@ -78,5 +78,23 @@ class TestExecutionResultTestCase(unittest.TestCase):
         self.assertFalse(self._results.has_failed(test))
 
 
+class ExecutionStatusUpdatesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._updates = ExecutionStatusUpdates()
+
+    def test_first_added_test_starts_batch(self):
+        self.assertTrue(self._updates.add('test 1'))
+        self.assertFalse(self._updates.add('test 2'))
+        self._updates.pop_all()
+        self.assertTrue(self._updates.add('test 3'))
+
+    def test_tests_are_kept_once_in_order_of_latest_change(self):
+        for test in ['test 1', 'test 2', 'test 1', 'test 3']:
+            self._updates.add(test)
+        self.assertEqual(self._updates.pop_all(), ['test 2', 'test 1', 'test 3'])
+        self.assertEqual(self._updates.pop_all(), [])
+
+
 if __name__ == '__main__':
     unittest.main()
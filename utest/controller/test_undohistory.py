@@ -0,0 +1,121 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from robotide.controller.basecontroller import WithUndoRedoStacks
+from robotide.controller.ctrlcommands import ChangeCellValue, RemoveMacro
+from robotide.controller.undohistory import UndoHistory, estimate_size
+from utest.resources import datafilereader
+
+
+class _Controller(WithUndoRedoStacks):
+    undo_history = UndoHistory()
+
+    def __init__(self, datafile=None):
+        self.datafile_controller = datafile or self
+
+
+class TestUndoHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.history = _Controller.undo_history
+        self.history.configure(entries_per_file=3, entries=5)
+        self.datafile = _Controller()
+        self.test = _Controller(self.datafile)
+        self.other = _Controller()
+
+    def tearDown(self):
+        for controller in (self.datafile, self.test, self.other):
+            controller.clear_undo()
+            controller.clear_redo()
+
+    def _push(self, controller, *values):
+        for value in values:
+            controller.push_to_undo(ChangeCellValue(0, 0, value))
+
+    def _undo_values(self, controller):
+        values = []
+        while not controller.is_undo_empty():
+            values.insert(0, controller.pop_from_undo()._value)
+        return values
+
+    def test_oldest_entries_of_datafile_are_forgotten(self):
+        self._push(self.datafile, 'a', 'b')
+        self._push(self.test, 'c', 'd')
+        assert self._undo_values(self.datafile) == ['b']
+        assert self._undo_values(self.test) == ['c', 'd']
+
+    def test_oldest_entries_of_all_datafiles_are_forgotten(self):
+        self._push(self.datafile, 'a', 'b', 'c')
+        self._push(self.other, 'd', 'e', 'f')
+        assert self._undo_values(self.datafile) == ['b', 'c']
+        assert self._undo_values(self.other) == ['d', 'e', 'f']
+
+    def test_entries_are_forgotten_by_size(self):
+        size = estimate_size(ChangeCellValue(0, 0, 'x' * 1000))
+        self.history.configure(bytes_per_file=2 * size)
+        self._push(self.datafile, 'a' * 1000, 'b' * 1000, 'c' * 1000)
+        assert self._undo_values(self.datafile) == ['b' * 1000, 'c' * 1000]
+
+    def test_redo_entries_are_counted(self):
+        self.test.push_to_redo(ChangeCellValue(0, 0, 'a'))
+        self._push(self.datafile, 'b', 'c', 'd')
+        assert self._undo_values(self.datafile) == ['c', 'd']
+        assert not self.test.is_redo_empty()
+
+    def test_size(self):
+        self._push(self.datafile, 'a')
+        self._push(self.test, 'b')
+        self._push(self.other, 'c')
+        sizes = self.history.sizes_by_datafile()
+        assert sizes[self.datafile] == (2, 2 * estimate_size(ChangeCellValue(0, 0, 'a')))
+        assert sizes[self.other] == (1, estimate_size(ChangeCellValue(0, 0, 'c')))
+        assert self.history.size() == (3, sum(size for _, size in sizes.values()))
+
+
+class TestEstimateSize(unittest.TestCase):
+
+    def test_longer_values_are_bigger(self):
+        assert estimate_size(ChangeCellValue(0, 0, 'x' * 1000)) > \
+            estimate_size(ChangeCellValue(0, 0, 'x')) + 900
+
+    def test_shared_objects_are_counted_once(self):
+        value = ['x' * 1000]
+        assert estimate_size([value, value]) < 2 * estimate_size(value)
+
+    def test_cyclic_references(self):
+        value = []
+        value.append(value)
+        assert estimate_size(value) > 0
+
+    def test_size_does_not_depend_on_existing_history(self):
+        project = datafilereader.construct_project(datafilereader.SIMPLE_TEST_SUITE_PATH)
+        try:
+            test = project.datafiles[1].tests[0]
+            size = estimate_size(RemoveMacro(test))
+            for _ in range(20):
+                test.datafile_controller.push_to_undo(RemoveMacro(test))
+                test.push_to_undo(ChangeCellValue(0, 0, 'x' * 1000))
+            assert estimate_size(RemoveMacro(test)) == size
+            assert size < 10000
+        finally:
+            test.datafile_controller.clear_undo()
+            test.clear_undo()
+            project.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
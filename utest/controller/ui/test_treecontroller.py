@@ -134,6 +134,53 @@ class TestNavigationHistory(_BaseTreeControllerTest, unittest.TestCase):
             self._go_forward_and_return_selection() == expected_selection)
 
 
+class _HandlerMock(object):
+
+    def __init__(self, controller):
+        self.controller = controller
+
+
+class TestNodeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._handlers = {}
+        tree_mock = lambda: 0
+        tree_mock.GetItemData = lambda node: self._handlers.get(node)
+        self.controller = TreeController(tree_mock, None, None, None)
+
+    def _register(self, node, controller):
+        self._handlers[node] = _HandlerMock(controller)
+        self.controller.register_node(node, controller)
+
+    def test_find_node_by_controller(self):
+        first, second = object(), object()
+        self._register('first node', first)
+        self._register('second node', second)
+        self.assertEqual(self.controller.find_node_by_controller(first), 'first node')
+        self.assertEqual(self.controller.find_node_by_controller(second), 'second node')
+        self.assertEqual(self.controller.find_node_by_controller(object()), None)
+
+    def test_forgotten_nodes_are_not_found(self):
+        controller = object()
+        self._register('node', controller)
+        self.controller.forget_nodes(['node', 'unknown node'])
+        self.assertEqual(self.controller.find_node_by_controller(controller), None)
+
+    def test_other_node_of_same_controller_is_found_after_forgetting_first(self):
+        controller = object()
+        self._register('first node', controller)
+        self._register('second node', controller)
+        self.assertEqual(self.controller.find_node_by_controller(controller), 'first node')
+        self.controller.forget_nodes(['first node'])
+        self.assertEqual(self.controller.find_node_by_controller(controller), 'second node')
+
+    def test_forget_all_nodes(self):
+        controller = object()
+        self._register('node', controller)
+        self.controller.forget_all_nodes()
+        self.assertEqual(self.controller.find_node_by_controller(controller), None)
+
+
 class TestTestSelectionController(UIUnitTestBase):
 
     def setUp(self):
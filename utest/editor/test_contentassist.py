@@ -85,6 +85,19 @@ class TestSuggestions(unittest.TestCase):
         choices = suggestions.get_for('a')
         self.assertEqual(choices, ['aarnio', 'fo.aaatio', 'bA.AAATIO'])
 
+    def test_cached_suggestions_are_narrowed(self):
+        mock_source = self._create_mock_source()
+        suggestions = Suggestions(mock_source)
+        suggestions.get_for('a')
+        self.assertEqual(suggestions.get_for('aa R'), ['aarnio'])
+        self.assertEqual(suggestions.get_for('aa Rn'), ['aarnio'])
+        self.assertEqual(suggestions.get_for('aa Rnx'), [])
+        self.assertEqual(mock_source.request_count, 1)
+
+    def test_duplicate_names(self):
+        choices = self._suggestions(('Foo', 'a.Foo'), ('f o o', 'b.f o o'), ('Bar', 'a.Bar'))
+        self.assertEqual(Suggestions._get_duplicate_names(choices), {'foo'})
+
     def _create_mock_source(self):
         mock_source = lambda:0
         mock_source.request_count = 0
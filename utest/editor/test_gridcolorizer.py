@@ -63,9 +63,37 @@ class TestPerformance(unittest.TestCase):
              '#asdjaskdkjasdkjaskdjkasjd', 'asdasd,asdasd,as asd jasdj asjd asjdj asd']
 
     def test_colorizing_performance(self):
-        colorizer = Colorizer(MockGrid(), ControllerWithCellInfo())
+        grid = MockGrid()
+        grid.NumberCols = 1
+        colorizer = Colorizer(grid, ControllerWithCellInfo())
         for _ in range(0, 500):
-            colorizer._colorize_cell(1,1, self._data[random.randint(0, 4)])
+            colorizer._colorize_row(1, self._data[random.randint(0, 4)])
+
+
+class ControllerWithRowCellInfos(ControllerWithCellInfo):
+
+    def __init__(self):
+        ControllerWithCellInfo.__init__(self)
+        self.rows = []
+
+    def get_cell_info(self, row, column):
+        raise AssertionError('Cells should be fetched by rows')
+
+    def get_cell_infos(self, row, columns):
+        self.rows.append((row, columns))
+        return [ControllerWithCellInfo.get_cell_info(self, row, col) for col in columns]
+
+
+class TestRowColoring(unittest.TestCase):
+
+    def test_cell_infos_are_fetched_by_rows(self):
+        grid = MockGrid()
+        grid.NumberCols = 3
+        controller = ControllerWithRowCellInfos()
+        colorizer = Colorizer(grid, controller)
+        colorizer._colorize_row(4, 'foo')
+        colorizer._colorize_row(5, 'foo')
+        self.assertEqual(controller.rows, [(4, [0, 1, 2]), (5, [0, 1, 2])])
 
 
 if __name__ == '__main__':
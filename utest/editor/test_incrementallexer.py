@@ -0,0 +1,100 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from robotide.editor.incrementallexer import IncrementalLexer, robotframeworklexer
+
+DATA = """*** Settings ***
+Test Template    Template Keyword
+Library    Collections
+
+*** Variables ***
+${VAR}    value
+
+*** Test Cases ***
+First Test
+    [Documentation]    Uses the ${VAR}
+    ${result}=    Keyword    ${VAR}
+    ...    continued    arguments
+Second Test
+    Given something happens
+    # Comment
+Third Test    argument
+
+*** Keywords ***
+Template Keyword
+    [Arguments]    ${arg}
+    Log    ${arg}
+Embedded ${argument} Keyword
+    FOR    ${item}    IN    @{LIST}
+        Log    ${item}
+    END
+"""
+
+
+@unittest.skipIf(robotframeworklexer is None, 'pygments is not installed')
+class TestIncrementalLexer(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = DATA.splitlines()
+        self.lexer = IncrementalLexer(state_interval=2)
+
+    def test_tokens_match_pygments_lexer(self):
+        tokens = [(token, value) for _, values in self.lexer.tokenize(self.rows, 0)
+                  for value, token in values]
+        expected = [(token, value) for _, token, value in
+                    robotframeworklexer.RobotFrameworkLexer().get_tokens_unprocessed(DATA)]
+        self.assertEqual(tokens, expected)
+
+    def test_restarting_from_stored_state_gives_same_tokens(self):
+        full = dict(self.lexer.tokenize(self.rows, 0))
+        for line in range(len(self.rows)):
+            first = self.lexer.restart_line(line)
+            self.assertLessEqual(first, line)
+            self.assertEqual(dict(self.lexer.tokenize(self.rows[first:], first)),
+                             {number: full[number] for number in range(first, len(self.rows))})
+
+    def test_restart_line_is_nearest_block_start(self):
+        list(self.lexer.tokenize(self.rows, 0))
+        self.assertEqual(self.lexer.restart_line(self.rows.index('*** Keywords ***') + 1),
+                         self.rows.index('*** Keywords ***'))
+        self.assertEqual(self.lexer.restart_line(self.rows.index('Second Test') + 1),
+                         self.rows.index('Second Test'))
+        self.assertEqual(self.lexer.restart_line(0), 0)
+
+    def test_restart_line_forgets_later_states(self):
+        list(self.lexer.tokenize(self.rows, 0))
+        first = self.lexer.restart_line(3)
+        self.assertEqual(self.lexer.restart_line(len(self.rows)), first)
+
+    def test_states_are_not_stored_within_interval(self):
+        lexer = IncrementalLexer(state_interval=100)
+        list(lexer.tokenize(self.rows, 0))
+        self.assertEqual(lexer.restart_line(self.rows.index('Third Test    argument')),
+                         self.rows.index('*** Test Cases ***'))
+
+    def test_changed_lines_are_lexed_with_state_before_them(self):
+        list(self.lexer.tokenize(self.rows, 0))
+        line = self.rows.index('Third Test    argument')
+        self.rows[line] = '    Log    changed'
+        first = self.lexer.restart_line(line)
+        restarted = dict(self.lexer.tokenize(self.rows[first:], first))
+        full = dict(IncrementalLexer().tokenize(self.rows, 0))
+        self.assertEqual(restarted[line], full[line])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from robotide.namespace.cache import DependencyCache
+
+
+class TestDependencyCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = DependencyCache()
+        self.cache.put('suite.robot', 'suite kws', ['common.resource', 'other.resource'])
+        self.cache.put('other.resource', 'other kws', ['common.resource'])
+        self.cache.put('unrelated.robot', 'unrelated kws')
+
+    def test_cache_hit(self):
+        assert 'suite kws' == self.cache.get('suite.robot')
+        assert self.cache.get('missing.robot') is None
+
+    def test_invalidating_entry_itself(self):
+        assert {'unrelated.robot'} == self.cache.invalidate('unrelated.robot')
+        assert self.cache.get('unrelated.robot') is None
+        assert 'suite kws' == self.cache.get('suite.robot')
+
+    def test_invalidating_dependency_evicts_only_dependents(self):
+        evicted = self.cache.invalidate('common.resource')
+        assert {'suite.robot', 'other.resource'} == evicted
+        assert 'suite.robot' not in self.cache
+        assert 'other.resource' not in self.cache
+        assert 'unrelated kws' == self.cache.get('unrelated.robot')
+
+    def test_invalidating_unknown_dependency(self):
+        assert set() == self.cache.invalidate('unknown.resource')
+        assert 'suite kws' == self.cache.get('suite.robot')
+
+    def test_clear(self):
+        self.cache.clear()
+        assert self.cache.get('suite.robot') is None
+        assert set() == self.cache.invalidate('common.resource')
+
+
+if __name__ == "__main__":
+    unittest.main()
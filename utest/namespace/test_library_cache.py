@@ -19,6 +19,8 @@ import os
 from robotide.spec.librarymanager import LibraryManager
 from threading import Thread
 from robotide.namespace.cache import LibraryCache
+from robotide.spec.iteminfo import LibraryKeywordInfo
+from robotide.spec.librarydatabase import LibraryDatabase
 from utest.resources import DATAPATH
 
 sys.path.append(os.path.join(DATAPATH, 'libs'))
@@ -73,5 +75,79 @@ class TestLibraryCache(unittest.TestCase):
         raise AssertionError('Keyword %s not found in default keywords' % name)
 
 
+class _FingerprintingLibraryManager(object):
+
+    def __init__(self):
+        self.fingerprints = {}
+        self.fetched = []
+        self.inserted = []
+        self.late = set()
+        self._database = LibraryDatabase(':memory:')
+        self._database.create_database()
+
+    def store(self, name, fingerprint):
+        self.fingerprints[name] = fingerprint
+        self._database.insert_library_keywords(
+            name, None, [LibraryKeywordInfo('Keyword', '', 'ROBOT', name, [])], fingerprint)
+
+    def get_library_database(self):
+        return self._database
+
+    def library_fingerprint(self, name):
+        return self.fingerprints.get(name)
+
+    def fetch_keywords(self, name, args, callback):
+        self.fetched.append(name)
+
+    def get_and_insert_libraries(self, libraries, late_callback):
+        self.inserted.append([name for name, _ in libraries])
+        self.late_callback = late_callback
+        return [None if name in self.late else
+                [LibraryKeywordInfo('Imported', '', 'ROBOT', name, [])]
+                for name, _ in libraries]
+
+
+class TestLibraryFreshness(unittest.TestCase):
+
+    def setUp(self):
+        self._manager = _FingerprintingLibraryManager()
+        self._manager.store('Unchanged', 'v1')
+        self._manager.store('Changed', 'v1')
+        self._refreshed = []
+        self._cache = LibraryCache({}, self._refreshed.append, self._manager)
+
+    def test_unchanged_library_is_not_refreshed(self):
+        self._cache.get_library_keywords('Unchanged')
+        self.assertEqual(self._manager.fetched, [])
+
+    def test_changed_library_is_refreshed(self):
+        self._manager.fingerprints['Changed'] = 'v2'
+        self._cache.get_library_keywords('Unchanged')
+        self._cache.get_library_keywords('Changed')
+        self.assertEqual(self._manager.fetched, ['Changed'])
+
+    def test_refreshing_libraries_manually(self):
+        self._cache.get_library_keywords('Unchanged')
+        self._cache.get_library_keywords('Changed')
+        self._cache.refresh_libraries()
+        self.assertEqual(sorted(self._manager.fetched), ['Changed', 'Unchanged'])
+
+    def test_missing_libraries_are_imported_in_one_batch(self):
+        keywords = self._cache._get_libraries(
+            [('First', None), ('Unchanged', None), ('Second', None)])
+        self.assertEqual(self._manager.inserted, [['First', 'Second']])
+        self.assertEqual([[kw.name for kw in kws] for kws in keywords],
+                         [['Imported'], ['Keyword'], ['Imported']])
+
+    def test_library_imported_late_is_refreshed(self):
+        self._manager.late.add('Slow')
+        self.assertEqual(self._cache.get_library_keywords('Slow'), [])
+        self._manager.late.clear()
+        self._manager.late_callback('Slow')
+        self.assertEqual(self._refreshed, ['Slow'])
+        self.assertEqual([kw.name for kw in self._cache.get_library_keywords('Slow')],
+                         ['Imported'])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -14,6 +14,8 @@
 #  limitations under the License.
 
 import unittest
+
+from robotide import robotapi
 from utest.resources import datafilereader
 
 
@@ -75,6 +77,34 @@ class TestLocalNamespace(unittest.TestCase):
         self._verify_suggestions_on_row(4, start='${f', contains=['${foo}'], does_not_contain=['${argument}', '${bar}'])
         self._verify_suggestions_on_row(4, start='fo', contains=['${foo}'], does_not_contain=['${argument}', '${bar}'])
 
+    def test_variables_are_visible_like_in_suggestions(self):
+        local_namespace = self._keyword.get_local_namespace()
+        for name in ['${argument}', '${True}', '${TEST_NAME}', '${unknown}', '@{argument}', '${arg}']:
+            in_suggestions = any(sug.name == name for sug in local_namespace.get_suggestions(name))
+            self.assertEqual(local_namespace.has_name(name), in_suggestions, name)
+
+    def test_changed_arguments_are_visible(self):
+        self._keyword.arguments.set_value('${other}')
+        assert self._keyword.get_local_namespace().has_name('${other}')
+
+    def test_variable_added_to_variable_table_is_visible(self):
+        assert not self._test.get_local_namespace().has_name('${new}')
+        self._project.datafiles[0].variables.add_variable('${new}', 'value')
+        assert self._test.get_local_namespace().has_name('${new}')
+
+    def test_index_of_step(self):
+        for index, step in enumerate(self._keyword.steps):
+            self.assertEqual(self._keyword.index_of_step(step.step_controller_step), index)
+
+    def test_assignment_rows(self):
+        self.assertEqual(self._keyword.assignment_rows(), {'${foo}': 2, '${bar}': 4, '${i}': 6})
+
+    def test_assignment_in_added_step_is_visible_on_following_rows(self):
+        self._keyword.add_step(0, robotapi.Step(['${new}=', 'Set Variable', 'value']))
+        assert not self._keyword.get_local_namespace_for_row(0).has_name('${new}')
+        assert self._keyword.get_local_namespace_for_row(1).has_name('${new}')
+        self.assertEqual(self._keyword.index_of_step(self._keyword.steps[3].step_controller_step), 3)
+
     def _verify_suggestions_on_row(self, row, start='${', contains=None, does_not_contain=None):
         suggestion_names = [suggestion.name for suggestion in self._keyword.get_local_namespace_for_row(row).get_suggestions(start)]
         self.assertEqual(len(suggestion_names), len(set(suggestion_names)))
@@ -1,14 +1,18 @@
+import shutil
 import sys
+import tempfile
+import time
 import unittest
 
 from robotide.robotapi import (
     TestCaseFile, Resource, VariableTable, TestDataDirectory)
 from robotide.context import IS_WINDOWS
-from robotide.namespace.namespace import _VariableStash
+from robotide.namespace.namespace import _KeywordSuggestions, _VariableStash
 from robotide.controller.filecontrollers import data_controller
-from robotide.spec.iteminfo import ArgumentInfo, VariableInfo
+from robotide.publish import PUBLISHER
+from robotide.spec.iteminfo import ArgumentInfo, LibraryKeywordInfo, VariableInfo
 from robotide.spec.librarymanager import LibraryManager
-from robotide.utils import normpath
+from robotide.utils import normalize, normpath
 from utest.resources.datafilereader import *
 from utest.resources.mocks import FakeSettings
 
@@ -348,6 +352,16 @@ class TestKeywordSuggestions(_DataFileTest):
                 assert s.source.endswith(source.encode('utf-8')), '%s does not end with %s' % (s.source, source)
             print("DEBUG: %s TEST endswith %s" % (s.source if isinstance(s.source, str) else str(s.source, 'utf-8'), source))
 
+    def test_keywords_with_bdd_prefix(self):
+        sugs = self.ns.get_suggestions_for(self.kw, 'Given sHoUlD be in')
+        assert EXISTING_USER_KEYWORD in [s.name for s in sugs]
+
+    def test_keyword_suggestions_are_kept_until_datafile_is_updated(self):
+        sugs = self.ns.get_suggestions_for(self.kw, EXISTING_USER_KEYWORD)
+        assert sugs[0] is self.ns.get_suggestions_for(self.kw, EXISTING_USER_KEYWORD)[0]
+        self.ns.update_datafile(self.tcf)
+        assert sugs[0] is not self.ns.get_suggestions_for(self.kw, EXISTING_USER_KEYWORD)[0]
+
     def test_reset(self):
         sugs = self.ns.get_suggestions_for(self.kw, 'generate random')
         sugs2 = self.ns.get_suggestions_for(self.kw, 'generate random')
@@ -357,6 +371,38 @@ class TestKeywordSuggestions(_DataFileTest):
         assert not sugs[0] is sugs3[0]
 
 
+class TestKeywordSuggestionIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.keywords = [LibraryKeywordInfo(name, '', 'ROBOT', source, []) for name, source in
+                         [('Log', 'BuiltIn'), ('Log Many', 'BuiltIn'),
+                          ('Open Browser', 'Selenium'), ('Log', 'Mine'),
+                          ('Close', 'Logger')]]
+        self.index = _KeywordSuggestions(self.keywords)
+
+    def test_all_keywords_with_empty_start(self):
+        self.assertEqual(self._longnames(self.index.get('')), self._longnames(self.keywords))
+
+    def test_keywords_matching_name_or_longname(self):
+        for start in ['', 'l', 'LOG', 'log m', 'built', 'builtin.log', 'o', 'Selenium.Open', 'x']:
+            expected = [kw for kw in self.keywords
+                        if kw.name_begins_with(normalize(start))
+                        or kw.longname_begins_with(normalize(start))]
+            self.assertEqual(self._longnames(self.index.get(start)), self._longnames(expected), start)
+
+    def test_keywords_are_in_sorted_order(self):
+        self.assertEqual([kw.name for kw in self.index.get('l')], ['Close', 'Log', 'Log', 'Log Many'])
+
+    def test_keywords_matching_without_bdd_prefix(self):
+        self.assertEqual([kw.longname for kw in self.index.get('When open')],
+                         ['Selenium.Open Browser'])
+        self.assertEqual(self.index.get('Andlog'), [])
+
+    @staticmethod
+    def _longnames(keywords):
+        return sorted(kw.longname for kw in keywords)
+
+
 class TestKeywordSearch(_DataFileTest):
 
     def test_is_library_keyword(self):
@@ -454,6 +500,106 @@ class TestKeywordSearch(_DataFileTest):
         return any([kw_name.lower() == kw.name.lower() for kw in keywords])
 
 
+class TestKeywordCache(_DataFileTest):
+
+    def setUp(self):
+        self.ns.update()
+        self.ns.find_keyword(self.tcf, EXISTING_USER_KEYWORD)
+
+    def _cached(self, datafile):
+        return datafile.source in self.ns._retriever.keyword_cache
+
+    def test_keywords_are_cached(self):
+        first = self.ns._retriever.keyword_cache.get(self.tcf.source)
+        self.ns.find_keyword(self.tcf, 'Should Be Equal')
+        assert first is self.ns._retriever.keyword_cache.get(self.tcf.source)
+
+    def test_changing_imported_resource_evicts_importing_datafile(self):
+        resource = self.ns.get_resources(self.tcf)[0]
+        self.ns.update_datafile(resource)
+        assert not self._cached(self.tcf)
+        assert self.ns.find_keyword(self.tcf, EXISTING_USER_KEYWORD)
+        assert self._cached(self.tcf)
+
+    def test_changing_unrelated_datafile_keeps_cache(self):
+        everything_tcf = TestCaseFile(
+            source=TESTCASEFILE_WITH_EVERYTHING).populate()
+        self.ns.update_datafile(everything_tcf)
+        assert self._cached(self.tcf)
+
+    def test_update_expires_everything(self):
+        self.ns.update()
+        assert not self._cached(self.tcf)
+
+
+class TestVariableChanges(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.library_manager = LibraryManager(':memory:')
+        cls.library_manager.start()
+        cls.library_manager.create_database()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.library_manager.stop()
+        cls.library_manager = None
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.varfile = self._write('namespace_changes_vars.py', 'RESOURCE = "first.resource"\n')
+        for name in ('first', 'second'):
+            self._write('%s.resource' % name,
+                        '*** Keywords ***\n%s Keyword\n    No Operation\n' % name.title())
+        self.ns = Namespace(FakeSettings())
+        self.ns.set_library_manager(self.library_manager)
+        self.ns._retriever.VARIABLE_FILE_CHECK_INTERVAL = 0
+
+    def tearDown(self):
+        PUBLISHER.unsubscribe_all(self.ns)
+        sys.modules.pop('namespace_changes_vars', None)
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as output:
+            output.write(content)
+        return path
+
+    def _suite(self, content):
+        path = self._write('suite.robot', content + '*** Test Cases ***\nTest\n    No Operation\n')
+        return TestCaseFile(source=path).populate()
+
+    def test_editing_variable_file_on_disk_evicts_importing_datafile(self):
+        tcf = self._suite('*** Settings ***\nVariables    namespace_changes_vars.py\n'
+                          'Resource    ${RESOURCE}\n')
+        assert self.ns.find_keyword(tcf, 'First Keyword')
+        mtime = os.stat(self.varfile).st_mtime_ns
+        self._write('namespace_changes_vars.py', 'RESOURCE = "second.resource"\n')
+        os.utime(self.varfile, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+        assert self.ns.find_keyword(tcf, 'Second Keyword')
+        assert not self.ns.find_keyword(tcf, 'First Keyword')
+
+    def test_variable_file_is_not_checked_again_within_interval(self):
+        tcf = self._suite('*** Settings ***\nVariables    namespace_changes_vars.py\n')
+        self.ns.find_keyword(tcf, 'No Operation')
+        self.ns._retriever.VARIABLE_FILE_CHECK_INTERVAL = 60
+        self.ns._retriever._variable_files_checked = time.time()
+        os.utime(self.varfile, ns=(0, 0))
+        assert self.ns._retriever.modified_variable_files() == []
+
+    def test_updating_variable_used_in_import_evicts_datafile(self):
+        tcf = self._suite('*** Settings ***\nResource    ${RESOURCE}\n'
+                          '*** Variables ***\n${RESOURCE}    first.resource\n')
+        controller = data_controller(tcf, None)
+        controller.mark_dirty()
+        assert self.ns.find_keyword(tcf, 'First Keyword')
+        variable = controller.variables[0]
+        variable.set_value('${RESOURCE}', 'second.resource')
+        variable.notify_value_changed()
+        assert self.ns.find_keyword(tcf, 'Second Keyword')
+
+
 class TestVariableStash(unittest.TestCase):
 
     def _variable_stash_contains(self, name, vars):
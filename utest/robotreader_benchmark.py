@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Microbenchmark of splitting test data into cells with RobotReader.
+
+Generates a corpus of ``.robot`` files, splits every file with the current
+reader and with the original character by character implementation kept
+below, verifies that both produce identical rows and prints the timings.
+
+Usage: robotreader_benchmark.py [NUMBER OF FILES] [TESTS PER FILE]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from robotide.lib.robot.parsing.robotreader import RobotReader
+from robotide.lib.robot.utils import Utf8Reader
+
+SUITE = """\
+*** Settings ***
+Documentation    Generated suite %(index)s    # with a comment
+Library    Collections
+Resource    resource.robot
+
+*** Variables ***
+${NAME %(index)s}    value with 'quotes'
+@{LIST %(index)s}    a    b    c    # list
+
+*** Test Cases ***
+%(tests)s
+
+*** Keywords ***
+%(keywords)s
+"""
+
+STEPS = [
+    "Log    message    WARN",
+    "Log    \"quoted # not a comment\"    # but this is a cell",
+    "${result}=    Keyword %(kw)s    ${NAME %(index)s}    arg\\#escaped",
+    "# A comment line with 'quotes'",
+    "Should Be Equal    ${result}    expected    # trailing comment",
+    "FOR    ${item}    IN    @{LIST %(index)s}",
+    "    Log    ${item}    ## double sharp",
+    "END",
+    "Run Keyword If    '${result}' == 'x'    Log    it's x",
+    "...    ELSE    Log    other\tvalue",
+]
+
+
+def generate_file(index, tests):
+    test_rows = []
+    for test in range(tests):
+        test_rows.append('Test %d' % test)
+        test_rows.append('    [Tags]    tag%d    # tags' % test)
+        for step in random.sample(STEPS, 6):
+            test_rows.append('    ' + step % {'kw': test % 10, 'index': index})
+    keyword_rows = []
+    for kw in range(10):
+        keyword_rows.append('Keyword %d' % kw)
+        keyword_rows.append('    [Arguments]    ${a}    ${b}=default')
+        keyword_rows.append('    Log    ${a}    # comment %d' % kw)
+        keyword_rows.append('    RETURN    ${b}')
+    return SUITE % {'index': index, 'tests': '\n'.join(test_rows),
+                    'keywords': '\n'.join(keyword_rows)}
+
+
+class LegacyRobotReader(RobotReader):
+    """The original implementation of ``sharp_strip`` used as a reference."""
+
+    def sharp_strip(self, line):
+        row = []
+        i = 0
+        start_d_quote = end_d_quote = False
+        start_s_quote = end_s_quote = False
+        index = len(line)
+        while i < len(line):
+            if line[i] == '"':
+                if end_d_quote:
+                    start_d_quote = True
+                    end_d_quote = False
+                elif start_d_quote:
+                    end_d_quote = True
+                else:
+                    start_d_quote = True
+            if line[i] == "'":
+                if end_s_quote:
+                    start_s_quote = True
+                    end_s_quote = False
+                elif start_s_quote:
+                    end_s_quote = True
+                else:
+                    start_s_quote = True
+            if line[i] == '#' and not start_d_quote and not start_s_quote:
+                if i == 0:
+                    index = 0
+                    break
+                try:
+                    if i > 0 and line[i-1] != '\\' and (line[i+1] == ' ' or line[i+1] == '#'):
+                        index = i
+                        break
+                except IndexError:
+                    i += 1
+                    continue
+            i += 1
+        if index < len(line):
+            cells = self._space_splitter.split(line[:index])
+            row.extend(cells)
+            row.append(line[index:])
+        else:
+            row = self._space_splitter.split(line)
+        first_non_empty = -1
+        if row:
+            for i, v in enumerate(row):
+                if v != '':
+                    first_non_empty = i
+                    break
+            if first_non_empty != -1:
+                for i in range(len(row)-1, first_non_empty, -1):
+                    if row[i] == '':
+                        row.pop(i)
+                if len(row) > 1 and first_non_empty > 1 and row[0] == '' and row[1] != '':
+                    row.pop(0)
+        return row
+
+
+def split_files(reader_class, paths):
+    result = []
+    for path in paths:
+        with Utf8Reader(path) as reader:
+            result.append(list(reader_class(spaces=4).split_lines(reader.readlines())))
+    return result
+
+
+def measure(reader_class, paths, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = split_files(reader_class, paths)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+
+def main(files=50, tests=100):
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(files):
+            path = os.path.join(directory, 'suite%d.robot' % index)
+            with open(path, 'w', encoding='UTF-8') as output:
+                output.write(generate_file(index, tests))
+            paths.append(path)
+        legacy_time, legacy_rows = measure(LegacyRobotReader, paths)
+        current_time, current_rows = measure(RobotReader, paths)
+    if current_rows != legacy_rows:
+        sys.exit('Rows differ from the original implementation!')
+    lines = sum(len(rows) for rows in current_rows)
+    print('Split %d files, %d lines, into identical rows.' % (files, lines))
+    print('Original: %.3f s' % legacy_time)
+    print('Current:  %.3f s' % current_time)
+    print('Speedup:  %.1fx' % (legacy_time / current_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
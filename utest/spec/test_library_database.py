@@ -17,7 +17,7 @@ import os
 import sys
 import unittest
 from robotide.spec.iteminfo import LibraryKeywordInfo
-from robotide.spec.librarydatabase import LibraryDatabase
+from robotide.spec.librarydatabase import LibraryDatabase, SCHEMA_VERSION
 from robotide.spec.libraryfetcher import get_import_result
 
 testlibpath = os.path.join(os.path.dirname(__file__), '..', 'resources',
@@ -110,6 +110,47 @@ class TestLibraryDatabase(unittest.TestCase):
         self._database.insert_library_keywords('library', '', [])
         self.assertTrue(self._database.library_exists('library', ''))
 
+    def test_schema_version_and_indexes(self):
+        connection = self._database._connection
+        self.assertEqual(connection.execute('PRAGMA user_version').fetchone()[0],
+                         SCHEMA_VERSION)
+        indexes = [row[0] for row in connection.execute(
+            "select name from sqlite_master where type = 'index'")]
+        self.assertIn('libraries_by_name', indexes)
+        self.assertIn('keywords_by_library', indexes)
+
+    def test_fetching_many_libraries(self):
+        string_kws = self._get_and_insert_keywords('String', '')
+        self._database.insert_library_keywords('lib.py', ['foo'], [LibraryKeywordInfo('old', 'doc', 'ROBOT', 'lib.py', '')])
+        self._database.insert_library_keywords('lib.py', ['foo'], [LibraryKeywordInfo('new', 'doc', 'TEXT', 'lib.py', '')])
+        libraries = self._database.fetch_libraries([('String', ''), ('lib.py', ['foo']), ('Missing', '')])
+        self.assertEqual(sorted(libraries), [('String', ''), ('lib.py', "['foo']")])
+        self._check_keywords(string_kws, libraries[('String', '')][2])
+        last_updated, _, lib_kws = libraries[('lib.py', "['foo']")]
+        self.assertEqual(last_updated, self._database.get_library_last_updated('lib.py', ['foo']))
+        self.assertEqual([(kw.name, kw.doc_format) for kw in lib_kws], [('new', 'TEXT')])
+
+    def test_fetching_many_libraries_uses_few_queries(self):
+        names = ['lib%d.py' % i for i in range(1000)]
+        for name in names:
+            self._database.insert_library_keywords(
+                name, '', [LibraryKeywordInfo('kw', 'doc', 'ROBOT', name, [])])
+        statements = []
+        self._database._connection.set_trace_callback(statements.append)
+        libraries = self._database.fetch_libraries([(name, '') for name in names])
+        self.assertEqual(sorted(libraries), sorted((name, '') for name in names))
+        self.assertEqual(libraries[('lib7.py', '')][2][0].source, 'lib7.py')
+        self.assertEqual(len(statements), 5)
+
+    def test_storing_fingerprint(self):
+        self._database.insert_library_keywords('lib.py', '', [], 'first')
+        self.assertEqual(self._database.get_library_fingerprint('lib.py', ''), 'first')
+        self._database.update_library_timestamp('lib.py', '')
+        self.assertEqual(self._database.get_library_fingerprint('lib.py', ''), 'first')
+        self._database.update_library_timestamp('lib.py', '', fingerprint='second')
+        self.assertEqual(self._database.get_library_fingerprint('lib.py', ''), 'second')
+        self.assertEqual(self._database.get_library_fingerprint('unknown', ''), None)
+
     def _get_and_insert_keywords(self, library_name, library_arguments):
         kws = get_import_result(library_name, library_arguments)
         self._database.insert_library_keywords(library_name, library_arguments, kws)
@@ -14,10 +14,12 @@
 #  limitations under the License.
 
 import os
+import sqlite3
 import unittest
 import sys
+from threading import Event, Thread
 from robotide.spec.libraryfetcher import get_import_result
-from robotide.spec.librarymanager import LibraryManager
+from robotide.spec.librarymanager import LibraryManager, _InsertResult
 from utest.resources import DATAPATH
 
 sys.path.append(os.path.join(DATAPATH, 'libs'))
@@ -66,9 +68,87 @@ class TestLibraryManager(unittest.TestCase):
         self._library_manager._handle_message()
         self.assertEqual(self._keywords, [])
 
+    def test_read_connections_are_closed_from_other_thread(self):
+        opened, closed, errors = Event(), Event(), []
+
+        def read():
+            database = self._library_manager.get_library_database()
+            opened.set()
+            closed.wait(5)
+            try:
+                database.fetch_libraries([('BuiltIn', '')])
+            except sqlite3.ProgrammingError as err:
+                errors.append(err)
+
+        reader = Thread(target=read)
+        reader.start()
+        opened.wait(5)
+        self._library_manager._close_read_connections()
+        closed.set()
+        reader.join()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(self._library_manager._read_connections, {})
+
+    def _callback(self, keywords):
+        self._keywords = keywords
+
+
+class TestLibraryManagerWithWorkers(unittest.TestCase):
+
+    def setUp(self):
+        self._keywords = None
+        self._library_manager = LibraryManager(':memory:', workers=1, library_timeout=2)
+        self._library_manager._initiate_database_connection()
+        self._library_manager._database.create_database()
+        self._library_manager._pool.start()
+
+    def tearDown(self):
+        self._library_manager._pool.stop()
+        self._library_manager._database.close()
+
+    def test_fetching_in_worker_process(self):
+        self._fetch('BuiltIn')
+        keywords = get_import_result('BuiltIn', '')
+        self.assertFalse(self._library_manager._keywords_differ(keywords, self._keywords))
+        self.assertEqual(len(self._library_manager._database.fetch_library_keywords('BuiltIn', '')),
+                         len(keywords))
+
+    def test_slow_library_times_out_and_worker_is_replaced(self):
+        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+        self._fetch('SlowImporting')
+        self.assertEqual(self._keywords, [])
+        self._fetch('Collections')
+        self.assertTrue(self._keywords)
+
+    def _fetch(self, library_name):
+        self._library_manager.fetch_keywords(library_name, '', self._callback)
+        self._library_manager._handle_message()
+        self._library_manager._handle_message()
+
     def _callback(self, keywords):
         self._keywords = keywords
 
 
+class TestInsertResult(unittest.TestCase):
+
+    def setUp(self):
+        self._late = []
+        self._result = _InsertResult([('First', ''), ('Second', ''), ('Third', '')],
+                                     self._late.append)
+
+    def test_keywords_inserted_before_deadline_are_returned(self):
+        self._result.callback(2)(['kw3'])
+        self._result.callback(0)(['kw1'])
+        self._result.callback(1)(None)
+        self.assertEqual(self._result.wait(5), [['kw1'], [], ['kw3']])
+        self.assertEqual(self._late, [])
+
+    def test_libraries_inserted_after_deadline_are_reported_late(self):
+        self._result.callback(1)(['kw2'])
+        self.assertEqual(self._result.wait(0.01), [None, ['kw2'], None])
+        self._result.callback(0)(['kw1'])
+        self.assertEqual(self._late, ['First'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -15,7 +15,7 @@
 
 import unittest
 
-from robotide.ui.keywordsearch import _KeywordData, _SearchCriteria,\
+from robotide.ui.keywordsearch import _KeywordData, _KeywordIndex, _SearchCriteria,\
     ALL_KEYWORDS, ALL_USER_KEYWORDS, ALL_LIBRARY_KEYWORDS, _SortOrder
 from robotide.spec.iteminfo import ItemInfo
 
@@ -91,6 +91,48 @@ class TestSearchCriteria(unittest.TestCase):
         criteria = _SearchCriteria(pattern, search_doc, source_filter)
         assert criteria.matches(keyword) == expected
 
+    def test_fuzzy_pattern(self):
+        self._test_criteria(True, 'stde', False, self.keyword)
+        self._test_criteria(False, 'sd', False, self.keyword)
+        self._test_criteria(False, 'edts', False, self.keyword)
+
+
+class TestKeywordIndex(unittest.TestCase):
+    keywords = [Keyword('Get File', 'OperatingSystem', 'Returns the contents of a file.'),
+                Keyword('Get Binary File', 'OperatingSystem', 'Returns binary contents.'),
+                Keyword('Log File', 'OperatingSystem', 'Wrapper around Get File.'),
+                Keyword('Forget It', 'resource.robot', 'Nothing to return.'),
+                Keyword('Gather Extra Tables', 'resource.robot', 'No docs here.')]
+
+    def setUp(self):
+        self.index = _KeywordIndex(self.keywords)
+
+    def test_ranked_matches(self):
+        self._assert_search(['Get File', 'Get Binary File', 'Forget It', 'Log File', 'Gather Extra Tables'],
+                            'get')
+        self._assert_search(['Get File', 'Get Binary File', 'Log File'], 'file')
+
+    def test_documentation_is_searched_only_when_requested(self):
+        self._assert_search(['Get File', 'Get Binary File', 'Forget It'], 'return')
+        self._assert_search([], 'return', search_docs=False)
+
+    def test_source_filters(self):
+        self._assert_search(['Forget It', 'Gather Extra Tables'], '', source_filter=ALL_USER_KEYWORDS)
+        self._assert_search(['Get File', 'Get Binary File', 'Log File'], '', source_filter=ALL_LIBRARY_KEYWORDS)
+        self._assert_search(['Forget It', 'Gather Extra Tables'], 'get', source_filter='resource.robot')
+        self._assert_search([], 'get', source_filter='unknown')
+
+    def test_index_agrees_with_criteria(self):
+        for pattern in ['', 'get', 'g e t', 'file', 'gefi', 'contents', 'xyz']:
+            for search_docs in [True, False]:
+                criteria = _SearchCriteria(pattern, search_docs, ALL_KEYWORDS)
+                self.assertEqual(sorted(kw.name for kw in self.index.search(criteria)),
+                                 sorted(kw.name for kw in self.keywords if criteria.matches(kw)))
+
+    def _assert_search(self, expected, pattern, search_docs=True, source_filter=ALL_KEYWORDS):
+        criteria = _SearchCriteria(pattern, search_docs, source_filter)
+        self.assertEqual([kw.name for kw in self.index.search(criteria)], expected)
+
 
 class TestKeyWordData(unittest.TestCase):
 
@@ -17,6 +17,7 @@ import unittest
 from utest.resources import datafilereader
 from robotide.ui.review import ReviewRunner
 from robotide.publish import PUBLISHER
+from robotide.usages.commands import FindUnusedKeywords, FindUsages
 
 
 class TestReview(unittest.TestCase):
@@ -77,5 +78,67 @@ class TestReview(unittest.TestCase):
         return all_items_checked
 
 
+class _FakeSearchModel(object):
+
+    def __init__(self):
+        self.searching = True
+        self.status = None
+        self.keywords = []
+
+    def add_unused_keyword(self, keyword):
+        self.keywords.append(keyword)
+
+    def end_search(self):
+        self.searching = False
+
+
+class TestFindUnusedKeywords(unittest.TestCase):
+
+    def tearDown(self):
+        PUBLISHER.unsubscribe_all()
+
+    def test_unused_keywords_match_usages_of_each_keyword(self):
+        for path in (datafilereader.UNUSED_KEYWORDS_PATH,
+                     datafilereader.SIMPLE_TEST_SUITE_PATH):
+            project = datafilereader.construct_project(path)
+            try:
+                expected = [kw for df in project.datafiles for kw in df.keywords
+                            if kw.name and not self._has_usages(project, kw)]
+                unused = list(project.execute(FindUnusedKeywords(project.datafiles)))
+                self.assertEqual(self._names(unused), self._names(expected))
+            finally:
+                project.close()
+
+    def test_runner_reports_unused_keywords_of_filtered_files(self):
+        project = datafilereader.construct_project(
+            datafilereader.UNUSED_KEYWORDS_PATH)
+        try:
+            runner = ReviewRunner(project, self)
+            runner.set_filter_active(True)
+            runner.set_filter_mode(False)
+            runner.set_filter_source_testcases(False)
+            runner.set_filter_source_resources(True)
+            runner.set_filter_use_regex(False)
+            runner.parse_filter_string('')
+            runner._model = _FakeSearchModel()
+            runner._run()
+            files = runner._get_datafile_list()
+            self.assertTrue(runner._model.keywords)
+            for keyword in runner._model.keywords:
+                self.assertIn(keyword.datafile_controller, files)
+                self.assertFalse(self._has_usages(project, keyword))
+        finally:
+            project.close()
+
+    @staticmethod
+    def _has_usages(project, keyword):
+        return any(True for _ in project.execute(
+            FindUsages(keyword.name, keyword_info=keyword.info)))
+
+    @staticmethod
+    def _names(keywords):
+        return sorted((kw.datafile_controller.name, kw.name) for kw in keywords)
+
+
 if __name__ == "__main__":
     unittest.main()
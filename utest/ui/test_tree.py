@@ -14,6 +14,8 @@
 #  limitations under the License.
 
 import os
+import shutil
+import tempfile
 import pytest
 DISPLAY = os.getenv('DISPLAY')
 if not DISPLAY:
@@ -239,6 +241,26 @@ class TestRefreshingDataNode(_BaseSuiteTreeTest):
         assert self._tree.GetItemText(tnode) == new_name
         assert orig_node_lenght == len(self._tree._datafile_nodes)
 
+    def test_reloaded_suite_is_refreshed(self):
+        suite = self._model.data.children[0]
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, os.path.basename(suite.filename))
+        with open(path, 'w') as output:
+            output.write('*** Test Cases ***\nReloaded Test\n    No Operation\n')
+        suite.filename = path
+        self._select_node(suite.display_name)
+        call_after = wx.CallAfter
+        wx.CallAfter = lambda function, *args: function(*args)
+        try:
+            suite.reload()
+        finally:
+            wx.CallAfter = call_after
+            shutil.rmtree(directory)
+        snode = self._get_node(suite.display_name)
+        tnode = self._tree.GetFirstChild(snode)[0]
+        assert self._tree.GetItemText(tnode) == 'Reloaded Test'
+        assert self._tree._controller.find_node_by_controller(suite.tests[0]) == tnode
+
     def test_refreshing_resource(self):
         orig_node_lenght = len(self._tree._datafile_nodes)
         new_name = 'Ninjaed Uk Name'
@@ -252,5 +274,56 @@ class TestRefreshingDataNode(_BaseSuiteTreeTest):
         assert orig_node_lenght == len(self._tree._datafile_nodes)
 
 
+class _Results(object):
+
+    def __init__(self, running):
+        self.running = running
+
+    def is_paused(self, controller):
+        return False
+
+    def is_running(self, controller):
+        return controller is self.running
+
+    def has_passed(self, controller):
+        return controller is not self.running
+
+    has_failed = has_skipped = has_passed
+
+
+class TestExecutionStatusUpdates(_BaseSuiteTreeTest):
+
+    def setUp(self):
+        _BaseSuiteTreeTest.setUp(self)
+        self.deleted = []
+        self._tree.DeleteItemWindow = self.deleted.append
+        self._tree._animate_running_test = self._animate
+        self.first, self.second = self._model.data.children[0].tests[:2]
+
+    def _animate(self, node, img_index):
+        self._tree._animated_node = node
+
+    def _node(self, controller):
+        return self._tree._controller.find_node_by_controller(controller)
+
+    def _apply(self, running, *controllers):
+        self._tree._execution_results = _Results(running)
+        for controller in controllers:
+            self._tree._status_updates.add(controller)
+        self._tree._apply_status_updates()
+
+    def test_animation_moves_to_running_test(self):
+        self._apply(self.first, self.first)
+        self._apply(self.second, self.first, self.second)
+        assert self.deleted == [self._node(self.first)]
+        assert self._tree._animated_node == self._node(self.second)
+
+    def test_animation_is_stopped_when_last_item_has_no_node(self):
+        self._apply(self.first, self.first)
+        self._apply(None, self.first, object())
+        assert self.deleted == [self._node(self.first)]
+        assert self._tree._animated_node is None
+
+
 if __name__ == '__main__':
     unittest.main()